@@ -5,21 +5,21 @@ import csv
 import os
 import sys
 from collections import Counter
+
 from src.facility.subprocess import Subprocess
+from src.repositorymining.commit_cache import CommitCache
 
 
-def get_git_log(settings):
+def stream_git_log(settings):
     """
-    Get the git log file from the provided repository.
+    Stream the changed files of the git log of the provided repository, one line at a time.
 
-    The log file is retrieved from the date provided in the since setting.
+    The log is retrieved from the date provided in the since setting and is saved in the churn subdirectory.
     """
 
     log_directory = os.path.join(settings["report_directory"], "churn")
     os.makedirs(log_directory, exist_ok=True)
 
-    log_file = os.path.join(log_directory, "churn.log")
-
     git_log_command = [
         "git",
         "-C",
@@ -31,8 +31,40 @@ def get_git_log(settings):
     ]
 
     process = Subprocess(git_log_command, verbose=1)
-    output = process.execute_pipe(settings["report_directory"], log_file, check_return_code=True)
-    return output.stdout.decode("utf-8")
+    return process.execute_lines(log_directory, "churn", check_return_code=True)
+
+
+def count_churn(git_log_lines):
+    """Count the number of times each file occurs in the lines of the git log, skipping the empty lines."""
+
+    churn = Counter()
+    for line in git_log_lines:
+        if line:
+            churn[line] += 1
+
+    return churn
+
+
+def determine_since_timestamp(settings):
+    """Determine the timestamp of the since setting the way git interprets it."""
+
+    command = ["git", "-C", settings["repository"], "rev-parse", f"--since={settings['since']}"]
+    log_directory = os.path.join(settings["report_directory"], "churn")
+    os.makedirs(log_directory, exist_ok=True)
+    output = list(Subprocess(command, verbose=1).execute_lines(log_directory, "since"))
+
+    return int(output[0].split("=", 1)[1])
+
+
+def determine_churn_incrementally(settings):
+    """Determine the churn from the commit cache, after adding the commits since the previous analysis to it."""
+
+    cache = CommitCache(settings["repository"], settings["report_directory"])
+    try:
+        cache.update()
+        return cache.file_commit_counts(since=determine_since_timestamp(settings))
+    finally:
+        cache.close()
 
 
 def parse_arguments(args):
@@ -48,6 +80,11 @@ def parse_arguments(args):
         default="1-1-2020",
         action="store",
     )
+    parser.add_argument(
+        "--incremental",
+        help="keep the history in a commit cache in the report directory and only read the new commits from git",
+        action="store_true",
+    )
 
     return parser.parse_args(args)
 
@@ -59,29 +96,18 @@ def get_settings(args):
         "repository": args.repository,
         "report_directory": args.output,
         "since": args.since,
+        "incremental": args.incremental,
     }
     return settings
 
 
-def remove_empty_lines(git_log):
-    """Remove the empty lines form the log file."""
-
-    return os.linesep.join([s for s in git_log.splitlines() if s])
-
-
 def determine_churn(settings):
-    """Determine the churn from the git log file."""
-
-    git_log = get_git_log(settings)
-    git_log = remove_empty_lines(git_log)
-    churn = calculate_churn(git_log)
-    return churn
-
+    """Determine the churn from the git log, streamed line by line, and return a sorted list of the churn."""
 
-def calculate_churn(git_log):
-    """Calculate the churn and return a sorted list of the churn."""
+    if settings["incremental"]:
+        return determine_churn_incrementally(settings)
 
-    return Counter(git_log.splitlines()).most_common()
+    return count_churn(stream_git_log(settings)).most_common()
 
 
 def save_churn(churn, report_directory):
@@ -0,0 +1,103 @@
+"""
+Parse the output of git log with the numstat of each commit.
+
+The log is parsed line by line, so it can be streamed from the git process. Each commit line is followed by one
+numstat line per changed file with the added and deleted lines, and by summary lines that tell which files are
+deleted. Binary files have no line counts and count as 0 added and deleted lines.
+
+With rename detection the numstat line of a renamed file shows both paths, either as "old => new" or with the common
+parts outside braces as "src/{old => new}/file.py".
+"""
+
+import re
+from collections import namedtuple
+
+COMMIT_PREFIX = "commit "
+RENAME_SEPARATOR = " => "
+BRACED_RENAME = re.compile(r"^(?P<prefix>[^{]*)\{(?P<old>.*) => (?P<new>.*)\}(?P<suffix>.*)$")
+
+Commit = namedtuple("Commit", ["sha", "date", "changes"])
+FileChange = namedtuple("FileChange", ["path", "added", "deleted", "removed", "old_path"], defaults=[None])
+
+
+def create_numstat_command(repository, since=None, until=None, detect_renames=False):
+    """Create the git log command that shows the sha, committer date and numstat of each commit."""
+
+    command = [
+        "git",
+        "-C",
+        repository,
+        "-c",
+        "core.quotePath=false",
+        "log",
+        "--numstat",
+        "--summary",
+        "-M" if detect_renames else "--no-renames",
+        "--date=short",
+        f"--format={COMMIT_PREFIX}%H %cd",
+    ]
+
+    if since:
+        command.append(f"--since={since}")
+    if until:
+        command.append(f"--until={until}")
+
+    return command
+
+
+def parse_line_count(count):
+    """Parse the added or deleted line count of a numstat line, which is - for binary files."""
+
+    return 0 if count == "-" else int(count)
+
+
+def parse_rename(path):
+    """Parse the path of a numstat line of a renamed file into the old and the new path."""
+
+    match = BRACED_RENAME.match(path)
+    if match:
+        old_path = match["prefix"] + match["old"] + match["suffix"]
+        new_path = match["prefix"] + match["new"] + match["suffix"]
+        return old_path.replace("//", "/"), new_path.replace("//", "/")
+
+    if RENAME_SEPARATOR in path:
+        old_path, new_path = path.split(RENAME_SEPARATOR, 1)
+        return old_path, new_path
+
+    return None, path
+
+
+def create_commit(sha, date, line_counts, removed_paths):
+    """Create the commit with its file changes."""
+
+    changes = [
+        FileChange(path, added, deleted, path in removed_paths, old_path)
+        for path, (added, deleted, old_path) in line_counts.items()
+    ]
+    return Commit(sha, date, changes)
+
+
+def parse_numstat_log(lines, detect_renames=False):
+    """Parse the lines of the git log and yield each commit with its file changes."""
+
+    sha = None
+    date = None
+    line_counts = {}
+    removed_paths = set()
+    for line in lines:
+        if line.startswith(COMMIT_PREFIX) and "\t" not in line:
+            if sha:
+                yield create_commit(sha, date, line_counts, removed_paths)
+
+            sha, date = line.removeprefix(COMMIT_PREFIX).split(" ", 1)
+            line_counts = {}
+            removed_paths = set()
+        elif "\t" in line:
+            added, deleted, path = line.split("\t", 2)
+            old_path, path = parse_rename(path) if detect_renames else (None, path)
+            line_counts[path] = (parse_line_count(added), parse_line_count(deleted), old_path)
+        elif line.startswith(" delete mode "):
+            removed_paths.add(line.split(" ", 4)[4])
+
+    if sha:
+        yield create_commit(sha, date, line_counts, removed_paths)
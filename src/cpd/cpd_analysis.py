@@ -4,14 +4,24 @@ import argparse
 import csv
 import os
 import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
+from src.cpd.cpd_index import analyze_new_duplication
+from src.cpd.cpd_native import LANGUAGES, measure_code_duplication_natively
 from src.facility.subprocess import Subprocess
 from src.profile.show import make_donut
 from src.reporting.reporting import create_report_directory
 
+CPD_HEADER = "lines,tokens,occurrences"
+
+EXTENSION_LANGUAGES = {
+    extension: language for language, definition in LANGUAGES.items() for extension in definition["extensions"]
+}
+
 
 def measure_code_duplication(settings):
-    """Measure the amount of code duplication."""
+    """Measure the amount of code duplication and return the lines of the cpd output as they are produced."""
 
     report_dir = create_report_directory(settings["report_directory"])
     report_file = os.path.join(report_dir, "code_duplication")
@@ -29,16 +39,14 @@ def measure_code_duplication(settings):
     ]
 
     process = Subprocess(measure_function_size_command, verbose=1)
-    output = process.execute_pipe(report_dir, report_file, check_return_code=False)
-
-    return output.stdout.decode("utf-8")
+    return process.execute_lines(report_dir, report_file, check_return_code=False)
 
 
 def measure_lines_of_code(settings):
     """Measure the lines of code using cloc."""
 
     report_dir = create_report_directory(settings["report_directory"])
-    report_file = os.path.join(report_dir, "code_duplication")
+    report_file = os.path.join(report_dir, "lines_of_code")
 
     command = [
         "cloc",
@@ -55,38 +63,122 @@ def measure_lines_of_code(settings):
     return output.stdout.decode("utf-8")
 
 
-def clean_up_input(csv_data):
-    """Clean up the input data by removing all data before the header of the actual data."""
+def skip_preamble(csv_lines):
+    """Skip the lines before the header of the cpd csv data, raise an exception when there is no valid header."""
+
+    lines = iter(csv_lines)
+    has_preamble = False
+    for line in lines:
+        if line.strip() == CPD_HEADER:
+            yield line
+            yield from lines
+            return
+
+        has_preamble = True
 
-    try:
-        position = csv_data.index("lines,tokens,occurrences")
-        csv_data = csv_data[position:]
-    except ValueError:
+    if has_preamble:
         print("No valid data found.")
+        raise ValueError
+
 
-    return csv_data
+def read_duplicates(csv_input):
+    """
+    Read the duplicates from the cpd csv output, either a string or an iterable of lines.
 
+    The lines are read one at a time, so the output of cpd can be streamed. The line and file of each occurrence are
+    in the None column.
+    """
 
-def determine_duplicate_lines_of_code(csv_input):
-    """Calculate the number of duplicated lines of code."""
+    csv_lines = csv_input.splitlines() if isinstance(csv_input, str) else csv_input
+    return csv.DictReader(skip_preamble(csv_lines))
 
-    csv_data = csv_input.splitlines()
-    csv_data = clean_up_input(csv_data)
-    check_valid_header(csv_data)
 
-    duplicate_loc = 0
-    data = csv.DictReader(csv_data)
-    for row in data:
-        duplicate_loc = duplicate_loc + (int(row["lines"]) * (int(row["occurrences"])))
+def iterate_occurrences(row):
+    """Iterate over the first line and the file of each occurrence of a duplicate."""
 
-    return duplicate_loc
+    occurrences = row[None] or []
+    for line, file_name in zip(occurrences[0::2], occurrences[1::2]):
+        yield int(line), file_name.strip()
 
 
-def check_valid_header(csv_data):
-    """Check if the header is valid, raise exception if not."""
+def determine_duplicated_ranges(duplicates):
+    """Determine per file the ranges of duplicated lines, as (first line, last line), of the occurrences."""
 
-    if csv_data and not csv_data[0] == "lines,tokens,occurrences":
-        raise ValueError
+    duplicated_ranges = defaultdict(list)
+    for row in duplicates:
+        lines = int(row["lines"])
+        for first_line, file_name in iterate_occurrences(row):
+            duplicated_ranges[file_name].append((first_line, first_line + lines - 1))
+
+    return duplicated_ranges
+
+
+def count_merged_lines(ranges):
+    """Count the lines covered by the ranges, merging overlapping ranges with a sort and sweep."""
+
+    count = 0
+    current_first, current_last = None, None
+    for first, last in sorted(ranges):
+        if current_last is not None and first <= current_last + 1:
+            current_last = max(current_last, last)
+            continue
+
+        if current_last is not None:
+            count += current_last - current_first + 1
+        current_first, current_last = first, last
+
+    if current_last is not None:
+        count += current_last - current_first + 1
+
+    return count
+
+
+def determine_unique_duplicate_lines_of_code(csv_input):
+    """
+    Determine per file the number of duplicated lines of code, counting each line once.
+
+    Lines that are part of overlapping or nested duplicates are counted only once.
+    """
+
+    duplicated_ranges = determine_duplicated_ranges(read_duplicates(csv_input))
+    return {file_name: count_merged_lines(ranges) for file_name, ranges in sorted(duplicated_ranges.items())}
+
+
+def determine_language(file_name):
+    """Determine the language of the file from its extension."""
+
+    extension = os.path.splitext(file_name)[1].lower()
+    return EXTENSION_LANGUAGES.get(extension, extension or "unknown")
+
+
+def aggregate_duplication(csv_input, exact=False):
+    """
+    Aggregate the duplicated lines of code in total, per file and per language in a single pass over the duplicates.
+
+    In exact mode the lines of overlapping duplicates are counted once.
+    """
+
+    if exact:
+        duplicated_loc_per_file = determine_unique_duplicate_lines_of_code(csv_input)
+        duplicated_loc = sum(duplicated_loc_per_file.values())
+    else:
+        duplicated_loc = 0
+        duplicated_loc_per_file = Counter()
+        for row in read_duplicates(csv_input):
+            lines = int(row["lines"])
+            duplicated_loc += lines * int(row["occurrences"])
+            for _, file_name in iterate_occurrences(row):
+                duplicated_loc_per_file[file_name] += lines
+
+    duplicated_loc_per_language = Counter()
+    for file_name, lines in duplicated_loc_per_file.items():
+        duplicated_loc_per_language[determine_language(file_name)] += lines
+
+    return {
+        "duplicated_loc": duplicated_loc,
+        "duplicated_loc_per_file": dict(sorted(duplicated_loc_per_file.items())),
+        "duplicated_loc_per_language": dict(sorted(duplicated_loc_per_language.items())),
+    }
 
 
 def determine_total_lines_of_code(csv_input):
@@ -103,6 +195,33 @@ def determine_total_lines_of_code(csv_input):
     return total_loc
 
 
+def read_total_lines_of_code(report_file):
+    """
+    Read the total lines of code from a report of the cloc analysis.
+
+    The report is either the csv output of cloc, of which the SUM row is read, or a language or code volume profile,
+    of which the lines of code of all rows are added.
+    """
+
+    with open(report_file, "r", encoding="utf-8") as report:
+        csv_data = [line for line in report.read().splitlines() if line.strip()]
+
+    reader = csv.DictReader(csv_data)
+    if reader.fieldnames and "code" in reader.fieldnames:
+        return next((int(row["code"]) for row in reader if row["language"] == "SUM"), 0)
+
+    return sum(int(row["Lines Of Code"]) for row in reader)
+
+
+def measure_total_lines_of_code(settings):
+    """Determine the total lines of code from the provided cloc report or else by measuring them with cloc."""
+
+    if settings["cloc_report"]:
+        return read_total_lines_of_code(settings["cloc_report"])
+
+    return int(determine_total_lines_of_code(measure_lines_of_code(settings)))
+
+
 def show_duplication_profile(total_loc, duplicated_loc):
     """Show the duplication profile in s donut."""
 
@@ -141,15 +260,24 @@ def determine_colors(percentage):
 
 
 def analyze_duplication(settings):
-    """Analyze code duplication."""
+    """
+    Analyze code duplication.
+
+    The total lines of code are determined concurrently with the duplicated lines of code.
+    """
 
     metrics = {}
 
-    output = measure_code_duplication(settings)
-    metrics["duplicated_loc"] = int(determine_duplicate_lines_of_code(output))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        total_loc = executor.submit(measure_total_lines_of_code, settings)
+
+        if settings["engine"] == "native":
+            output = measure_code_duplication_natively(settings)
+        else:
+            output = measure_code_duplication(settings)
 
-    output = measure_lines_of_code(settings)
-    metrics["total_loc"] = int(determine_total_lines_of_code(output))
+        metrics.update(aggregate_duplication(output, settings["exact"]))
+        metrics["total_loc"] = total_loc.result()
 
     return metrics
 
@@ -163,14 +291,45 @@ def save_duplication_profile(report_file, metrics):
         csv_writer.writerow([metrics["duplicated_loc"], metrics["total_loc"]])
 
 
+def save_duplication_per_file(report_file, duplicated_loc_per_file):
+    """Save the duplicated lines of code per file to a csv file."""
+
+    save_duplication_breakdown(report_file, "File", duplicated_loc_per_file)
+
+
+def save_duplication_per_language(report_file, duplicated_loc_per_language):
+    """Save the duplicated lines of code per language to a csv file."""
+
+    save_duplication_breakdown(report_file, "Language", duplicated_loc_per_language)
+
+
+def save_duplication_breakdown(report_file, name, duplicated_loc):
+    """Save the duplicated lines of code per file or language to a csv file."""
+
+    with open(report_file, "w", encoding="utf-8") as report:
+        csv_writer = csv.writer(report, delimiter=",", lineterminator="\n", quoting=csv.QUOTE_ALL)
+        csv_writer.writerow([name, "Duplicated Lines Of Code"])
+        csv_writer.writerows(duplicated_loc.items())
+
+
 def perform_analysis(settings):
     """Perform the requested analysis."""
 
+    if settings["changed_files"] or settings["diff_range"]:
+        analyze_new_duplication(settings)
+        return
+
     metrics = analyze_duplication(settings)
     report_dir = create_report_directory(settings["report_directory"])
     report_file = os.path.join(report_dir, "code_duplication.csv")
 
     save_duplication_profile(report_file, metrics)
+    save_duplication_per_file(
+        os.path.join(report_dir, "code_duplication_per_file.csv"), metrics["duplicated_loc_per_file"]
+    )
+    save_duplication_per_language(
+        os.path.join(report_dir, "code_duplication_per_language.csv"), metrics["duplicated_loc_per_language"]
+    )
     show_duplication_profile(metrics["total_loc"], metrics["duplicated_loc"])
 
 
@@ -190,11 +349,44 @@ def parse_arguments(args):
         help="The minimum token length which should be reported as a duplicate.",
         default=100,
     )
+    parser.add_argument(
+        "--engine",
+        help=f"The engine that detects the duplicates, native supports: {', '.join(LANGUAGES)}.",
+        choices=["cpd", "native"],
+        default="cpd",
+    )
+    parser.add_argument(
+        "--exact",
+        help="Count each duplicated line once, also when it is part of overlapping duplicates.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--cloc-report",
+        help="The cloc report or language profile of the cloc analysis to read the total lines of code from.",
+    )
+    parser.add_argument(
+        "--changed",
+        nargs="+",
+        help="Only report the duplicates that these changed files introduce, using the fingerprint index.",
+    )
+    parser.add_argument(
+        "--diff-range",
+        help="Only report the duplicates that the files changed in this git diff range introduce, like main...HEAD.",
+    )
+    parser.add_argument("--jobs", help="The number of processes that tokenize the files.", type=int, default=1)
     parser.add_argument("input", help="The directory to analyze.")
 
     parser.set_defaults(func=perform_analysis)
 
-    return parser.parse_args(args)
+    arguments = parser.parse_args(args)
+    uses_native_tokenizer = arguments.engine == "native" or arguments.changed or arguments.diff_range
+    if uses_native_tokenizer and arguments.language not in LANGUAGES:
+        parser.error(
+            f"the native engine and the fingerprint index do not support {arguments.language}, "
+            f"use one of: {', '.join(LANGUAGES)}, or cpd without --changed and --diff-range"
+        )
+
+    return arguments
 
 
 def get_settings(args):
@@ -205,6 +397,12 @@ def get_settings(args):
         "report_directory": args.output,
         "tokens": args.tokens,
         "language": args.language,
+        "engine": args.engine,
+        "jobs": args.jobs,
+        "exact": args.exact,
+        "cloc_report": args.cloc_report,
+        "changed_files": args.changed,
+        "diff_range": args.diff_range,
     }
     return settings
 
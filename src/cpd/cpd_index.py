@@ -0,0 +1,354 @@
+"""
+Detect the duplicates that changed files introduce, using a persistent index of fingerprints.
+
+The tokens of each file are hashed in grams of a few tokens and the fingerprints of the file are selected from these
+hashes by winnowing: the minimum hash of each window of consecutive grams. Any duplicate of at least the minimum number
+of tokens shares a fingerprint with its original. The fingerprints of all files are stored in a SQLite database
+together with the modification time, size and content hash of the files, so only files of which the content changed
+since the previous run are fingerprinted again. The modification time and size are a fast first check; a file that
+only got a new modification time, for example by a checkout, is hashed but not fingerprinted again.
+
+The fingerprints that the changed files did not have before the update of the index are looked up in the index and
+each match is verified and extended on the tokens of both files. The result is the list of duplicates that the changes
+since the previous run introduced in the changed files, in the csv format of cpd. Duplicates that already existed
+before the change are not reported, because all their fingerprints were already in the index.
+"""
+
+import csv
+import hashlib
+import os
+import sqlite3
+import zlib
+
+import numpy as np
+
+from src.cpd.cpd_native import (
+    HASH_BASE,
+    HASH_BASE_INVERSE,
+    LANGUAGES,
+    determine_powers,
+    determine_window_hashes,
+    find_language_files,
+    tokenize_file,
+    tokenize_files,
+)
+from src.facility.subprocess import Subprocess
+from src.reporting.reporting import create_report_directory
+
+INDEX_FILE = "code_duplication_index.sqlite"
+GRAM_SIZE = 20
+
+
+def determine_token_hashes(tokens):
+    """Hash the tokens to integers that are the same in every run."""
+
+    return np.array([zlib.crc32(token.encode("utf-8", errors="replace")) + 1 for token in tokens], dtype=np.int64)
+
+
+def winnow(hashes, window):
+    """Select the minimum hash of each window of hashes, the rightmost one on ties, and return their positions."""
+
+    if len(hashes) < window:
+        return np.empty(0, dtype=np.int64)
+
+    windows = np.lib.stride_tricks.sliding_window_view(hashes, window)
+    rightmost_minimum = window - 1 - np.argmin(windows[:, ::-1], axis=1)
+    return np.unique(rightmost_minimum + np.arange(len(windows)))
+
+
+def determine_fingerprints(tokens, minimum_tokens):
+    """Determine the fingerprints of the tokens as (hash, position) tuples."""
+
+    gram_size = min(GRAM_SIZE, minimum_tokens)
+    token_hashes = determine_token_hashes(tokens)
+    powers = determine_powers(HASH_BASE, len(token_hashes))
+    inverse_powers = determine_powers(HASH_BASE_INVERSE, len(token_hashes))
+
+    gram_hashes = determine_window_hashes(token_hashes, gram_size, powers, inverse_powers).view(np.int64)
+    positions = winnow(gram_hashes, minimum_tokens - gram_size + 1)
+    return list(zip(gram_hashes[positions].tolist(), positions.tolist()))
+
+
+def determine_content_hash(file_name):
+    """Determine the hash of the content of the file."""
+
+    with open(file_name, "rb") as source_file:
+        return hashlib.file_digest(source_file, "blake2b").hexdigest()
+
+
+class FingerprintIndex:
+    """Persistent index of the fingerprints of the files of one language."""
+
+    def __init__(self, index_file, language, minimum_tokens):
+        """Construct the class, clearing the index when it was built for another language or minimum of tokens."""
+
+        self._language = language
+        self._minimum_tokens = minimum_tokens
+        self._previous_fingerprints = {}
+        self._connection = sqlite3.connect(index_file)
+        self._connection.executescript(
+            "CREATE TABLE IF NOT EXISTS settings (language TEXT, minimum_tokens INTEGER);"
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, content_hash TEXT);"
+            "CREATE TABLE IF NOT EXISTS fingerprints (hash INTEGER, path TEXT, position INTEGER);"
+            "CREATE INDEX IF NOT EXISTS fingerprint_hash ON fingerprints (hash);"
+            "CREATE INDEX IF NOT EXISTS fingerprint_path ON fingerprints (path);"
+        )
+
+        if self._connection.execute("SELECT language, minimum_tokens FROM settings").fetchone() != (
+            language,
+            minimum_tokens,
+        ):
+            with self._connection:
+                self._connection.execute("DELETE FROM settings")
+                self._connection.execute("DELETE FROM files")
+                self._connection.execute("DELETE FROM fingerprints")
+                self._connection.execute("INSERT INTO settings VALUES (?, ?)", (language, minimum_tokens))
+
+    def close(self):
+        """Close the index."""
+
+        self._connection.close()
+
+    def _classify_files(self, file_names):
+        """
+        Classify the files in touched, changed and deleted files compared to the index.
+
+        Only the files of which the modification time or size changed are hashed. Touched files have the same content
+        hash as in the index and are returned with their modification time and size, changed files are returned with
+        their modification time, size and content hash.
+        """
+
+        indexed_files = {
+            path: (mtime_ns, size, content_hash)
+            for path, mtime_ns, size, content_hash in self._connection.execute("SELECT * FROM files")
+        }
+
+        current_paths = set()
+        touched_files = {}
+        changed_files = {}
+        for file_name in file_names:
+            current_paths.add(file_name)
+            status = os.stat(file_name)
+            indexed_file = indexed_files.get(file_name)
+            if indexed_file and indexed_file[:2] == (status.st_mtime_ns, status.st_size):
+                continue
+
+            content_hash = determine_content_hash(file_name)
+            if indexed_file and indexed_file[2] == content_hash:
+                touched_files[file_name] = (status.st_mtime_ns, status.st_size)
+            else:
+                changed_files[file_name] = (status.st_mtime_ns, status.st_size, content_hash)
+
+        return touched_files, changed_files, [path for path in indexed_files if path not in current_paths]
+
+    def _store_fingerprints(self, changed_files, jobs):
+        """Fingerprint the changed files and store them with their modification time, size and content hash."""
+
+        for path, tokens, _ in tokenize_files(changed_files, self._language, jobs):
+            self._connection.execute("INSERT INTO files VALUES (?, ?, ?, ?)", (path, *changed_files[path]))
+            self._connection.executemany(
+                "INSERT INTO fingerprints VALUES (?, ?, ?)",
+                (
+                    (fingerprint, path, position)
+                    for fingerprint, position in determine_fingerprints(tokens, self._minimum_tokens)
+                ),
+            )
+
+    def update(self, file_names, jobs=1):
+        """
+        Fingerprint the new and changed files, remove the deleted files and return the fingerprinted files.
+
+        The fingerprints that the fingerprinted files had before the update are kept to find the new matches. For the
+        touched files, of which only the modification time or size changed, the modification time and size are
+        updated.
+        """
+
+        touched_files, changed_files, deleted_files = self._classify_files(file_names)
+        self._previous_fingerprints = {}
+
+        with self._connection:
+            self._connection.executemany(
+                "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                ((mtime_ns, size, path) for path, (mtime_ns, size) in touched_files.items()),
+            )
+
+            for path in changed_files:
+                self._previous_fingerprints[path] = {
+                    fingerprint
+                    for (fingerprint,) in self._connection.execute(
+                        "SELECT hash FROM fingerprints WHERE path = ?", (path,)
+                    )
+                }
+
+            for path in deleted_files + list(changed_files):
+                self._connection.execute("DELETE FROM files WHERE path = ?", (path,))
+                self._connection.execute("DELETE FROM fingerprints WHERE path = ?", (path,))
+
+            self._store_fingerprints(changed_files, jobs)
+
+        return list(changed_files)
+
+    def find_new_matches(self, file_name):
+        """
+        Find the new fingerprints of the file in the other files, as (position, other file, other position) tuples.
+
+        The new fingerprints are the fingerprints that the file did not have before the last update. A file that was not
+        fingerprinted in the last update has no new fingerprints.
+        """
+
+        previous_fingerprints = self._previous_fingerprints.get(file_name)
+        if previous_fingerprints is None:
+            return
+
+        for fingerprint, position, other_file, other_position in self._connection.execute(
+            "SELECT own.hash, own.position, other.path, other.position FROM fingerprints AS own "
+            "JOIN fingerprints AS other ON own.hash = other.hash "
+            "WHERE own.path = ? AND NOT (other.path = own.path AND other.position = own.position) "
+            "ORDER BY other.path, own.position",
+            (file_name,),
+        ):
+            if fingerprint not in previous_fingerprints:
+                yield position, other_file, other_position
+
+
+def extend_match(tokens, position, other_tokens, other_position):
+    """Extend a match of two positions backward and forward and return the start positions and the length."""
+
+    while position > 0 and other_position > 0 and tokens[position - 1] == other_tokens[other_position - 1]:
+        position -= 1
+        other_position -= 1
+
+    length = 0
+    while (
+        position + length < len(tokens)
+        and other_position + length < len(other_tokens)
+        and tokens[position + length] == other_tokens[other_position + length]
+    ):
+        length += 1
+
+    return position, other_position, length
+
+
+class TokenizedFiles(dict):
+    """Cache of the tokens and their line numbers of the files, tokenized on first use."""
+
+    def __init__(self, language):
+        """Construct the class."""
+
+        super().__init__()
+        self._language = language
+
+    def __missing__(self, file_name):
+        """Tokenize the file that is not in the cache yet."""
+
+        self[file_name] = tokenize_file(file_name, self._language)
+        return self[file_name]
+
+
+def find_duplicates_of_file(index, file_name, tokenized_files, minimum_tokens):
+    """
+    Find the new duplicates of at least the minimum number of tokens of the file with the files in the index.
+
+    The duplicates are returned as a dictionary from their two occurrences, as (file, position), to their length.
+    Matches that lie within an already extended match of the same two files are skipped.
+    """
+
+    tokens = tokenized_files[file_name][0]
+    duplicates = {}
+    extended_matches = {}
+    for position, other_file, other_position in index.find_new_matches(file_name):
+        offset = (other_file, other_position - position)
+        start, end = extended_matches.get(offset, (0, 0))
+        if start <= position < end:
+            continue
+
+        start, other_start, length = extend_match(tokens, position, tokenized_files[other_file][0], other_position)
+        extended_matches[offset] = (start, start + length)
+        if length >= minimum_tokens and not (other_file == file_name and abs(start - other_start) < length):
+            duplicates[tuple(sorted([(file_name, start), (other_file, other_start)]))] = length
+
+    return duplicates
+
+
+def find_new_duplicates(index, changed_files, language, minimum_tokens):
+    """Find the duplicates that the changes introduced in one of the changed files and yield them as cpd csv rows."""
+
+    tokenized_files = TokenizedFiles(language)
+
+    duplicates = {}
+    for file_name in changed_files:
+        duplicates.update(find_duplicates_of_file(index, file_name, tokenized_files, minimum_tokens))
+
+    for occurrences, length in sorted(duplicates.items(), key=lambda duplicate: (-duplicate[1], duplicate[0])):
+        first_file, first_start = occurrences[0]
+        first_lines = tokenized_files[first_file][1]
+
+        row = [first_lines[first_start + length - 1] - first_lines[first_start] + 1, length, len(occurrences)]
+        for occurrence_file, occurrence_start in occurrences:
+            row.extend([tokenized_files[occurrence_file][1][occurrence_start], occurrence_file])
+        yield row
+
+
+def determine_changed_files(settings):
+    """Determine the changed files of the language from the settings or from the git diff range."""
+
+    changed_files = list(settings["changed_files"] or [])
+
+    if settings["diff_range"]:
+        command = [
+            "git",
+            "-C",
+            settings["analysis_directory"],
+            "diff",
+            "--name-only",
+            "--relative",
+            "--diff-filter=AMR",
+        ]
+        process = Subprocess(command + [settings["diff_range"]], verbose=1)
+        for line in process.execute_lines(settings["report_directory"], "changed_files"):
+            if line.strip():
+                changed_files.append(os.path.join(settings["analysis_directory"], line.strip()))
+
+    extensions = LANGUAGES[settings["language"]]["extensions"]
+    return [
+        os.path.abspath(file_name)
+        for file_name in changed_files
+        if file_name.endswith(extensions) and os.path.isfile(file_name)
+    ]
+
+
+def save_new_duplicates(report_file, rows):
+    """Save the new duplicates to a file in the csv format of cpd."""
+
+    with open(report_file, "w", encoding="utf-8") as report:
+        report.write("lines,tokens,occurrences\n")
+        csv.writer(report, lineterminator="\n").writerows(rows)
+
+
+def analyze_new_duplication(settings):
+    """Update the fingerprint index and find the duplicates that the changed files introduce."""
+
+    report_dir = create_report_directory(settings["report_directory"])
+    language = settings["language"]
+    minimum_tokens = int(settings["tokens"])
+
+    index = FingerprintIndex(os.path.join(report_dir, INDEX_FILE), language, minimum_tokens)
+    try:
+        file_names = (os.path.abspath(name) for name in find_language_files(settings["analysis_directory"], language))
+        index.update(file_names, settings["jobs"])
+        changed_files = determine_changed_files(settings)
+        rows = list(find_new_duplicates(index, changed_files, language, minimum_tokens))
+    finally:
+        index.close()
+
+    save_new_duplicates(os.path.join(report_dir, "new_code_duplication.csv"), rows)
+
+    print(f"{len(rows)} new duplicates found in {len(changed_files)} changed files")
+    for row in rows:
+        print(
+            f"{row[1]} tokens ({row[0]} lines): "
+            + ", ".join(f"{name}:{line}" for line, name in zip(row[3::2], row[4::2]))
+        )
+
+    return rows
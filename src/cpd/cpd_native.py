@@ -0,0 +1,288 @@
+"""
+Detect duplicated code without cpd.
+
+The source files of the language are tokenized, optionally in a pool of processes. Comments and whitespace are
+skipped, all other tokens are compared by their text. Each window of the minimum number of tokens is hashed with a
+Rabin-Karp rolling hash and windows with the same hash are verified on their tokens. A duplicate is reported from the
+first window of a run of duplicated windows and extended as long as all its occurrences continue to match.
+
+The result is written in the csv format of cpd: lines,tokens,occurrences followed by the line and file of each
+occurrence.
+"""
+
+import csv
+import io
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+C_STYLE_COMMENT = r"//[^\n]*|/\*[\s\S]*?\*/"
+HASH_COMMENT = r"#[^\n]*"
+C_STYLE_STRING = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+PYTHON_STRING = r'[rbuRBUfF]{0,2}(?:"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')'
+
+LANGUAGES = {
+    "python": {"extensions": (".py",), "comment": HASH_COMMENT, "string": PYTHON_STRING},
+    "java": {"extensions": (".java",), "comment": C_STYLE_COMMENT, "string": C_STYLE_STRING},
+    "cpp": {
+        "extensions": (".c", ".cc", ".cpp", ".cxx", ".h", ".hh", ".hpp", ".hxx"),
+        "comment": C_STYLE_COMMENT,
+        "string": C_STYLE_STRING,
+    },
+    "cs": {"extensions": (".cs",), "comment": C_STYLE_COMMENT, "string": C_STYLE_STRING},
+    "ecmascript": {"extensions": (".js",), "comment": C_STYLE_COMMENT, "string": C_STYLE_STRING},
+    "go": {"extensions": (".go",), "comment": C_STYLE_COMMENT, "string": C_STYLE_STRING},
+    "kotlin": {"extensions": (".kt",), "comment": C_STYLE_COMMENT, "string": C_STYLE_STRING},
+}
+
+TOKEN_PATTERNS = {
+    name: re.compile(
+        rf"(?P<comment>{language['comment']})|(?P<token>{language['string']}|[A-Za-z_]\w*|\d[\w.]*|[^\s\w])"
+    )
+    for name, language in LANGUAGES.items()
+}
+
+HASH_BASE = 1000003
+HASH_BASE_INVERSE = pow(HASH_BASE, -1, 2**64)
+
+
+def find_language_files(directory, language):
+    """Find the source files of the language in the directory."""
+
+    extensions = LANGUAGES[language]["extensions"]
+    for root, _, files in os.walk(directory):
+        for file in sorted(files):
+            if file.endswith(extensions):
+                yield os.path.join(root, file)
+
+
+def tokenize(content, language):
+    """Split the content in tokens, skipping whitespace and comments, and return the tokens and their line numbers."""
+
+    tokens = []
+    lines = []
+    line = 1
+    position = 0
+    for match in TOKEN_PATTERNS[language].finditer(content):
+        line += content.count("\n", position, match.start())
+        position = match.start()
+        if match.lastgroup == "token":
+            tokens.append(match.group())
+            lines.append(line)
+
+    return tokens, lines
+
+
+def tokenize_file(file_name, language):
+    """Tokenize the file and return the tokens and their line numbers."""
+
+    with open(file_name, "r", encoding="utf-8", errors="replace") as source_file:
+        return tokenize(source_file.read(), language)
+
+
+def tokenize_files(file_names, language, jobs=1):
+    """Tokenize the files and yield the file name together with its tokens and their line numbers."""
+
+    if jobs <= 1:
+        for file_name in file_names:
+            yield file_name, *tokenize_file(file_name, language)
+        return
+
+    file_names = list(file_names)
+    chunk_size = max(1, len(file_names) // (jobs * 16))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        tokenized_files = executor.map(partial(tokenize_file, language=language), file_names, chunksize=chunk_size)
+        for file_name, (tokens, lines) in zip(file_names, tokenized_files):
+            yield file_name, tokens, lines
+
+
+def determine_powers(base, size):
+    """Determine base^1 up to base^size modulo 2^64."""
+
+    return np.cumprod(np.full(size, base, dtype=np.uint64))
+
+
+def determine_window_hashes(token_ids, window, powers, inverse_powers):
+    """
+    Determine the rolling hash of each window of tokens.
+
+    The hash of a window is sum(token * base^(window - 1 - offset)) modulo 2^64. It is computed for all windows at
+    once from the prefix sums of token * base^-(position + 1), which are scaled back with base^(position + window).
+    """
+
+    count = len(token_ids) - window + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+
+    prefix = np.zeros(len(token_ids) + 1, dtype=np.uint64)
+    np.cumsum(token_ids.astype(np.uint64) * inverse_powers[: len(token_ids)], out=prefix[1:])
+    first_power = window - 1
+    last_power = first_power + count
+    return (prefix[window:] - prefix[:count]) * powers[first_power:last_power]
+
+
+def intern_tokens(tokens, token_ids):
+    """Convert the tokens to an array of integer ids, adding new tokens to the ids."""
+
+    return np.array([token_ids.setdefault(token, len(token_ids) + 1) for token in tokens], dtype=np.int64)
+
+
+def determine_all_window_hashes(files, window):
+    """Determine the hashes of the windows of all files together with the file index and position of each window."""
+
+    size = max(len(token_ids) for token_ids in files)
+    powers = determine_powers(HASH_BASE, size)
+    inverse_powers = determine_powers(HASH_BASE_INVERSE, size)
+
+    hashes = [determine_window_hashes(token_ids, window, powers, inverse_powers) for token_ids in files]
+    file_indices = np.repeat(np.arange(len(files)), [len(file_hashes) for file_hashes in hashes])
+    positions = np.concatenate([np.arange(len(file_hashes)) for file_hashes in hashes])
+
+    return np.concatenate(hashes), file_indices, positions
+
+
+def find_candidate_groups(files, minimum_tokens):
+    """Find the groups of windows that have the same hash, as lists of (file index, position)."""
+
+    if not files:
+        return
+
+    all_hashes, file_indices, positions = determine_all_window_hashes(files, minimum_tokens)
+
+    order = np.argsort(all_hashes, kind="stable")
+    sorted_hashes = all_hashes[order]
+    boundaries = np.flatnonzero(np.diff(sorted_hashes)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(sorted_hashes)]))
+
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if end - start > 1:
+            members = order[start:end]
+            yield list(zip(file_indices[members].tolist(), positions[members].tolist()))
+
+
+def verify_group(files, group, minimum_tokens):
+    """Split a group of windows with the same hash in groups of windows with the same tokens."""
+
+    verified_groups = defaultdict(list)
+    for file_index, position in group:
+        end = position + minimum_tokens
+        verified_groups[files[file_index][position:end].tobytes()].append((file_index, position))
+
+    return [verified_group for verified_group in verified_groups.values() if len(verified_group) > 1]
+
+
+def is_left_extendable(token_lists, occurrences):
+    """Check if all occurrences are preceded by the same token, so the duplicate starts at an earlier window."""
+
+    if any(position == 0 for _, position in occurrences):
+        return False
+
+    return len({token_lists[file_index][position - 1] for file_index, position in occurrences}) == 1
+
+
+def split_by_next_token(token_lists, occurrences, length):
+    """Split the occurrences by the token that follows them; occurrences at the end of their file are dropped."""
+
+    next_groups = defaultdict(list)
+    for file_index, position in occurrences:
+        tokens = token_lists[file_index]
+        if position + length < len(tokens):
+            next_groups[tokens[position + length]].append((file_index, position))
+
+    return list(next_groups.values())
+
+
+def extend_duplicate(token_lists, occurrences, length):
+    """
+    Extend the duplicate and yield its maximal duplicates as their length and occurrences.
+
+    The duplicate is extended as long as all occurrences are followed by the same token. Where they diverge, the
+    duplicate ends and the occurrences are split by their next token, each subgroup of at least two occurrences being
+    extended further. So a longer duplicate of some of the occurrences is not hidden by an occurrence that diverges
+    earlier. A group that can be extended to the left is skipped, together with its subgroups, because it is found
+    from an earlier window.
+    """
+
+    groups = [(occurrences, length)]
+    while groups:
+        occurrences, length = groups.pop()
+        if is_left_extendable(token_lists, occurrences):
+            continue
+
+        next_groups = split_by_next_token(token_lists, occurrences, length)
+        while len(next_groups) == 1 and len(next_groups[0]) == len(occurrences):
+            length += 1
+            next_groups = split_by_next_token(token_lists, occurrences, length)
+
+        yield length, sorted(occurrences)
+        groups.extend((next_group, length + 1) for next_group in next_groups if len(next_group) > 1)
+
+
+def find_duplicates(files, minimum_tokens):
+    """
+    Find the maximal duplicated token runs of at least the minimum number of tokens.
+
+    The files are arrays of token ids. Each duplicate is returned as its number of tokens and its occurrences as
+    sorted (file index, position) tuples. Like cpd, a longer duplicate of some occurrences is reported next to the
+    shorter duplicate of all occurrences.
+    """
+
+    token_lists = [token_ids.tolist() for token_ids in files]
+
+    duplicates = []
+    for group in find_candidate_groups(files, minimum_tokens):
+        for occurrences in verify_group(files, group, minimum_tokens):
+            duplicates.extend(extend_duplicate(token_lists, occurrences, minimum_tokens))
+
+    return sorted(duplicates, key=lambda duplicate: (-duplicate[0], duplicate[1]))
+
+
+def create_duplicate_rows(duplicates, file_names, file_lines):
+    """Create the cpd csv rows of the duplicates: lines, tokens, occurrences and the line and file per occurrence."""
+
+    for length, occurrences in duplicates:
+        first_file, first_position = occurrences[0]
+        lines = file_lines[first_file][first_position + length - 1] - file_lines[first_file][first_position] + 1
+
+        row = [lines, length, len(occurrences)]
+        for file_index, position in occurrences:
+            row.extend([file_lines[file_index][position], file_names[file_index]])
+
+        yield row
+
+
+def detect_duplicates(file_names, language, minimum_tokens, jobs=1):
+    """Detect the duplicates in the files and yield them as cpd csv rows."""
+
+    token_ids = {}
+    names = []
+    files = []
+    file_lines = []
+    for file_name, tokens, lines in tokenize_files(file_names, language, jobs):
+        names.append(file_name)
+        files.append(intern_tokens(tokens, token_ids))
+        file_lines.append(lines)
+
+    return create_duplicate_rows(find_duplicates(files, minimum_tokens), names, file_lines)
+
+
+def measure_code_duplication_natively(settings):
+    """Measure the amount of code duplication without cpd and yield the result as lines in the csv format of cpd."""
+
+    file_names = find_language_files(settings["analysis_directory"], settings["language"])
+    rows = detect_duplicates(file_names, settings["language"], int(settings["tokens"]), settings["jobs"])
+
+    yield "lines,tokens,occurrences"
+
+    line = io.StringIO()
+    csv_writer = csv.writer(line, lineterminator="")
+    for row in rows:
+        csv_writer.writerow(row)
+        yield line.getvalue()
+        line.seek(0)
+        line.truncate()
@@ -168,29 +168,68 @@ class Subprocess:
 
         return command_output
 
-    @staticmethod
-    def __write_log_file(output_directory, filename, command_output):
+    def execute_lines(self, output_directory, filename, check_return_code=True):
         """
-        Write process data to log file.
+        Execute command yielding the lines of stdout as they are produced.
 
-        Write command output to unique (timestamped) log file based on the
-        provided `output_directory` and `filename`.
+        Execute the command as defined in the object and stream its output
+        line by line, without holding the whole output in memory. Each line
+        is also written to a log file. With the possibility to raise an
+        informative exception in case of a non-zero return code, after the
+        last line has been consumed.
 
         :param output_directory: log file output directory
         :param filename log file filename
-        :param command_output: Optional raise exception with non-zero return code
+        :param check_return_code: Optional raise exception with non-zero return code
+        :return: Generator of the decoded lines of stdout without line endings
+        """
+        LOG.debug("Starting streaming call: %s", self.command)
+
+        with self.__open_log_file(output_directory, filename) as log_file:
+            with Popen(self.command, stdout=PIPE, stderr=STDOUT, shell=False) as process:  # nosec
+                for line in process.stdout:
+                    log_file.write(line)
+                    if self.verbose >= 3:
+                        print(line.decode("utf-8", errors="replace"), end="")
+
+                    yield line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+                returncode = process.wait(timeout=self.timeout)
+
+        if returncode != 0 and check_return_code:
+            raise ProcessError(f"{self.base_command} returned a non-zero exit status {returncode}")
+
+    @staticmethod
+    def __open_log_file(output_directory, filename):
+        """
+        Open a unique (timestamped) log file for writing.
+
+        :param output_directory: log file output directory
+        :param filename log file filename
+        :return: The opened log file
         """
         try:
-            with open(
-                join(output_directory, f'{filename}_{strftime("%Y%m%d-%H%M%S")}.log'),
-                "wb",
-            ) as file:
-                file.write(command_output.stdout)
+            return open(join(output_directory, f'{filename}_{strftime("%Y%m%d-%H%M%S")}.log'), "wb")
         except FileNotFoundError as exception:
             raise SubprocessRuntimeError(
                 f"Unable to open ('{exception.filename}') and write results.\nPlease use preconditions to enforce: "
                 "['OutputDirectoryExists', 'OutputDirectoryIsEmpty']."
             ) from exception
 
+    @staticmethod
+    def __write_log_file(output_directory, filename, command_output):
+        """
+        Write process data to log file.
+
+        Write command output to unique (timestamped) log file based on the
+        provided `output_directory` and `filename`.
+
+        :param output_directory: log file output directory
+        :param filename log file filename
+        :param command_output: Optional raise exception with non-zero return code
+        """
+        with Subprocess.__open_log_file(output_directory, filename) as file:
+            file.write(command_output.stdout)
+
 
 # pylint: enable=too-few-public-methods
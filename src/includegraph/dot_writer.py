@@ -0,0 +1,54 @@
+"""
+Write an include graph in the DOT language of graphviz.
+
+The graph is streamed to the file node by node and edge by edge. Whether an edge is highlighted is decided by a
+lookup in a precomputed set of edges, so writing takes linear time in the size of the graph.
+"""
+
+HIGHLIGHT_ATTRIBUTES = {"color": "red"}
+
+
+def quote(name):
+    """Quote the name as a DOT identifier."""
+
+    return '"' + str(name).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def format_attributes(attributes):
+    """Format the attributes as a DOT attribute list."""
+
+    if not attributes:
+        return ""
+
+    return " [" + ", ".join(f"{key}={quote(value)}" for key, value in attributes.items()) + "]"
+
+
+def write_dot(graph, output, highlighted_edges=frozenset(), node_attributes=None, edge_attributes=None):
+    """
+    Write the graph in the DOT language to the output stream, highlighting the provided edges.
+
+    The optional node_attributes and edge_attributes functions return the DOT attributes of a node or an edge.
+    """
+
+    output.write("digraph {\n")
+
+    for node in graph:
+        attributes = node_attributes(node) if node_attributes else None
+        output.write(f"{quote(node)}{format_attributes(attributes)};\n")
+
+    for source, target in graph.edges:
+        attributes = dict(edge_attributes(source, target)) if edge_attributes else {}
+        if (source, target) in highlighted_edges:
+            attributes.update(HIGHLIGHT_ATTRIBUTES)
+        output.write(f"{quote(source)} -> {quote(target)}{format_attributes(attributes)};\n")
+
+    output.write("}\n")
+
+
+def save_dot(graph, dot_file, highlighted_edges=frozenset(), node_attributes=None, edge_attributes=None):
+    """Save the graph in the DOT language to a file, highlighting the provided edges."""
+
+    with open(dot_file, "w", encoding="utf-8") as output:
+        write_dot(graph, output, highlighted_edges, node_attributes, edge_attributes)
+
+    return dot_file
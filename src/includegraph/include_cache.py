@@ -0,0 +1,72 @@
+"""
+Persist the scanned include directives of the source files in the report directory.
+
+For each file the manifest stores its modification time and size together with its include directives and line count.
+On the next run only the files that are new or changed are scanned again, the others are taken from the manifest.
+"""
+
+import json
+import os
+
+from src.includegraph.include_scanner import scan_files
+
+MANIFEST_FILE = "include_scan_cache.json"
+MANIFEST_VERSION = 1
+
+
+def load_manifest(manifest_file):
+    """Load the manifest, or return an empty manifest when it does not exist or has another version."""
+
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as manifest:
+            content = json.load(manifest)
+    except (OSError, ValueError):
+        return {}
+
+    if content.get("version") != MANIFEST_VERSION:
+        return {}
+
+    return content["files"]
+
+
+def save_manifest(manifest_file, files):
+    """Save the manifest."""
+
+    with open(manifest_file, "w", encoding="utf-8") as manifest:
+        json.dump({"version": MANIFEST_VERSION, "files": files}, manifest)
+
+
+def update_manifest(files, file_names, jobs=1):
+    """
+    Update the manifest for the provided files and return the updated manifest.
+
+    Files that are unchanged since the previous scan are taken from the manifest, the other files are scanned.
+    Files that no longer exist are left out of the updated manifest.
+    """
+
+    updated_files = {}
+    changed_files = {}
+    for file_name in file_names:
+        file_name = os.path.abspath(file_name)
+        status = os.stat(file_name)
+        entry = files.get(file_name)
+        if entry and entry["mtime"] == status.st_mtime_ns and entry["size"] == status.st_size:
+            updated_files[file_name] = entry
+        else:
+            changed_files[file_name] = {"mtime": status.st_mtime_ns, "size": status.st_size}
+
+    for file_name, includes, lines in scan_files(list(changed_files), jobs):
+        updated_files[file_name] = dict(changed_files[file_name], includes=includes, lines=lines)
+
+    return updated_files
+
+
+def scan_files_incrementally(file_names, report_directory, jobs=1, rebuild=False):
+    """Scan the files using the manifest in the report directory and yield each file with its includes and lines."""
+
+    manifest_file = os.path.join(report_directory, MANIFEST_FILE)
+    files = update_manifest({} if rebuild else load_manifest(manifest_file), file_names, jobs)
+    save_manifest(manifest_file, files)
+
+    for file_name, entry in files.items():
+        yield file_name, entry["includes"], entry["lines"]
@@ -0,0 +1,101 @@
+"""
+Determine the cost of the transitive includes of each file in an include graph.
+
+The cost of a file is the number of files and the lines of code that it pulls in through its (indirect) includes.
+The include graph is condensed into its strongly connected components, after which the set of reachable components
+of each component is determined with one pass in reverse topological order. The sets are bitsets, stored in python
+integers, that are merged with a bitwise or.
+"""
+
+import csv
+import os
+
+import networkx as nx
+import numpy as np
+
+TRANSLATION_UNIT_EXTENSIONS = (".c", ".cpp")
+
+
+def bitset_to_mask(bitset, size):
+    """Convert a bitset to a boolean numpy array of the provided size."""
+
+    packed = np.frombuffer(bitset.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(packed, count=size, bitorder="little").astype(bool)
+
+
+def determine_reachable_components(condensation):
+    """Determine for each component of the condensed graph the bitset of components it can reach, including itself."""
+
+    reachable = {}
+    for component in reversed(list(nx.topological_sort(condensation))):
+        bitset = 1 << component
+        for successor in condensation.successors(component):
+            bitset |= reachable[successor]
+        reachable[component] = bitset
+
+    return reachable
+
+
+def determine_include_cost(graph):
+    """Determine for each file the number of files and lines of code of its transitive includes."""
+
+    condensation = nx.condensation(graph)
+    size = condensation.number_of_nodes()
+
+    component_files = np.zeros(size, dtype=np.int64)
+    component_lines = np.zeros(size, dtype=np.int64)
+    for component, members in condensation.nodes(data="members"):
+        component_files[component] = len(members)
+        component_lines[component] = sum(graph.nodes[member].get("lines") or 0 for member in members)
+
+    include_cost = {}
+    for component, bitset in determine_reachable_components(condensation).items():
+        mask = bitset_to_mask(bitset, size)
+        files = int(component_files[mask].sum())
+        lines = int(component_lines[mask].sum())
+        for member in condensation.nodes[component]["members"]:
+            include_cost[member] = (files - 1, lines - (graph.nodes[member].get("lines") or 0))
+
+    return include_cost
+
+
+def rank_include_cost(graph, include_cost, translation_units):
+    """
+    Rank the cost of either the translation units or the headers, the most expensive first.
+
+    Files without a line count, like the unresolved includes, are not ranked.
+    """
+
+    ranking = [
+        (file_name, files, lines)
+        for file_name, (files, lines) in include_cost.items()
+        if file_name.endswith(TRANSLATION_UNIT_EXTENSIONS) == translation_units
+        and graph.nodes[file_name].get("lines") is not None
+    ]
+
+    return sorted(ranking, key=lambda item: (item[2], item[1]), reverse=True)
+
+
+def save_include_cost(report_file, ranking):
+    """Save the ranked include cost to a csv file."""
+
+    with open(report_file, "w", encoding="utf-8") as report:
+        csv_writer = csv.writer(report, delimiter=",", lineterminator="\n", quoting=csv.QUOTE_ALL)
+        csv_writer.writerow(["File", "Included Files", "Included Lines Of Code"])
+        csv_writer.writerows(ranking)
+
+
+def analyze_include_cost(graph, settings):
+    """Analyze the transitive include cost of the headers and translation units."""
+
+    include_cost = determine_include_cost(graph)
+
+    report_dir = settings["report_directory"]
+    save_include_cost(
+        os.path.join(report_dir, "header_include_cost.csv"), rank_include_cost(graph, include_cost, False)
+    )
+    save_include_cost(
+        os.path.join(report_dir, "translation_unit_include_cost.csv"), rank_include_cost(graph, include_cost, True)
+    )
+
+    return include_cost
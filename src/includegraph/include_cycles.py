@@ -0,0 +1,85 @@
+"""
+Analyze the include cycles of an include graph using its strongly connected components.
+
+Every include cycle lies within one strongly connected component, so the components that contain a cycle are found
+in linear time, even when the number of elementary cycles is exponential. For each component the edges that close a
+cycle during a depth first search are determined: removing these feedback edges breaks all cycles of the component.
+Concrete cycles are only enumerated up to a maximum length and count.
+"""
+
+from itertools import islice
+
+import networkx as nx
+
+ON_STACK = 1
+FINISHED = 2
+
+
+def determine_cyclic_components(graph):
+    """Determine the strongly connected components that contain a cycle, the largest component first."""
+
+    components = [
+        component
+        for component in nx.strongly_connected_components(graph)
+        if len(component) > 1 or graph.has_edge(next(iter(component)), next(iter(component)))
+    ]
+
+    return sorted(components, key=len, reverse=True)
+
+
+def determine_cycle_edges(graph, components):
+    """Determine the edges that are part of a cycle: the edges within the cyclic components."""
+
+    component_of = {node: index for index, component in enumerate(components) for node in component}
+
+    return {
+        (source, target)
+        for source, target in graph.edges(component_of)
+        if component_of.get(target, -1) == component_of[source]
+    }
+
+
+def determine_feedback_edges(graph, component):
+    """Determine the edges of the component that close a cycle in a depth first search of the component."""
+
+    feedback_edges = []
+    state = {}
+    for root in sorted(component):
+        if root in state:
+            continue
+
+        state[root] = ON_STACK
+        stack = [(root, iter(graph.successors(root)))]
+        while stack:
+            node, successors = stack[-1]
+            for successor in successors:
+                if successor not in component:
+                    continue
+
+                if successor not in state:
+                    state[successor] = ON_STACK
+                    stack.append((successor, iter(graph.successors(successor))))
+                    break
+
+                if state[successor] == ON_STACK:
+                    feedback_edges.append((node, successor))
+            else:
+                state[node] = FINISHED
+                stack.pop()
+
+    return feedback_edges
+
+
+def determine_cycles(graph, components, max_length=None, max_count=None):
+    """Determine the elementary cycles in the components, limited to a maximum length and count."""
+
+    cycles = []
+    for component in components:
+        if max_count is not None and len(cycles) >= max_count:
+            break
+
+        component_cycles = nx.simple_cycles(graph.subgraph(component), length_bound=max_length)
+        remaining = None if max_count is None else max_count - len(cycles)
+        cycles.extend(islice(component_cycles, remaining))
+
+    return cycles
@@ -0,0 +1,114 @@
+"""
+Export the include graph to formats that other tools can load quickly.
+
+The supported formats are:
+
+* graphml: the include graph as GraphML, for graph tools like Gephi and yEd
+* json: the include graph as a JSON adjacency list
+* csr: the include graph as compressed sparse rows in a numpy .npz file
+
+The csr file contains the arrays names, lines, offsets and targets. The nodes are numbered in order of their names.
+The targets of node i are targets[offsets[i]:offsets[i + 1]] and the lines of code of node i are lines[i], -1 for an
+include that is not resolved to a file. The file is loaded without pickle, so loading millions of edges takes
+milliseconds.
+"""
+
+import json
+import os
+
+import networkx as nx
+import numpy as np
+from networkx.readwrite import json_graph
+
+EXPORT_FORMATS = ("graphml", "json", "csr")
+UNKNOWN_LINES = -1
+
+
+def export_graphml(graph, report_file):
+    """Export the include graph to a GraphML file."""
+
+    export_graph = nx.DiGraph()
+    export_graph.add_nodes_from(
+        (node, {} if lines is None else {"lines": lines}) for node, lines in graph.nodes(data="lines")
+    )
+    export_graph.add_edges_from(graph.edges)
+
+    nx.write_graphml(export_graph, report_file)
+    return report_file
+
+
+def export_json(graph, report_file):
+    """Export the include graph to a JSON adjacency file."""
+
+    with open(report_file, "w", encoding="utf-8") as output:
+        json.dump(json_graph.adjacency_data(graph), output)
+
+    return report_file
+
+
+def create_csr(graph):
+    """Create the names, lines, offsets and targets arrays of the include graph."""
+
+    names = sorted(graph)
+    index_of = {name: index for index, name in enumerate(names)}
+
+    lines = np.array(
+        [UNKNOWN_LINES if lines is None else lines for lines in (graph.nodes[name].get("lines") for name in names)],
+        dtype=np.int64,
+    )
+
+    degrees = np.array([graph.out_degree(name) for name in names], dtype=np.int64)
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum(degrees, out=offsets[1:])
+
+    targets = np.fromiter(
+        (index_of[target] for name in names for target in sorted(graph.successors(name), key=index_of.get)),
+        dtype=np.int64,
+        count=int(offsets[-1]),
+    )
+
+    return np.array(names, dtype=str), lines, offsets, targets
+
+
+def export_csr(graph, report_file):
+    """Export the include graph to a numpy .npz file with compressed sparse rows."""
+
+    names, lines, offsets, targets = create_csr(graph)
+    np.savez(report_file, names=names, lines=lines, offsets=offsets, targets=targets)
+    return report_file
+
+
+def load_csr(csr_file):
+    """Load the names, lines, offsets and targets arrays from a csr file."""
+
+    with np.load(csr_file, allow_pickle=False) as csr:
+        return csr["names"], csr["lines"], csr["offsets"], csr["targets"]
+
+
+def csr_to_graph(names, lines, offsets, targets):
+    """Convert the compressed sparse rows to an include graph."""
+
+    graph = nx.DiGraph()
+    for index, name in enumerate(names.tolist()):
+        graph.add_node(name, lines=None if lines[index] == UNKNOWN_LINES else int(lines[index]))
+
+    sources = np.repeat(np.arange(len(names)), np.diff(offsets))
+    graph.add_edges_from(zip(names[sources].tolist(), names[targets].tolist()))
+    return graph
+
+
+def export_include_graph(graph, export_formats, settings):
+    """Export the include graph to the requested formats in the report directory."""
+
+    exporters = {
+        "graphml": (export_graphml, "include_graph.graphml"),
+        "json": (export_json, "include_graph_adjacency.json"),
+        "csr": (export_csr, "include_graph.npz"),
+    }
+
+    report_files = []
+    for export_format in export_formats:
+        exporter, file_name = exporters[export_format]
+        report_files.append(exporter(graph, os.path.join(settings["report_directory"], file_name)))
+
+    return report_files
@@ -0,0 +1,145 @@
+"""
+Answer include queries with a reachability index of the include graph.
+
+The index is built once: the include graph is condensed into its strongly connected components and for each component
+the bitset of reachable components is determined. A query whether a file includes another file is then a single bit
+test, a path query only visits files that can reach the target and the files that include a file are read from a
+bitset of the reversed graph.
+
+Queries are read one per line, the files are separated by whitespace:
+
+* includes <file> <file>: does the first file include the second file, directly or indirectly
+* path <file> <file>: one include path from the first file to the second file
+* includers <file>: the files that include the file, directly or indirectly
+"""
+
+from collections import deque
+
+import networkx as nx
+import numpy as np
+
+from src.includegraph.include_cost import bitset_to_mask, determine_reachable_components
+from src.includegraph.include_resolver import find_node, index_nodes_by_name
+
+
+class ReachabilityIndex:
+    """Reachability index of an include graph."""
+
+    def __init__(self, graph):
+        """Construct the class."""
+
+        self._graph = graph
+        self._condensation = nx.condensation(graph)
+        self._component_of = self._condensation.graph["mapping"]
+        self._descendants = determine_reachable_components(self._condensation)
+        self._ancestors = None
+        self._nodes_by_name = index_nodes_by_name(graph)
+
+    def find_node(self, name):
+        """Find the node of a file by its full path or by a unique trailing part of its path."""
+
+        node = find_node(self._graph, name, self._nodes_by_name)
+        if node not in self._graph:
+            raise nx.NodeNotFound(f"{name} is not in the include graph")
+
+        return node
+
+    def _is_cyclic(self, node):
+        """Check if the node is part of a cycle."""
+
+        component = self._component_of[node]
+        return len(self._condensation.nodes[component]["members"]) > 1 or self._graph.has_edge(node, node)
+
+    def includes(self, source, target):
+        """Check if the source file includes the target file, directly or indirectly."""
+
+        if source == target:
+            return self._is_cyclic(source)
+
+        return bool(self._descendants[self._component_of[source]] >> self._component_of[target] & 1)
+
+    def path(self, source, target):
+        """Determine an include path from the source file to the target file, or None when there is none."""
+
+        if not self.includes(source, target):
+            return None
+
+        target_bit = 1 << self._component_of[target]
+        predecessors = {}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for successor in self._graph.successors(node):
+                if successor in predecessors or not self._descendants[self._component_of[successor]] & target_bit:
+                    continue
+
+                predecessors[successor] = node
+                if successor == target:
+                    return self._reconstruct_path(predecessors, source, target)
+
+                queue.append(successor)
+
+        return None
+
+    @staticmethod
+    def _reconstruct_path(predecessors, source, target):
+        """Reconstruct the path from the source to the target from the predecessors."""
+
+        path = [target]
+        while path[-1] != source or len(path) == 1:
+            path.append(predecessors[path[-1]])
+
+        return list(reversed(path))
+
+    def includers(self, target):
+        """Determine the files that include the target file, directly or indirectly."""
+
+        if self._ancestors is None:
+            self._ancestors = determine_reachable_components(self._condensation.reverse(copy=False))
+
+        mask = bitset_to_mask(self._ancestors[self._component_of[target]], self._condensation.number_of_nodes())
+
+        includers = []
+        for component in np.flatnonzero(mask):
+            includers.extend(self._condensation.nodes[int(component)]["members"])
+
+        if not self._is_cyclic(target):
+            includers.remove(target)
+
+        return sorted(includers)
+
+
+def answer_query(index, query):
+    """Answer a single query and return the answer as text."""
+
+    command, *names = query.split()
+    nodes = [index.find_node(name) for name in names]
+
+    if command == "includes" and len(nodes) == 2:
+        return "yes" if index.includes(*nodes) else "no"
+
+    if command == "path" and len(nodes) == 2:
+        path = index.path(*nodes)
+        return " ".join(path) if path else "no path"
+
+    if command == "includers" and len(nodes) == 1:
+        return " ".join(index.includers(nodes[0]))
+
+    raise ValueError(f"invalid query: {query}")
+
+
+def answer_queries(index, queries, output):
+    """Answer the queries, one per line, and write one answer line per query to the output."""
+
+    for query in queries:
+        query = query.strip()
+        if not query:
+            continue
+
+        try:
+            answer = answer_query(index, query)
+        except (nx.NodeNotFound, ValueError) as exception:
+            answer = f"error: {exception}"
+
+        output.write(f"{query}: {answer}\n")
+        output.flush()
@@ -0,0 +1,190 @@
+"""
+Render huge include graphs as clusters of files.
+
+The files are aggregated per directory into clusters, optionally limited to the first directory levels below the
+analyzed directory. The overview shows the clusters with the number of includes between them. Each cluster can be
+drilled down into: its files are shown with the includes between them and the includes from and to other clusters.
+The overview is rendered to svg and shown on an html page. The drill-down of a cluster is rendered on request; only
+when all drill-downs are requested, they are rendered together with the overview and linked from it.
+"""
+
+import html
+import os
+from collections import Counter
+
+import graphviz
+import networkx as nx
+
+from src.includegraph.dot_writer import save_dot
+
+EXTERNAL_CLUSTER = "<external>"
+
+
+def determine_cluster(node, analysis_directory, cluster_depth=None):
+    """Determine the cluster of the file: its directory relative to the analysis directory."""
+
+    if not os.path.isabs(node):
+        return EXTERNAL_CLUSTER
+
+    directory = os.path.dirname(node)
+    relative_directory = os.path.relpath(directory, analysis_directory)
+    if relative_directory.startswith(os.pardir):
+        return directory
+
+    parts = relative_directory.split(os.sep)
+    return os.sep.join(parts[:cluster_depth] if cluster_depth else parts)
+
+
+def determine_clusters(graph, settings):
+    """Determine the cluster of each file in the include graph."""
+
+    analysis_directory = os.path.abspath(settings["analysis_directory"])
+    return {node: determine_cluster(node, analysis_directory, settings["cluster_depth"]) for node in graph}
+
+
+def create_cluster_graph(graph, cluster_of, cycle_edges):
+    """
+    Create a graph of the clusters with the number of files per cluster and the number of includes per edge.
+
+    The returned set contains the cluster edges that aggregate an include that is part of a cycle.
+    """
+
+    cluster_graph = nx.DiGraph()
+    for cluster, files in Counter(cluster_of.values()).items():
+        cluster_graph.add_node(cluster, files=files)
+
+    weights = Counter()
+    cluster_cycle_edges = set()
+    for source, target in graph.edges:
+        cluster_edge = (cluster_of[source], cluster_of[target])
+        if cluster_edge[0] != cluster_edge[1]:
+            weights[cluster_edge] += 1
+            if (source, target) in cycle_edges:
+                cluster_cycle_edges.add(cluster_edge)
+
+    cluster_graph.add_weighted_edges_from((source, target, weight) for (source, target), weight in weights.items())
+
+    return cluster_graph, cluster_cycle_edges
+
+
+def create_drill_down_graph(graph, cluster_of, cluster, cycle_edges):
+    """
+    Create a graph of the files in the cluster, in which the files of other clusters are aggregated per cluster.
+
+    The returned set contains the edges that aggregate an include that is part of a cycle.
+    """
+
+    def node_of(file):
+        return file if cluster_of[file] == cluster else cluster_of[file]
+
+    drill_down_graph = nx.DiGraph()
+    drill_down_graph.add_nodes_from(file for file, file_cluster in cluster_of.items() if file_cluster == cluster)
+
+    drill_down_cycle_edges = set()
+    for file in list(drill_down_graph):
+        edges = [(file, target) for target in graph.successors(file)]
+        edges.extend((source, file) for source in graph.predecessors(file))
+        for source, target in edges:
+            edge = (node_of(source), node_of(target))
+            drill_down_graph.add_edge(*edge)
+            if (source, target) in cycle_edges:
+                drill_down_cycle_edges.add(edge)
+
+    return drill_down_graph, drill_down_cycle_edges
+
+
+def render_svg(dot_file):
+    """Render the DOT file to svg and return the svg file."""
+
+    return graphviz.render("dot", format="svg", filepath=dot_file)
+
+
+def render_drill_down(graph, cluster_of, cluster, cycle_edges, dot_file):
+    """Render the drill-down of one cluster to svg, with the other clusters shown as boxes."""
+
+    drill_down_graph, drill_down_cycle_edges = create_drill_down_graph(graph, cluster_of, cluster, cycle_edges)
+
+    def node_attributes(node):
+        if node in cluster_of:
+            return {"label": os.path.basename(node), "tooltip": node}
+        return {"shape": "box", "style": "filled", "fillcolor": "lightgrey"}
+
+    save_dot(drill_down_graph, dot_file, drill_down_cycle_edges, node_attributes)
+    return render_svg(dot_file)
+
+
+def render_cluster(graph, cycle_edges, settings):
+    """Render the drill-down of the cluster in the settings to svg and return the svg file."""
+
+    cluster_of = determine_clusters(graph, settings)
+    cluster = os.path.normpath(settings["drill_down"])
+    if cluster not in cluster_of.values():
+        raise ValueError(f"{settings['drill_down']} is not a cluster of the include graph")
+
+    dot_file = os.path.join(settings["report_directory"], "include_cluster")
+    return render_drill_down(graph, cluster_of, cluster, cycle_edges, dot_file)
+
+
+def render_clusters(graph, cycle_edges, settings):
+    """
+    Render the cluster overview on an html page, and when requested the drill-down of each cluster linked from it.
+
+    Returns the html page.
+    """
+
+    report_dir = settings["report_directory"]
+    cluster_of = determine_clusters(graph, settings)
+    cluster_graph, cluster_cycle_edges = create_cluster_graph(graph, cluster_of, cycle_edges)
+
+    cluster_files = {}
+    if settings["render_drill_downs"]:
+        cluster_files = {cluster: f"cluster_{index}" for index, cluster in enumerate(sorted(cluster_graph))}
+
+    def node_attributes(cluster):
+        files = cluster_graph.nodes[cluster]["files"]
+        attributes = {"shape": "box", "label": f"{cluster}\n{files} files"}
+        if cluster in cluster_files:
+            attributes["URL"] = f"clusters/{cluster_files[cluster]}.svg"
+        return attributes
+
+    def edge_attributes(source, target):
+        weight = cluster_graph.edges[source, target]["weight"]
+        return {"label": weight, "penwidth": min(1 + weight / 10, 10)}
+
+    overview_file = os.path.join(report_dir, "include_clusters")
+    save_dot(cluster_graph, overview_file, cluster_cycle_edges, node_attributes, edge_attributes)
+    render_svg(overview_file)
+
+    if cluster_files:
+        cluster_dir = os.path.join(report_dir, "clusters")
+        os.makedirs(cluster_dir, exist_ok=True)
+        for cluster, cluster_file in cluster_files.items():
+            render_drill_down(graph, cluster_of, cluster, cycle_edges, os.path.join(cluster_dir, cluster_file))
+
+    return save_cluster_page(os.path.join(report_dir, "include_clusters.html"), cluster_graph, cluster_files)
+
+
+def save_cluster_page(html_file, cluster_graph, cluster_files):
+    """Save an html page with the cluster overview and the clusters, linked to their drill-down when rendered."""
+
+    def cluster_cell(cluster):
+        if cluster in cluster_files:
+            return f'<a href="clusters/{cluster_files[cluster]}.svg">{html.escape(cluster)}</a>'
+        return html.escape(cluster)
+
+    rows = "\n".join(
+        f"<tr><td>{cluster_cell(cluster)}</td><td>{cluster_graph.nodes[cluster]['files']}</td></tr>"
+        for cluster in sorted(cluster_graph)
+    )
+    hint = "" if cluster_files else "<p>Render the drill-down of a cluster with --drill-down &lt;cluster&gt;.</p>\n"
+
+    with open(html_file, "w", encoding="utf-8") as page:
+        page.write(
+            "<!DOCTYPE html>\n<html>\n<head><title>Include graph</title></head>\n<body>\n"
+            "<h1>Include graph</h1>\n"
+            '<object data="include_clusters.svg" type="image/svg+xml"></object>\n'
+            f"<h2>Clusters</h2>\n{hint}<table>\n<tr><th>Cluster</th><th>Files</th></tr>\n"
+            f"{rows}\n</table>\n</body>\n</html>\n"
+        )
+
+    return html_file
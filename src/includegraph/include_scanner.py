@@ -0,0 +1,94 @@
+"""
+Scan C/C++ source files for include directives.
+
+Only preprocessor lines are matched: the files are read as bytes (large files are memory mapped) and a
+precompiled pattern that is anchored on lines starting with a # is searched over the whole content.
+The files can be scanned in a pool of processes.
+"""
+
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+SOURCE_EXTENSIONS = (".h", ".hpp", ".c", ".cpp")
+
+INCLUDE_PATTERN = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*(["<][^">\r\n]+[">])', re.MULTILINE)
+
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def find_source_files(directory, excludes):
+    """Find the C/C++ source files in the directory, skipping the excluded directories."""
+
+    for root, dirs, files in os.walk(directory, topdown=True):
+        if excludes:
+            dirs[:] = [d for d in dirs if d not in excludes]
+
+        for file in files:
+            if file.endswith(SOURCE_EXTENSIONS):
+                yield os.path.join(root, file)
+
+
+def find_includes(content):
+    """Find the include directives in the content and return their spelling including the delimiters."""
+
+    return [match.group(1).decode("utf-8", errors="replace") for match in INCLUDE_PATTERN.finditer(content)]
+
+
+def count_lines(content):
+    """Count the lines of the content, in chunks so that memory mapped content is not copied at once."""
+
+    starts = range(0, len(content), MMAP_THRESHOLD)
+    ends = range(MMAP_THRESHOLD, len(content) + MMAP_THRESHOLD, MMAP_THRESHOLD)
+    lines = sum(content[start:end].count(b"\n") for start, end in zip(starts, ends))
+    if content and content[-1:] != b"\n":
+        lines += 1
+
+    return lines
+
+
+def scan_content(content):
+    """Scan the content for include directives and count its lines."""
+
+    return find_includes(content), count_lines(content)
+
+
+def scan_file(file_name):
+    """Scan the file for include directives and return their spelling including the delimiters and the line count."""
+
+    with open(file_name, "rb") as source_file:
+        size = os.fstat(source_file.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return scan_content(source_file.read())
+
+        with mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            return scan_content(content)
+
+
+def scan_includes(file_name):
+    """Scan the file for include directives and return their spelling including the delimiters."""
+
+    includes, _ = scan_file(file_name)
+    return includes
+
+
+def scan_files(file_names, jobs=1):
+    """Scan the files and yield the file name together with its includes and its line count."""
+
+    if jobs <= 1:
+        for file_name in file_names:
+            yield file_name, *scan_file(file_name)
+        return
+
+    file_names = list(file_names)
+    chunk_size = max(1, len(file_names) // (jobs * 16))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for file_name, (includes, lines) in zip(file_names, executor.map(scan_file, file_names, chunksize=chunk_size)):
+            yield file_name, includes, lines
+
+
+def include_name(include):
+    """Return the name of the included file from the spelling of an include directive."""
+
+    return include[1:-1]
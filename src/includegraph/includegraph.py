@@ -2,123 +2,181 @@
 
 import argparse
 import os
-import re
-import shutil
 import sys
 
 import networkx as nx
-from graphviz import Source
+import graphviz
+
+from src.includegraph.dot_writer import save_dot
+from src.includegraph.include_cost import analyze_include_cost
+from src.includegraph.include_cycles import (
+    determine_cycle_edges,
+    determine_cycles,
+    determine_cyclic_components,
+    determine_feedback_edges,
+)
+from src.includegraph.include_export import EXPORT_FORMATS, export_include_graph
+from src.includegraph.include_query import ReachabilityIndex, answer_queries
+from src.includegraph.include_render import render_cluster, render_clusters
+from src.includegraph.include_resolver import IncludeResolver, find_node, read_compile_commands
+from src.includegraph.include_cache import scan_files_incrementally
+from src.includegraph.include_scanner import find_source_files, scan_includes
+from src.reporting.reporting import create_report_directory
+
+
+def extract_includes(file_name, include_graph, resolver=None):
+    """Extract the include statements from the file and create an edge in the include graph."""
 
+    add_include_edges(include_graph, resolver or IncludeResolver(), file_name, scan_includes(file_name))
 
-def extract_includes(file_name, include_graph):
-    """Extract the include statements from the file and create an edge in the include graph."""
 
-    with open(file_name, "r", encoding="utf-8") as source_file:
-        lines = source_file.readlines()
-        for line in lines:
-            match = re.match(r'#include\s+["<](.*)[">]', line)
-            if match:
-                target = os.path.basename(match.group(1))
-                source = os.path.basename(file_name)
-                include_graph.add_edge(source, target)
+def add_include_edges(include_graph, resolver, file_name, includes, lines=None):
+    """Add the file with its line count and an edge to each of its resolved includes to the include graph."""
+
+    source = os.path.abspath(file_name)
+    include_graph.add_node(source, lines=lines)
+    include_graph.add_edges_from((source, resolver.resolve(source, include)) for include in includes)
+
+
+def determine_include_directories(settings):
+    """Determine the include directories from the settings and the compile commands."""
+
+    include_directories = list(settings["include_directories"] or [])
+    if settings["compile_commands"]:
+        include_directories.extend(read_compile_commands(settings["compile_commands"]))
+
+    return include_directories
 
 
 def build_include_graph(settings):
     """Build an include graph from the provided directory."""
 
-    directory = settings["analysis_directory"]
-    excludes = settings["excludes"]
+    source_files = find_source_files(settings["analysis_directory"], settings["excludes"])
+    resolver = IncludeResolver(determine_include_directories(settings))
 
-    include_graph = nx.DiGraph()
-    for root, dirs, files in os.walk(directory, topdown=True):
-        if excludes:
-            dirs[:] = [d for d in dirs if d not in excludes]
+    scanned_files = scan_files_incrementally(
+        source_files, settings["report_directory"], settings["jobs"], settings["rebuild"]
+    )
 
-        for file in files:
-            if file.endswith((".h", ".hpp", ".c", ".cpp")):
-                extract_includes(os.path.join(root, file), include_graph)
+    include_graph = nx.DiGraph()
+    for file_name, includes, lines in scanned_files:
+        add_include_edges(include_graph, resolver, file_name, includes, lines)
 
     return include_graph
 
 
-def show_include_cycles(cycle_list):
+def format_files(files):
+    """Format a list of files as a space separated string."""
+
+    return str(list(files)).translate(str.maketrans("", "", "[']"))
+
+
+def format_include_cycles(components, feedback_edges, cycle_list):
+    """Format the cyclic components, their feedback edges and the enumerated cycles as lines of text."""
+
+    lines = []
+    for index, (component, edges) in enumerate(zip(components, feedback_edges), start=1):
+        lines.append(f"Component {index} with {len(component)} files: {format_files(sorted(component))}")
+        lines.extend(f"Feedback edge: {source} -> {target}" for source, target in edges)
+
+    if cycle_list:
+        lines.append("Cycles:")
+        lines.extend(format_files(cycle) for cycle in cycle_list)
+
+    return lines
+
+
+def show_include_cycles(components, feedback_edges, cycle_list):
     """Show the include cycles on stdout."""
 
-    if len(cycle_list) > 0:
+    if len(components) > 0:
         print("Include cycles found:")
-        for cycle in cycle_list:
-            print(str(cycle).translate(str.maketrans("", "", "[']")))
+        for line in format_include_cycles(components, feedback_edges, cycle_list):
+            print(line)
     else:
         print("No include cycles found")
 
 
 def analyze_include_cycles(complete_graph, settings):
-    """Analyze the include cycles in the include graph."""
+    """
+    Analyze the include cycles in the include graph.
 
-    cycles = nx.simple_cycles(complete_graph)
-    cycles = list(cycles)  # make copy of the list created by the generator of simple_cycles
-    save_include_cycles(list(cycles), settings)
-    show_include_cycles(list(cycles))
-    return list(cycles)
+    The strongly connected components with a cycle are reported with their feedback edges, together with the
+    elementary cycles up to the maximum cycle length and count. The cyclic components are returned.
+    """
+
+    components = determine_cyclic_components(complete_graph)
+    feedback_edges = [determine_feedback_edges(complete_graph, component) for component in components]
+    cycles = determine_cycles(complete_graph, components, settings["max_cycle_length"], settings["max_cycles"])
+
+    save_include_cycles(components, feedback_edges, cycles, settings)
+    show_include_cycles(components, feedback_edges, cycles)
+    return components
 
 
 def analyze_path(graph, settings):
     """Determine the path between the provided files."""
 
-    source_node = settings["show_path"][0]
-    target_node = settings["show_path"][1]
     try:
+        source_node = find_node(graph, settings["show_path"][0])
+        target_node = find_node(graph, settings["show_path"][1])
         path = nx.shortest_path(graph, source=source_node, target=target_node)  # pylint: disable=E1123,E1120
 
         print(f"The path from {source_node} to {target_node} is:")
         print(str(path).translate(str.maketrans("", "", "[']")))
-    except nx.exception.NetworkXNoPath as path_exception:
+    except (nx.exception.NetworkXNoPath, nx.exception.NodeNotFound) as path_exception:
         print(path_exception)
 
 
-def setup_report_directory(directory):
-    """Create an empty report directory."""
-
-    if os.path.exists(directory):
-        shutil.rmtree(directory)
-
-    os.makedirs(directory)
-
-    return directory
-
+def show_include_graph(graph, cycle_edges, settings):
+    """
+    Show the include graph with the edges that are part of a cycle in red.
 
-def show_include_graph(graph, include_cycles, settings):
-    """Show the include graph."""
+    The graph is rendered as a whole, as an overview of clusters or as the drill-down of one cluster. The rendered
+    graph is opened in a viewer, unless the analysis runs headless.
+    """
 
-    report_dir = settings["report_directory"]
-    report_file = os.path.join(report_dir, "include_graph")
-
-    pydot_graph = nx.nx_pydot.to_pydot(graph)
+    if settings["drill_down"]:
+        image_file = render_cluster(graph, cycle_edges, settings)
+    elif settings["clusters"]:
+        image_file = render_clusters(graph, cycle_edges, settings)
+    else:
+        dot_file = save_dot(graph, os.path.join(settings["report_directory"], "include_graph"), cycle_edges)
+        image_file = graphviz.render("dot", format="png", filepath=dot_file)
 
-    stream = highlight_cycles(str(pydot_graph), include_cycles)
-    source = Source(stream, filename=report_file, format="png")
-    source.view()
+    if not settings["headless"]:
+        graphviz.view(image_file)
 
 
-def save_include_cycles(include_cycles, settings):
+def save_include_cycles(components, feedback_edges, cycle_list, settings):
     """Save the include cycles to a text file."""
 
     report_file = os.path.join(settings["report_directory"], "include_cycles.txt")
     with open(report_file, "w", encoding="utf-8") as report:
-        for cycle in include_cycles:
-            cycle_string = str(cycle)
-            cycle_string = cycle_string.translate(str.maketrans("", "", "[']"))
-            report.write(cycle_string)
+        for line in format_include_cycles(components, feedback_edges, cycle_list):
+            report.write(line)
             report.write("\n")
 
 
 def analyze_include_graph_for_file(graph, file_to_analyze):
     """Determine the include graph for the provided file."""
 
-    subgraph = graph.subgraph(nx.shortest_path(graph, file_to_analyze))
+    subgraph = graph.subgraph(nx.shortest_path(graph, find_node(graph, file_to_analyze)))
     return subgraph
 
 
+def query_include_graph(graph, queries_file):
+    """Answer the queries from the file, or from stdin when the file is -, on stdout."""
+
+    index = ReachabilityIndex(graph)
+
+    if queries_file == "-":
+        answer_queries(index, sys.stdin, sys.stdout)
+    else:
+        with open(queries_file, "r", encoding="utf-8") as queries:
+            answer_queries(index, queries, sys.stdout)
+
+
 def perform_analysis(analysis):
     """Perform the requested analysis."""
 
@@ -126,27 +184,50 @@ def perform_analysis(analysis):
         "analysis_directory": analysis.input,
         "report_directory": analysis.output,
         "analyze_cycles": analysis.cycles,
+        "analyze_cost": analysis.cost,
         "file_to_analyze": analysis.file,
         "excludes": analysis.excludes,
         "show_path": analysis.showpath,
+        "jobs": analysis.jobs,
+        "rebuild": analysis.rebuild,
+        "queries": analysis.query,
+        "include_directories": analysis.include_dirs,
+        "compile_commands": analysis.compile_commands,
+        "max_cycle_length": analysis.max_cycle_length,
+        "max_cycles": analysis.max_cycles,
+        "clusters": analysis.clusters,
+        "cluster_depth": analysis.cluster_depth,
+        "drill_down": analysis.drill_down,
+        "render_drill_downs": analysis.render_drill_downs,
+        "headless": analysis.headless,
+        "export_formats": analysis.export,
     }
 
-    setup_report_directory(settings["report_directory"])
+    create_report_directory(settings["report_directory"])
 
     graph = build_include_graph(settings)
 
+    if settings["export_formats"]:
+        export_include_graph(graph, settings["export_formats"], settings)
+
+    if settings["queries"]:
+        query_include_graph(graph, settings["queries"])
+        return settings
+
     if settings["show_path"]:
         analyze_path(graph, settings)
 
+    if settings["analyze_cost"]:
+        analyze_include_cost(graph, settings)
+
     if settings["file_to_analyze"]:
         graph = analyze_include_graph_for_file(graph, settings["file_to_analyze"])
 
-    cycles = []
+    cycle_edges = set()
     if settings["analyze_cycles"]:
-        cycles = analyze_include_cycles(graph, settings)
-        cycles = list(cycles)
+        cycle_edges = determine_cycle_edges(graph, analyze_include_cycles(graph, settings))
 
-    show_include_graph(graph, list(cycles), settings)
+    show_include_graph(graph, cycle_edges, settings)
 
     return settings
 
@@ -158,8 +239,30 @@ def parse_arguments(args):
     parser.add_argument("--version", action="version", version="%(prog)s 1.0")
     parser.add_argument("--excludes", nargs="+", help="The directories to exclude from the analysis")
     parser.add_argument("--showpath", nargs=2, help="Show the path from source to target")
-    parser.add_argument("--cycles", help="Find all cycles in the includes", action="store_true")
+    parser.add_argument("--cycles", help="Find the include cycles", action="store_true")
+    parser.add_argument(
+        "--cost", help="Determine the files and lines of code that each file includes", action="store_true"
+    )
+    parser.add_argument("--max-cycle-length", help="The maximum length of the cycles to list", type=int)
+    parser.add_argument("--max-cycles", help="The maximum number of cycles to list", type=int, default=100)
     parser.add_argument("--file", help="The file to build the include graph for")
+    parser.add_argument("--clusters", help="Show the include graph as clusters per directory", action="store_true")
+    parser.add_argument("--cluster-depth", help="The number of directory levels of the clusters", type=int)
+    parser.add_argument("--drill-down", help="Show the include graph of the files of one cluster")
+    parser.add_argument(
+        "--render-drill-downs",
+        help="Also render the include graph of each cluster and link it from the cluster overview",
+        action="store_true",
+    )
+    parser.add_argument("--headless", help="Render the include graph without opening a viewer", action="store_true")
+    parser.add_argument("--include-dirs", nargs="+", help="The directories to search for included files")
+    parser.add_argument("--compile-commands", help="The compile_commands.json file to read include directories from")
+    parser.add_argument(
+        "--export", nargs="+", choices=EXPORT_FORMATS, help="The formats to export the include graph to"
+    )
+    parser.add_argument("--query", help="The file with include queries to answer, - to read them from stdin")
+    parser.add_argument("--rebuild", help="Scan all files instead of only the changed files", action="store_true")
+    parser.add_argument("--jobs", help="The number of processes that scan the files", type=int, default=1)
     parser.add_argument(
         "--output",
         help="The directory where to place the report.",
@@ -172,32 +275,6 @@ def parse_arguments(args):
     return parser.parse_args(args)
 
 
-def determine_cycle_edges(cycle_nodes):
-    """Determine the edges of the nodes in the cycle."""
-
-    edges = []
-    for idx, elem in enumerate(cycle_nodes):
-        this_element = elem
-        next_element = cycle_nodes[(idx + 1) % len(cycle_nodes)]
-        edges.append((this_element, next_element))
-    return edges
-
-
-def highlight_cycles(dot_stream, cycle_list):
-    """Highlight the include cycles in red."""
-
-    for cycle in cycle_list:
-        cycle_edges = determine_cycle_edges(cycle)
-        for edge in cycle_edges:
-            regex = rf'([<"]{edge[0]}[">] -> [<"]{edge[1]}[">])'
-            match = re.search(regex, dot_stream)
-            if match:
-                replacement = match.group(1) + " [color = red]"
-                dot_stream = dot_stream.replace(match.group(1), replacement)
-
-    return dot_stream
-
-
 def main():
     """Start of the program."""
 
@@ -49,6 +49,13 @@ class MetricProfile:
         for region in self._regions:
             region.update(metric, loc)
 
+    def merge(self, profile):
+        """Merge the loc of a profile with the same regions into this profile."""
+
+        self._total_loc += profile.total_loc()
+        for region, other_region in zip(self._regions, profile.regions()):
+            region.merge(other_region)
+
     def save(self, report_file):
         """Save the profile to a csv file."""
 
@@ -32,6 +32,11 @@ class MetricRegion:
             if self._lower_limit <= metric:
                 self._loc += loc
 
+    def merge(self, region):
+        """Add the loc of another region with the same limits."""
+
+        self._loc += region.loc()
+
     def label(self):
         """Return region label."""
 
@@ -28,16 +28,27 @@ The raw data is saved in a csv file called churn_complexity.csv in the specified
 Churn
 -----
 This analysis uses the PyDriller library and stores the raw data in a csv file called churn.csv
+With the numstat backend the added and deleted lines are read from a single git log instead, which is much faster.
+With more than one job the period is split into windows that are mined in parallel and merged afterwards.
+In incremental mode the churn is determined from the commit cache in the report directory, so only the commits since
+the previous analysis are read from the repository. Like PyDriller, the numstat backend, when rename detection is
+enabled, and the incremental mode attribute the churn of a renamed file to its latest name.
 """
 
 import csv
 import os
+from itertools import repeat
 
 import plotly.graph_objects as go
 import pandas as pd
+from pydriller import ModificationType
 from pydriller.metrics.process.code_churn import CodeChurn
 
+from src.churn.git_numstat import create_numstat_command, parse_numstat_log
 from src.facility.subprocess import Subprocess
+from src.repositorymining.commit_cache import CommitCache, to_timestamp
+from src.repositorymining.git_commits import format_git_date
+from src.repositorymining.mining_windows import create_mining_pool, determine_windows, traverse_commits
 from src.reporting.reporting import create_report_directory
 
 
@@ -111,9 +122,138 @@ def show_churn_complexity_chart(total_frame):
     fig.show()
 
 
+def count_numstat_churn(settings, since, until, log_name="churn"):
+    """
+    Count the churn per file in the period from the numstat of the git log.
+
+    The log is traversed from the newest to the oldest commit, so a renamed file is known under its latest name before
+    its older names are encountered. Deleted files are skipped. Returns the churn per file and the latest name of each
+    renamed file.
+    """
+
+    report_dir = create_report_directory(settings["report_directory"])
+    command = create_numstat_command(
+        settings["repository"],
+        since=format_git_date(since),
+        until=format_git_date(until),
+        detect_renames=settings["detect_renames"],
+    )
+    process = Subprocess(command, verbose=1)
+
+    renamed_files = {}
+    file_churn_map = {}
+    for commit in parse_numstat_log(process.execute_lines(report_dir, log_name), settings["detect_renames"]):
+        for change in commit.changes:
+            if change.removed:
+                continue
+
+            file_path = renamed_files.get(change.path, change.path)
+            if change.old_path:
+                renamed_files[change.old_path] = file_path
+
+            file_churn_map[file_path] = file_churn_map.get(file_path, 0) + change.added + change.deleted
+
+    return file_churn_map, renamed_files
+
+
+def count_pydriller_churn(settings, since, until):
+    """Count the churn per file in the period with PyDriller, like CodeChurn, and the latest name of renamed files."""
+
+    renamed_files = {}
+    file_churn_map = {}
+    for commit in traverse_commits(settings["repository"], since=since, to=until, order="reverse"):
+        for modified_file in commit.modified_files:
+            file_path = renamed_files.get(modified_file.new_path, modified_file.new_path)
+            if modified_file.change_type == ModificationType.RENAME:
+                renamed_files[modified_file.old_path] = file_path
+
+            if file_path is not None:
+                churn = modified_file.added_lines + modified_file.deleted_lines
+                file_churn_map[file_path] = file_churn_map.get(file_path, 0) + churn
+
+    return file_churn_map, renamed_files
+
+
+def count_window_churn(settings, window_index, window):
+    """Count the churn per file and the renamed files in one window of the period."""
+
+    since, until = window
+    if settings["churn_backend"] == "numstat":
+        return count_numstat_churn(settings, since, until, f"churn_{window_index}")
+
+    return count_pydriller_churn(settings, since, until)
+
+
+def merge_window_churn(window_churns):
+    """
+    Merge the churn of consecutive windows, from the oldest to the newest window, into the churn per file.
+
+    The windows are merged from the newest to the oldest, so the churn of a file that is renamed in a later window is
+    attributed to its latest name.
+    """
+
+    renamed_files = {}
+    file_churn_map = {}
+    for window_churn, window_renamed_files in reversed(window_churns):
+        for file_path, churn in window_churn.items():
+            latest_path = renamed_files.get(file_path, file_path)
+            file_churn_map[latest_path] = file_churn_map.get(latest_path, 0) + churn
+
+        for old_path, new_path in window_renamed_files.items():
+            renamed_files[old_path] = renamed_files.get(new_path, new_path)
+
+    return file_churn_map
+
+
+def sort_file_churn(settings, file_churn_map):
+    """Sort the churn per file, the file with the most churn first, with the file names joined with the repository."""
+
+    churn = ((os.path.join(settings["repository"], file_path), churn) for file_path, churn in file_churn_map.items())
+    return sorted(churn, key=lambda item: item[1], reverse=True)
+
+
+def measure_file_churn_incrementally(settings):
+    """Measure the churn of files in the repository from the commit cache, after adding the new commits to it."""
+
+    cache = CommitCache(settings["repository"], create_report_directory(settings["report_directory"]))
+    try:
+        cache.update()
+        file_churn_map = cache.line_churn(to_timestamp(settings["period_start"]), to_timestamp(settings["period_end"]))
+    finally:
+        cache.close()
+
+    return sort_file_churn(settings, file_churn_map)
+
+
+def measure_file_churn_with_numstat(settings):
+    """Measure the churn of files in the repository from the numstat of the git log."""
+
+    file_churn_map, _ = count_numstat_churn(settings, settings["period_start"], settings["period_end"])
+    return sort_file_churn(settings, file_churn_map)
+
+
+def measure_file_churn_in_windows(settings):
+    """Measure the churn of files in the repository by mining windows of the period in parallel."""
+
+    windows = determine_windows(settings["period_start"], settings["period_end"], settings["jobs"])
+    with create_mining_pool(settings["jobs"]) as executor:
+        window_churns = list(executor.map(count_window_churn, repeat(settings), range(len(windows)), windows))
+
+    return sort_file_churn(settings, merge_window_churn(window_churns))
+
+
 def measure_file_churn(settings):
     """Measure the churn of files in the repository."""
 
+    if settings["incremental"]:
+        return measure_file_churn_incrementally(settings)
+
+    if settings["jobs"] > 1:
+        return measure_file_churn_in_windows(settings)
+
+    if settings["churn_backend"] == "numstat":
+        return measure_file_churn_with_numstat(settings)
+
     directory = settings["repository"]
     metric = CodeChurn(
         path_to_repo=settings["repository"],
@@ -1,13 +1,37 @@
-"""Analyze the commit activity for test and production code."""
+"""
+Analyze the commit activity for test and production code.
+
+The history of the period is traversed once, with PyDriller or with a lightweight scan of the git log that only reads
+the changed paths, and the date and classification of each commit are collected. The activity per day, week, month or
+year is then determined by resampling the collected commits. In incremental mode the commits are read from the commit
+cache in the report directory that is shared by all analyses, so another period or frequency can be analyzed without
+traversing the history again.
+"""
 
 import datetime
 import os
+from itertools import repeat
 
 import pandas as pd
 import plotly.graph_objects as go
+from pandas.tseries.frequencies import to_offset
+
+from src.reporting.reporting import create_report_directory
+from src.repositorymining.commit_cache import CommitCache, to_timestamp
+from src.repositorymining.git_commits import scan_commits
+from src.repositorymining.mining_windows import create_mining_pool, determine_windows, traverse_commits
+
+COMMIT_COLUMNS = ["date", "production", "test"]
 
-from dateutil.rrule import rrule, SU, WEEKLY
-from pydriller import Repository
+# Days and weeks are fixed durations, so they can be anchored at the start of the analysis. Months and years follow
+# the calendar.
+FREQUENCIES = {
+    "DAILY": pd.Timedelta(days=1),
+    "WEEKLY": pd.Timedelta(days=7),
+    "MONTHLY": "MS",
+    "YEARLY": "YS",
+}
+CALENDAR_PERIODS = {"MONTHLY": "M", "YEARLY": "Y"}
 
 
 def determine_begin_date_of_the_week(date):
@@ -18,87 +42,147 @@ def determine_begin_date_of_the_week(date):
     return begin_date_of_the_week
 
 
-def commit_contains_test_code(commit):
-    """Check if the commit touches test code."""
+def classify_paths(paths):
+    """Classify the changed paths of a commit in one pass and return if they contain production and test code."""
 
+    modified_production_code = False
     modified_test_code = False
-    for modified_file in commit.modified_files:
-        if modified_file.new_path:
-            if "test" in modified_file.new_path.lower():
+    for path in paths:
+        if path:
+            if "test" in path.lower():
                 modified_test_code = True
-    return modified_test_code
+            else:
+                modified_production_code = True
+    return modified_production_code, modified_test_code
 
 
-def commit_contains_production_code(commit):
-    """Check if the commit touches production code."""
+def classify_commit(commit):
+    """Classify the PyDriller commit by the new paths of its modified files."""
 
-    modified_production_code = False
-    for modified_file in commit.modified_files:
-        if modified_file.new_path:
-            if "test" not in modified_file.new_path.lower():
-                modified_production_code = True
-    return modified_production_code
+    return classify_paths(modified_file.new_path for modified_file in commit.modified_files)
+
+
+def traverse_commit_classifications(settings, start_date, end_date):
+    """Traverse the commits in the period with the configured backend and yield their date and classification."""
+
+    if settings["activity_backend"] == "git":
+        log_name = f"commits_{pd.Timestamp(start_date):%Y%m%d%H%M%S}"
+        report_dir = create_report_directory(settings["report_directory"])
+        for record in scan_commits(settings["repository"], start_date, end_date, report_dir, log_name):
+            yield (record.date, *classify_paths(record.paths))
+    else:
+        for commit in traverse_commits(settings["repository"], since=start_date, to=end_date):
+            yield (commit.committer_date, *classify_commit(commit))
+
+
+def collect_commits(settings, start_date, end_date):
+    """Collect the committer date, in UTC, and the classification of the commits in the period in one traversal."""
+
+    commits = list(traverse_commit_classifications(settings, start_date, end_date))
+
+    dataframe = pd.DataFrame(commits, columns=COMMIT_COLUMNS).astype({"production": bool, "test": bool})
+    dataframe["date"] = pd.to_datetime(dataframe["date"], utc=True).dt.tz_localize(None)
+    return dataframe
+
+
+def collect_commits_in_windows(settings, start_date, end_date):
+    """Collect the commits in the period, mining windows of the period in parallel when there is more than one job."""
+
+    if settings["jobs"] <= 1:
+        return collect_commits(settings, start_date, end_date)
 
+    windows = determine_windows(start_date, end_date, settings["jobs"])
+    with create_mining_pool(settings["jobs"]) as executor:
+        window_commits = list(executor.map(collect_commits, repeat(settings), *zip(*windows)))
 
-def determine_commits_in_period(repository, start_date, end_date):
-    """Determine the commits that are made in the period from start_date to end_date."""
+    return pd.concat(window_commits, ignore_index=True)
 
-    production_code_commit_count = 0
-    test_code_commit_count = 0
-    number_of_commits = 0
-    for commit in Repository(repository, since=start_date, to=end_date).traverse_commits():
-        if commit_contains_test_code(commit):
-            test_code_commit_count = test_code_commit_count + 1
-        if commit_contains_production_code(commit):
-            production_code_commit_count = production_code_commit_count + 1
-        number_of_commits = number_of_commits + 1
-    return number_of_commits, production_code_commit_count, test_code_commit_count
 
+def determine_periods(start_date, end_date, frequency):
+    """
+    Determine the start dates of the periods of the frequency from the start date to the end date.
 
-def determine_commit_activity(repository, start_date, end_date):
-    """Determine the commit activity for the specified repository and period and return a dataframe."""
+    Days and weeks start at the start date, in whole seconds like git dates, months and years at the beginning of the
+    month or year of the start date.
+    """
 
-    production_commit_count = []
-    test_commit_count = []
-    commit_count = []
+    start_date = pd.Timestamp(start_date).floor("s")
+    if frequency in CALENDAR_PERIODS:
+        start_date = start_date.to_period(CALENDAR_PERIODS[frequency]).start_time
 
-    cumulative_production_commits = 0
-    cumulative_test_commits = 0
-    cumulative_commits = 0
+    return pd.date_range(start_date, end_date, freq=FREQUENCIES[frequency])
 
-    for date in rrule(freq=WEEKLY, wkst=SU, byweekday=SU, dtstart=start_date, until=end_date):
-        one_week_later = date + datetime.timedelta(days=7)
-        number_of_commits, production_commits, test_commits = determine_commits_in_period(
-            repository, date, one_week_later
+
+def count_commits_per_period(commits, periods, frequency):
+    """Count the commits, production commits and test commits in each period that starts at one of the dates."""
+
+    origin = "start_day" if frequency in CALENDAR_PERIODS else periods[0]
+    counts = (
+        commits.set_index("date")[["production", "test"]]
+        .astype("int64")
+        .assign(commit_count=1)
+        .resample(FREQUENCIES[frequency], origin=origin, closed="left", label="left")
+        .sum()
+        .rename(columns={"production": "production_commit_count", "test": "test_commit_count"})
+    )
+    return counts.reindex(periods, fill_value=0).astype("int64").reset_index(drop=True)
+
+
+def determine_commit_activity(commits, periods, frequency="WEEKLY"):
+    """Determine the commit activity in the periods from the collected commits and return a dataframe."""
+
+    if len(periods):
+        dataframe = count_commits_per_period(commits, periods, frequency)
+    else:
+        dataframe = pd.DataFrame(
+            columns=["commit_count", "production_commit_count", "test_commit_count"], dtype="int64"
+        )
+
+    period_length = to_offset(FREQUENCIES[frequency])
+    for date, row in zip(periods, dataframe.itertuples()):
+        print(
+            date,
+            date + period_length,
+            row.production_commit_count,
+            row.test_commit_count,
+            row.commit_count,
         )
 
-        cumulative_commits = cumulative_commits + number_of_commits
-        cumulative_production_commits = cumulative_production_commits + production_commits
-        cumulative_test_commits = cumulative_test_commits + test_commits
-
-        production_commit_count.append(cumulative_production_commits)
-        test_commit_count.append(cumulative_test_commits)
-        commit_count.append(number_of_commits)
-        print(date, one_week_later, production_commits, test_commits, number_of_commits)
-
-    dataframe = pd.DataFrame(
-        {
-            "date": list(
-                rrule(
-                    freq=WEEKLY,
-                    wkst=SU,
-                    byweekday=SU,
-                    dtstart=start_date,
-                    until=end_date,
-                )
-            ),
-            "production_commit_count": production_commit_count,
-            "test_commit_count": test_commit_count,
-            "commit_count": commit_count,
-        }
+    dataframe[["production_commit_count", "test_commit_count"]] = dataframe[
+        ["production_commit_count", "test_commit_count"]
+    ].cumsum()
+    dataframe.insert(0, "date", periods)
+
+    return dataframe[["date", "production_commit_count", "test_commit_count", "commit_count"]]
+
+
+def load_cached_commits(settings, start_date, end_date):
+    """Load the commits in the period from the commit cache, after adding the new commits to it, and classify them."""
+
+    cache = CommitCache(settings["repository"], create_report_directory(settings["report_directory"]))
+    try:
+        cache.update()
+        commit_paths = cache.commit_paths(to_timestamp(start_date), to_timestamp(end_date))
+    finally:
+        cache.close()
+
+    paths = commit_paths["path"].fillna("")
+    test_paths = paths.str.lower().str.contains("test", regex=False)
+    return (
+        commit_paths.assign(production=(paths != "") & ~test_paths, test=test_paths)
+        .groupby("sha", sort=False)
+        .agg(date=("date", "first"), production=("production", "any"), test=("test", "any"))
+        .reset_index(drop=True)
     )
 
-    return dataframe
+
+def load_commits(settings, start_date, end_date):
+    """Load the commits in the period from the commit cache in incremental mode, or collect them from the repository."""
+
+    if settings["incremental"]:
+        return load_cached_commits(settings, start_date, end_date)
+
+    return collect_commits_in_windows(settings, start_date, end_date)
 
 
 def save_test_activity(settings, dataframe):
@@ -165,7 +249,17 @@ def show_test_activity(dataframe):
 def analyze_commits(settings):
     """Analyze the commits and return a dataframe containing the commits, production commits, test commits."""
 
-    period_start = determine_begin_date_of_the_week(settings["period_start"])
-    period_end = determine_begin_date_of_the_week(settings["period_end"])
+    frequency = settings["period_frequency"]
+    period_start = settings["period_start"]
+    period_end = settings["period_end"]
+    if frequency == "WEEKLY":
+        period_start = determine_begin_date_of_the_week(period_start)
+        period_end = determine_begin_date_of_the_week(period_end)
+
+    periods = determine_periods(period_start, period_end, frequency)
+    if len(periods):
+        commits = load_commits(settings, periods[0], periods[-1] + to_offset(FREQUENCIES[frequency]))
+    else:
+        commits = pd.DataFrame(columns=COMMIT_COLUMNS)
 
-    return determine_commit_activity(settings["repository"], period_start, period_end)
+    return determine_commit_activity(commits, periods, frequency)
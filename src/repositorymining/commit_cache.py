@@ -0,0 +1,186 @@
+"""
+Cache the history of a repository, so that all mining analyses read it from git only once.
+
+The cache is a SQLite database in the report directory. It holds the sha, committer timestamp and author of each
+commit, and the status, paths and added and deleted lines of each changed file, together with the last commit that has
+been processed. An update only reads the commits after that commit, with a single git log. When the history has been
+rewritten, the cache is rebuilt.
+
+The commits keep the order of the git log, from the newest to the oldest commit, and their changed files the order of
+the commit. Renames are detected like in PyDriller, so the analyses that follow renames give the same results.
+"""
+
+import os
+import sqlite3
+
+import pandas as pd
+
+from src.facility.subprocess import ProcessError, Subprocess
+from src.repositorymining.git_commits import create_raw_numstat_command, format_git_date, parse_raw_numstat_log
+
+CACHE_FILE = "commit_cache.sqlite"
+
+
+def to_timestamp(date):
+    """Convert a date, either a datetime or a string, to a unix timestamp; dates without a timezone are in UTC."""
+
+    return int(pd.Timestamp(format_git_date(date)).timestamp())
+
+
+class CommitCache:
+    """Persistent cache of the commits and their changed files of one repository."""
+
+    def __init__(self, repository, cache_directory):
+        """Construct the class."""
+
+        self._repository = repository
+        self._cache_directory = cache_directory
+        os.makedirs(cache_directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(os.path.join(cache_directory, CACHE_FILE))
+        self._connection.executescript(
+            "CREATE TABLE IF NOT EXISTS checkpoint (repository TEXT, last_sha TEXT);"
+            "CREATE TABLE IF NOT EXISTS commits (sha TEXT PRIMARY KEY, sequence INTEGER, date INTEGER, author TEXT);"
+            "CREATE TABLE IF NOT EXISTS file_changes ("
+            "sha TEXT, position INTEGER, status TEXT, path TEXT, old_path TEXT, added INTEGER, deleted INTEGER);"
+            "CREATE INDEX IF NOT EXISTS commit_date ON commits (date);"
+            "CREATE INDEX IF NOT EXISTS file_change_sha ON file_changes (sha);"
+        )
+
+    def close(self):
+        """Close the cache."""
+
+        self._connection.close()
+
+    def _git(self, *arguments):
+        """Run a git command in the repository and return its output lines."""
+
+        process = Subprocess(["git", "-C", self._repository, *arguments], verbose=1)
+        return list(process.execute_lines(self._cache_directory, "commit_cache"))
+
+    def _last_sha(self):
+        """Return the last processed commit, or None when the cache has to be (re)built."""
+
+        checkpoint = self._connection.execute("SELECT repository, last_sha FROM checkpoint").fetchone()
+        if not checkpoint or checkpoint[0] != os.path.abspath(self._repository):
+            return None
+
+        try:
+            Subprocess(["git", "-C", self._repository, "merge-base", "--is-ancestor", checkpoint[1], "HEAD"]).execute()
+        except ProcessError:
+            return None
+
+        return checkpoint[1]
+
+    def _insert_commits(self, revision_range):
+        """
+        Insert the commits of the revision range and return their number.
+
+        The log shows the newest commit first, so the commits are numbered down from -1 while they are inserted and
+        then renumbered after the commits that are already in the cache.
+        """
+
+        process = Subprocess(create_raw_numstat_command(self._repository, revision_range), verbose=1)
+
+        commits = 0
+        for commit in parse_raw_numstat_log(process.execute_lines(self._cache_directory, "commit_cache")):
+            commits += 1
+            self._connection.execute(
+                "INSERT INTO commits VALUES (?, ?, ?, ?)", (commit.sha, -commits, commit.timestamp, commit.author)
+            )
+            self._connection.executemany(
+                "INSERT INTO file_changes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((commit.sha, position, *change) for position, change in enumerate(commit.changes)),
+            )
+
+        last_sequence = self._connection.execute(
+            "SELECT COALESCE(MAX(sequence), 0) FROM commits WHERE sequence > 0"
+        ).fetchone()[0]
+        self._connection.execute(
+            "UPDATE commits SET sequence = sequence + ? WHERE sequence < 0", (last_sequence + commits + 1,)
+        )
+        return commits
+
+    def update(self):
+        """Add the commits since the last processed commit and return the number of added commits."""
+
+        last_sha = self._last_sha()
+        head = self._git("rev-parse", "HEAD")[0]
+        if last_sha == head:
+            return 0
+
+        with self._connection:
+            if not last_sha:
+                self._connection.execute("DELETE FROM commits")
+                self._connection.execute("DELETE FROM file_changes")
+
+            commits = self._insert_commits(f"{last_sha}..{head}" if last_sha else head)
+
+            self._connection.execute("DELETE FROM checkpoint")
+            self._connection.execute("INSERT INTO checkpoint VALUES (?, ?)", (os.path.abspath(self._repository), head))
+
+        return commits
+
+    def _file_changes(self, since, until):
+        """Query the file changes of the commits between the timestamps, in the order of the git log."""
+
+        return self._connection.execute(
+            "SELECT file_changes.status, file_changes.path, file_changes.old_path, "
+            "file_changes.added + file_changes.deleted FROM file_changes "
+            "JOIN commits ON commits.sha = file_changes.sha "
+            "WHERE commits.date >= COALESCE(?, commits.date) AND commits.date <= COALESCE(?, commits.date) "
+            "ORDER BY commits.sequence DESC, file_changes.position",
+            (since, until),
+        )
+
+    def file_commit_counts(self, since=None, until=None):
+        """
+        Return per file the number of commits that changed it between the timestamps, most changed file first.
+
+        Like the paths in git log, a renamed file is counted under its new path and a deleted file under its path.
+        """
+
+        counts = {}
+        for _, path, _, _ in self._file_changes(since, until):
+            counts[path] = counts.get(path, 0) + 1
+
+        return sorted(counts.items(), key=lambda item: item[1], reverse=True)
+
+    def line_churn(self, since=None, until=None):
+        """
+        Return per file the number of added and deleted lines between the timestamps.
+
+        Like PyDriller, the churn of a renamed file is attributed to its latest name and deleted files are skipped.
+        """
+
+        renamed_files = {}
+        file_churn_map = {}
+        for status, path, old_path, churn in self._file_changes(since, until):
+            if status == "D":
+                continue
+
+            file_path = renamed_files.get(path, path)
+            if status == "R":
+                renamed_files[old_path] = file_path
+
+            file_churn_map[file_path] = file_churn_map.get(file_path, 0) + churn
+
+        return file_churn_map
+
+    def commit_paths(self, since=None, until=None):
+        """
+        Return the commits between the timestamps as a dataframe with their sha, date in UTC and changed paths.
+
+        A commit has one row per path that exists after the commit, or a single row without path when it has none.
+        """
+
+        dataframe = pd.read_sql_query(
+            "SELECT commits.sha, commits.date, file_changes.path FROM commits "
+            "LEFT JOIN file_changes ON file_changes.sha = commits.sha AND file_changes.status != 'D' "
+            "WHERE commits.date >= COALESCE(?, commits.date) AND commits.date <= COALESCE(?, commits.date) "
+            "ORDER BY commits.sequence DESC, file_changes.position",
+            self._connection,
+            params=(since, until),
+        )
+        dataframe["date"] = pd.to_datetime(dataframe["date"], unit="s")
+        return dataframe
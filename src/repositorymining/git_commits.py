@@ -0,0 +1,158 @@
+"""
+Scan the commits of a repository with git log, without loading their diffs.
+
+The log shows for each commit its sha, committer date and author, followed by the status and path of each changed
+file. It is parsed line by line while git produces it. Only the paths that exist after the commit are kept: a deleted
+file is left out and a renamed or copied file is kept under its new path, like the new path of PyDriller. Merge
+commits have no changed files, like in PyDriller.
+
+For a cache of the history the log can also show the raw status and the numstat of each changed file. The numstat of a
+file is matched to its raw status by the path after the commit, which is the deleted path for a deleted file.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+
+import pandas as pd
+
+from src.churn.git_numstat import parse_line_count, parse_rename
+from src.facility.subprocess import Subprocess
+
+COMMIT_PREFIX = "commit "
+FIELD_SEPARATOR = "\t"
+RAW_PREFIX = ":"
+
+CommitRecord = namedtuple("CommitRecord", ["sha", "date", "author", "paths"])
+CommitChanges = namedtuple("CommitChanges", ["sha", "timestamp", "author", "changes"])
+FileChangeRecord = namedtuple("FileChangeRecord", ["status", "path", "old_path", "added", "deleted"])
+
+
+def format_git_date(date):
+    """Format a date, either a datetime or a string, for git; dates without a timezone are in UTC like in PyDriller."""
+
+    timestamp = pd.Timestamp(date)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return timestamp.isoformat()
+
+
+def create_name_status_command(repository, since=None, until=None):
+    """Create the git log command that shows the sha, committer date, author and changed files of each commit."""
+
+    command = [
+        "git",
+        "-C",
+        repository,
+        "-c",
+        "core.quotePath=false",
+        "log",
+        "--name-status",
+        "-M",
+        f"--format={COMMIT_PREFIX}%H{FIELD_SEPARATOR}%cI{FIELD_SEPARATOR}%an",
+    ]
+
+    if since:
+        command.append(f"--since={format_git_date(since)}")
+    if until:
+        command.append(f"--until={format_git_date(until)}")
+
+    return command
+
+
+def parse_commit_line(line):
+    """Parse the sha, committer date and author of a commit line."""
+
+    sha, date, author = line.removeprefix(COMMIT_PREFIX).split(FIELD_SEPARATOR, 2)
+    return sha, datetime.fromisoformat(date), author
+
+
+def parse_name_status_log(lines):
+    """Parse the lines of the git log and yield a commit record for each commit."""
+
+    commit = None
+    paths = []
+    for line in lines:
+        if line.startswith(COMMIT_PREFIX):
+            if commit:
+                yield CommitRecord(*commit, paths)
+
+            commit = parse_commit_line(line)
+            paths = []
+        elif FIELD_SEPARATOR in line:
+            status, *status_paths = line.split(FIELD_SEPARATOR)
+            if not status.startswith("D"):
+                paths.append(status_paths[-1])
+
+    if commit:
+        yield CommitRecord(*commit, paths)
+
+
+def scan_commits(repository, since, until, log_directory, log_name="commits"):
+    """Scan the commits of the repository in the period, from the newest to the oldest commit."""
+
+    process = Subprocess(create_name_status_command(repository, since, until), verbose=1)
+    yield from parse_name_status_log(process.execute_lines(log_directory, log_name))
+
+
+def create_raw_numstat_command(repository, revision_range):
+    """Create the git log command that shows the sha, committer timestamp, author, raw status and numstat of commits."""
+
+    return [
+        "git",
+        "-C",
+        repository,
+        "-c",
+        "core.quotePath=false",
+        "log",
+        "--raw",
+        "--numstat",
+        "-M",
+        f"--format={COMMIT_PREFIX}%H{FIELD_SEPARATOR}%ct{FIELD_SEPARATOR}%an",
+        revision_range,
+    ]
+
+
+def parse_raw_line(line):
+    """Parse the status letter, the path after the commit and the source path of a renamed or copied file."""
+
+    metadata, *paths = line.split(FIELD_SEPARATOR)
+    status = metadata.split(" ")[-1][0]
+    if status in ("R", "C"):
+        return status, paths[1], paths[0]
+
+    return status, paths[0], None
+
+
+def create_commit_changes(commit, raw_changes, line_counts):
+    """Create the commit with its file changes, combining the raw status and the numstat of each file."""
+
+    sha, timestamp, author = commit
+    changes = [
+        FileChangeRecord(status, path, old_path, *line_counts.get(path, (0, 0)))
+        for status, path, old_path in raw_changes
+    ]
+    return CommitChanges(sha, int(timestamp), author, changes)
+
+
+def parse_raw_numstat_log(lines):
+    """Parse the lines of the git log with raw status and numstat and yield each commit with its file changes."""
+
+    commit = None
+    raw_changes = []
+    line_counts = {}
+    for line in lines:
+        if line.startswith(COMMIT_PREFIX):
+            if commit:
+                yield create_commit_changes(commit, raw_changes, line_counts)
+
+            commit = line.removeprefix(COMMIT_PREFIX).split(FIELD_SEPARATOR, 2)
+            raw_changes = []
+            line_counts = {}
+        elif line.startswith(RAW_PREFIX):
+            raw_changes.append(parse_raw_line(line))
+        elif FIELD_SEPARATOR in line:
+            added, deleted, path = line.split(FIELD_SEPARATOR, 2)
+            line_counts[parse_rename(path)[1]] = (parse_line_count(added), parse_line_count(deleted))
+
+    if commit:
+        yield create_commit_changes(commit, raw_changes, line_counts)
@@ -0,0 +1,68 @@
+"""
+Split a period of history into windows that can be mined in parallel.
+
+The windows are consecutive and start at the beginning of a week, so the weekly figures of each window can simply be
+appended. The end of a window lies one second before the start of the next one, the resolution of git dates, so no
+commit is mined twice.
+
+PyDriller writes to the git configuration of the repository each time it opens it, which fails when two processes do
+so at the same time. The workers of the mining pool therefore share a lock that serializes the opening of the
+repository; the traversal itself runs in parallel.
+"""
+
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Lock
+
+from dateutil.rrule import rrule, SU, WEEKLY
+from pydriller import Repository
+
+REPOSITORY_LOCK = None
+
+
+def determine_windows(period_start, period_end, count):
+    """Split the period into at most count windows of whole weeks and return them as (start, end) tuples."""
+
+    week_starts = [
+        date
+        for date in rrule(
+            freq=WEEKLY, wkst=SU, byweekday=SU, byhour=0, byminute=0, bysecond=0, dtstart=period_start, until=period_end
+        )
+        if date > period_start
+    ]
+
+    boundaries = sorted(
+        {week_starts[index * len(week_starts) // count] for index in range(1, count)} if week_starts else []
+    )
+    starts = [period_start] + boundaries
+    ends = [boundary - datetime.timedelta(seconds=1) for boundary in boundaries] + [period_end]
+    return list(zip(starts, ends))
+
+
+def initialize_worker(lock):
+    """Initialize a worker of the mining pool with the lock that serializes the opening of the repository."""
+
+    global REPOSITORY_LOCK  # pylint: disable=global-statement
+    REPOSITORY_LOCK = lock
+
+
+def create_mining_pool(jobs):
+    """Create the pool of processes that mine the history."""
+
+    return ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker, initargs=(Lock(),))
+
+
+def traverse_commits(repository, **options):
+    """Traverse the commits of the repository with PyDriller, opening the repository under the lock in a worker."""
+
+    commits = Repository(repository, **options).traverse_commits()
+    if REPOSITORY_LOCK is None:
+        yield from commits
+        return
+
+    with REPOSITORY_LOCK:
+        first_commit = next(commits, None)
+
+    if first_commit is not None:
+        yield first_commit
+        yield from commits
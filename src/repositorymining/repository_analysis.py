@@ -33,6 +33,11 @@ def get_settings(args):
         "period_start": args.start_date,
         "period_end": args.end_date,
         "period_frequency": args.frequency,
+        "incremental": args.incremental,
+        "churn_backend": args.churn_backend,
+        "detect_renames": args.detect_renames,
+        "jobs": args.jobs,
+        "activity_backend": args.activity_backend,
     }
 
     return settings
@@ -124,6 +129,35 @@ def parse_arguments(args):
         action="store",
     )
 
+    parser.add_argument(
+        "--incremental",
+        help="keep the history in a commit cache in the report directory, shared by all analyses, "
+        "and only read the new commits from git",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--churn-backend",
+        choices=["pydriller", "numstat"],
+        help="measure the churn with PyDriller or with the much faster numstat of git log",
+        default="pydriller",
+        action="store",
+    )
+    parser.add_argument(
+        "--detect-renames",
+        help="attribute the churn of renamed files to their latest name with the numstat backend, like PyDriller",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--activity-backend",
+        choices=["pydriller", "git"],
+        help="traverse the commits with PyDriller or scan only their changed paths with git log, which is much faster",
+        default="pydriller",
+        action="store",
+    )
+    parser.add_argument("--jobs", help="the number of processes that mine the history", type=int, default=1)
+
     parser.set_defaults(func=perform_analysis)
 
     return parser.parse_args(args)
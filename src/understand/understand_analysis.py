@@ -40,6 +40,12 @@ def add_analysis_parser(subparsers):
     parser.add_argument("--interface", help="analyze the interface size", action="store_true")
     parser.add_argument("--function-size", help="analyze the function size", action="store_true")
     parser.add_argument("--file-size", help="analyze the file size", action="store_true")
+    parser.add_argument(
+        "--jobs",
+        help="number of processes over which the functions of the database are divided",
+        type=int,
+        default=1,
+    )
 
     parser.set_defaults(func=perform_analysis)
 
@@ -52,9 +58,27 @@ def add_metrics_parser(subparsers):
     parser.add_argument("--output", help="directory where to place the metrics", default="./reports")
 
     parser.add_argument("--function", help="collect function metrics", action="store_true")
+    parser.add_argument(
+        "--format",
+        help="file format of the function metrics (parquet requires the parquet extra)",
+        choices=["csv", "parquet"],
+        default="csv",
+    )
+    parser.add_argument(
+        "--compression",
+        help="compression of the function metrics (zstd csv requires the zstd extra)",
+        choices=["none", "gzip", "zstd"],
+        default="none",
+    )
+    parser.add_argument(
+        "--jobs",
+        help="number of processes over which the functions of the database are divided",
+        type=int,
+        default=1,
+    )
 
     parser.add_argument("--file", help="collect file metrics", action="store_true")
-    parser.add_argument("--module", help="module to analyze")
+    parser.add_argument("--module", nargs="+", help="modules to analyze")
     parser.add_argument(
         "--sort",
         help="sort on the specified metric",
@@ -71,6 +95,8 @@ def add_metrics_parser(subparsers):
             "CountDeclClass",
         ],
     )
+    parser.add_argument("--top", help="only report the top files of the sorted metric", type=int)
+    parser.add_argument("--page", help="page of top files to report", type=int, default=1)
 
     parser.set_defaults(func=collect_metrics)
 
@@ -100,33 +126,33 @@ def perform_analysis(analysis):
 
     if analysis.all:
         analyze_code_size(analysis.database, analysis.output)
-        analyze_complexity(analysis.database, analysis.output)
-        analyze_function_size(analysis.database, analysis.output)
+        analyze_complexity(analysis.database, analysis.output, analysis.jobs)
+        analyze_function_size(analysis.database, analysis.output, analysis.jobs)
         analyze_file_size(analysis.database, analysis.output)
-        analyze_fan_in(analysis.database, analysis.output)
-        analyze_fan_out(analysis.database, analysis.output)
-        analyze_function_parameters(analysis.database, analysis.output)
+        analyze_fan_in(analysis.database, analysis.output, analysis.jobs)
+        analyze_fan_out(analysis.database, analysis.output, analysis.jobs)
+        analyze_function_parameters(analysis.database, analysis.output, analysis.jobs)
 
     if analysis.code_size:
         analyze_code_size(analysis.database, analysis.output)
 
     if analysis.complexity:
-        analyze_complexity(analysis.database, analysis.output)
+        analyze_complexity(analysis.database, analysis.output, analysis.jobs)
 
     if analysis.function_size:
-        analyze_function_size(analysis.database, analysis.output)
+        analyze_function_size(analysis.database, analysis.output, analysis.jobs)
 
     if analysis.file_size:
         analyze_file_size(analysis.database, analysis.output)
 
     if analysis.fan_in:
-        analyze_fan_in(analysis.database, analysis.output)
+        analyze_fan_in(analysis.database, analysis.output, analysis.jobs)
 
     if analysis.fan_out:
-        analyze_fan_out(analysis.database, analysis.output)
+        analyze_fan_out(analysis.database, analysis.output, analysis.jobs)
 
     if analysis.interface:
-        analyze_function_parameters(analysis.database, analysis.output)
+        analyze_function_parameters(analysis.database, analysis.output, analysis.jobs)
 
 
 def collect_metrics(metrics):
@@ -135,10 +161,10 @@ def collect_metrics(metrics):
     print(metrics)
 
     if metrics.file:
-        collect_file_metrics(metrics.database, metrics.output, metrics.module, metrics.sort)
+        collect_file_metrics(metrics.database, metrics.output, metrics.module, metrics.sort, metrics.top, metrics.page)
 
     if metrics.function:
-        collect_function_metrics(metrics.database, metrics.output)
+        collect_function_metrics(metrics.database, metrics.output, metrics.jobs, metrics.format, metrics.compression)
 
 
 def main():
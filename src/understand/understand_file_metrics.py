@@ -1,8 +1,51 @@
 """Retrieve all file metrics from an understand database and save them in a csv file."""
 
 import csv
+import heapq
+import re
+from collections import defaultdict
+
 import understand
 
+FILE_METRICS = [
+    "MaxCyclomatic",
+    "CountDeclClass",
+    "CountDeclFunc",
+    "CountLine",
+    "CountLineCode",
+    "CountLineBlank",
+    "CountLineComment",
+    "CountLineInactive",
+    "CountLinePreprocessor",
+]
+
+
+class FileIndex:  # pylint: disable=too-few-public-methods
+    """
+    Index of the file entities of an understand database.
+
+    The files are indexed on their name, so the regular expression of a module is matched against each distinct
+    file name once instead of looking up the module in the database. Like the lookup of the database, the regular
+    expression matches the file names case insensitively.
+    """
+
+    def __init__(self, understand_database):
+        """Construct the class."""
+
+        self._files = understand_database.ents("file ~unknown ~unresolved")
+        self._names = defaultdict(list)
+        for file in understand_database.ents("file"):
+            self._names[file.name()].append(file)
+
+    def files(self, module=None):
+        """Return the files of which the name matches the module, or all files when no module is provided."""
+
+        if module is None:
+            return self._files
+
+        pattern = re.compile(module, re.IGNORECASE)
+        return [file for name, files in self._names.items() if pattern.search(name) for file in files]
+
 
 def sort_metrics(module_metrics, metric):
     """Sort the metrics."""
@@ -15,6 +58,19 @@ def sort_metrics(module_metrics, metric):
     return sorted_dict
 
 
+def select_sorted_metrics(module_metrics, metric, top, page=1):
+    """
+    Select one page of top files of the metrics, sorted on the metric.
+
+    Only the files up to and including the requested page are sorted, using a heap.
+    """
+
+    selection = heapq.nlargest(top * page, module_metrics.items(), key=lambda item: item[1][metric] or 0)
+
+    skipped = top * (page - 1)
+    return dict(selection[skipped:])
+
+
 def save_file_metrics(module, metrics):
     """Save the file metrics to a csv file."""
 
@@ -53,49 +109,47 @@ def save_file_metrics(module, metrics):
             )
 
 
-def get_module_metrics(module_files):
-    """Retrieve all the module metrics."""
+def get_module_metrics(module_files, metrics_cache=None):
+    """
+    Retrieve all the module metrics.
+
+    The metrics of a file are retrieved only once when a cache is provided.
+    """
+
+    metrics_cache = {} if metrics_cache is None else metrics_cache
 
     module_metrics = {}
     for file in module_files:
-        file_metrics = file.metric(
-            [
-                "MaxCyclomatic",
-                "CountDeclClass",
-                "CountDeclFunc",
-                "CountLine",
-                "CountLineCode",
-                "CountLineBlank",
-                "CountLineComment",
-                "CountLineInactive",
-                "CountLinePreprocessor",
-            ]
-        )
+        file_name = file.longname()
+        if file_name not in metrics_cache:
+            metrics_cache[file_name] = file.metric(FILE_METRICS) or 0
 
-        module_metrics[file.longname()] = file_metrics or 0
+        module_metrics[file_name] = metrics_cache[file_name]
     return module_metrics
 
 
-def find_files_in_module(understand_database, module):
-    """Find the files of the module."""
-
-    files = understand_database.lookup(module, "File")
+def collect_file_metrics(database, output, modules, sort, top=None, page=1):
+    """
+    Collect the file metrics of each module.
 
-    return files
-
-
-def collect_file_metrics(database, output, module, sort):
-    """Collect the file metrics."""
+    The files are looked up in an index of the database that is built once for all modules.
+    """
     print(output)
 
     understand_database = understand.open(database)
-    module_files = find_files_in_module(understand_database, module)
-    module_metrics = get_module_metrics(module_files)
+    file_index = FileIndex(understand_database)
+    metrics_cache = {}
+
+    for module in modules or [None]:
+        module_metrics = get_module_metrics(file_index.files(module), metrics_cache)
 
-    metric = sort
-    sorted_module_metrics = sort_metrics(module_metrics, metric)
+        if sort and top:
+            module_metrics = select_sorted_metrics(module_metrics, sort, top, page)
+        elif sort:
+            module_metrics = sort_metrics(module_metrics, sort)
 
-    for filename in sorted_module_metrics.items():
-        print(filename + "," + str(sorted_module_metrics[filename][metric]))
+        if sort:
+            for filename, file_metrics in module_metrics.items():
+                print(filename + "," + str(file_metrics[sort]))
 
-    save_file_metrics(module, sorted_module_metrics)
+        save_file_metrics(module or "all", module_metrics)
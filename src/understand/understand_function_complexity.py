@@ -1,10 +1,10 @@
 """Create a profile of the complexity of the codebase."""
 
 import os
-import understand
 
 from src.profile.sqatt_profiles import create_complexity_profile
 from src.reporting.reporting import create_report_directory
+from src.understand.understand_sharding import determine_profile_in_parallel
 
 
 def determine_complexity_profile(profile, database):
@@ -20,14 +20,12 @@ def determine_complexity_profile(profile, database):
     return profile
 
 
-def analyze_complexity(database, output):
+def analyze_complexity(database, output, jobs=1):
     """Analyze the complexity."""
 
     print("Analyzing complexity.")
 
-    profile = create_complexity_profile()
-    understand_database = understand.open(database)
-    profile = determine_complexity_profile(profile, understand_database)
+    profile = determine_profile_in_parallel(database, create_complexity_profile, determine_complexity_profile, jobs)
 
     profile.print()
 
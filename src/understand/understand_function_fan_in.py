@@ -1,10 +1,10 @@
 """Create a fan-in profile of the codebase."""
 
 import os
-import understand
 
 from src.profile.sqatt_profiles import create_fan_in_profile
 from src.reporting.reporting import create_report_directory
+from src.understand.understand_sharding import determine_profile_in_parallel
 
 
 def determine_fan_in_profile(profile, database):
@@ -20,14 +20,12 @@ def determine_fan_in_profile(profile, database):
     return profile
 
 
-def analyze_fan_in(database, output):
+def analyze_fan_in(database, output, jobs=1):
     """Analyze the fan-in."""
 
     print("Analyzing fan-in.")
 
-    profile = create_fan_in_profile()
-    understand_database = understand.open(database)
-    profile = determine_fan_in_profile(profile, understand_database)
+    profile = determine_profile_in_parallel(database, create_fan_in_profile, determine_fan_in_profile, jobs)
 
     profile.print()
 
@@ -1,51 +1,144 @@
-"""Retrieve all function metrics of the codebase."""
+"""
+Retrieve all function metrics of the codebase.
+
+The metrics are written in chunks of rows to a (compressed) csv file or to a parquet file.
+Compression with zstd requires the zstandard package of the zstd extra, parquet output requires the pyarrow package
+of the parquet extra.
+"""
 
 import csv
+import gzip
+import importlib
 import os
+from itertools import chain, islice
+
 import understand
 
 from src.reporting.reporting import create_report_directory
+from src.understand.understand_sharding import iterate_shards
+
+FUNCTION_METRICS_HEADER = [
+    "FunctionName",
+    "LinesOfCode",
+    "CyclomaticComplexity",
+    "Fan-in",
+    "Fan-out",
+    "NumberOfParameters",
+]
+
+CHUNK_SIZE = 10000
+BUFFER_SIZE = 1024 * 1024
+SHARDS_PER_JOB = 4
+
+
+def count_parameters(func):
+    """Count the parameters of the function using the parameter entities it defines."""
+
+    return len(func.ents("Define", "Parameter"))
+
+
+def determine_function_metrics(understand_database):
+    """Determine the metrics of each function in the database and yield them as csv rows."""
+
+    for func in understand_database.ents("function,method,procedure"):
+        metrics = func.metric(["CountLineCode", "Cyclomatic", "CountInput", "CountOutput"])
+
+        yield [
+            func.longname(),
+            metrics["CountLineCode"],
+            metrics["Cyclomatic"],
+            metrics["CountInput"],
+            metrics["CountOutput"],
+            count_parameters(func),
+        ]
+
+
+def determine_function_metrics_of_shard(understand_database):
+    """Determine the function metrics of a database shard and return them as a list of csv rows."""
+
+    return list(determine_function_metrics(understand_database))
+
+
+def split_in_chunks(rows, chunk_size=CHUNK_SIZE):
+    """Split the rows in lists of at most chunk_size rows."""
+
+    rows = iter(rows)
+    chunk = list(islice(rows, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(rows, chunk_size))
+
+
+def import_optional_module(module_name, extra):
+    """Import a module of an optional dependency, raising an ImportError with the extra to install when missing."""
 
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as error:
+        raise ImportError(
+            f"{module_name} is not installed, install sqatt[{extra}] (poetry install --extras {extra})"
+        ) from error
 
-def collect_function_metrics(database, output):
-    """Collect the function metrics."""
 
-    understand_database = understand.open(database)
+def open_csv_report(report_file, compression):
+    """Open the csv report file for writing, compressed with the requested compression."""
 
-    report_file = os.path.join(create_report_directory(output), "function_metrics.csv")
-    with open(report_file, "w", encoding="utf-8") as output_file:
+    if compression == "gzip":
+        return gzip.open(report_file + ".gz", "wt", encoding="utf-8", newline="")
+
+    if compression == "zstd":
+        zstandard = import_optional_module("zstandard", "zstd")
+
+        return zstandard.open(report_file + ".zst", "wt", encoding="utf-8", newline="")
+
+    return open(report_file, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE)
+
+
+def save_function_metrics_csv(rows, report_file, compression):
+    """Save the function metrics to a csv file in chunks of rows."""
+
+    with open_csv_report(report_file, compression) as output_file:
         csv_writer = csv.writer(output_file, delimiter=",", lineterminator="\n", quoting=csv.QUOTE_ALL)
-        csv_writer.writerow(
-            [
-                "FunctionName",
-                "LinesOfCode",
-                "CyclomaticComplexity",
-                "Fan-in",
-                "Fan-out",
-                "NumberOfParameters",
-            ]
-        )
-
-        for func in understand_database.ents("function,method,procedure"):
-            metrics = func.metric(
-                [
-                    "CountLineBlank",
-                    "CountLineCode",
-                    "CountLineComment",
-                    "CountLineInactive",
-                    "Cyclomatic",
-                    "CountInput",
-                    "CountOutput",
-                ]
-            )
-
-            csv_writer.writerow(
-                [
-                    func.longname(),
-                    metrics["CountLineCode"],
-                    metrics["Cyclomatic"],
-                    metrics["CountInput"],
-                    metrics["CountOutput"],
-                    len(func.parameters().split(",")),
-                ]
-            )
+        csv_writer.writerow(FUNCTION_METRICS_HEADER)
+
+        for chunk in split_in_chunks(rows):
+            csv_writer.writerows(chunk)
+
+
+def save_function_metrics_parquet(rows, report_file, compression):
+    """Save the function metrics to a parquet file with one row group per chunk of rows."""
+
+    pyarrow = import_optional_module("pyarrow", "parquet")
+    parquet = import_optional_module("pyarrow.parquet", "parquet")
+
+    schema = pyarrow.schema(
+        [(FUNCTION_METRICS_HEADER[0], pyarrow.string())]
+        + [(name, pyarrow.int64()) for name in FUNCTION_METRICS_HEADER[1:]]
+    )
+
+    with parquet.ParquetWriter(report_file + ".parquet", schema, compression=compression) as writer:
+        for chunk in split_in_chunks(rows):
+            columns = [pyarrow.array(column, type=field.type) for column, field in zip(zip(*chunk), schema)]
+            writer.write_table(pyarrow.Table.from_arrays(columns, schema=schema))
+
+
+def collect_function_metrics(database, output, jobs=1, export_format="csv", compression="none"):
+    """
+    Collect the function metrics.
+
+    With more than one job the rows of each shard are written as soon as the shard and the shards before it are
+    completed, so the rows are in the same order as with one job.
+    """
+
+    if jobs > 1:
+        shard_count = jobs * SHARDS_PER_JOB
+        rows = chain.from_iterable(iterate_shards(database, determine_function_metrics_of_shard, jobs, shard_count))
+    else:
+        rows = determine_function_metrics(understand.open(database))
+
+    report_dir = create_report_directory(output)
+
+    if export_format == "parquet":
+        save_function_metrics_parquet(rows, os.path.join(report_dir, "function_metrics"), compression)
+    else:
+        save_function_metrics_csv(rows, os.path.join(report_dir, "function_metrics.csv"), compression)
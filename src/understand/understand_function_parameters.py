@@ -1,10 +1,10 @@
 """Create a profile for the interface sizes of a codebase."""
 
 import os
-import understand
 
 from src.profile.sqatt_profiles import create_function_parameters_profile
 from src.reporting.reporting import create_report_directory
+from src.understand.understand_sharding import determine_profile_in_parallel
 
 
 def determine_function_parameters_profile(profile, database):
@@ -20,14 +20,14 @@ def determine_function_parameters_profile(profile, database):
     return profile
 
 
-def analyze_function_parameters(database, output):
+def analyze_function_parameters(database, output, jobs=1):
     """Analyze the function parameters."""
 
     print("Analyzing function parameters.")
 
-    profile = create_function_parameters_profile()
-    understand_database = understand.open(database)
-    profile = determine_function_parameters_profile(profile, understand_database)
+    profile = determine_profile_in_parallel(
+        database, create_function_parameters_profile, determine_function_parameters_profile, jobs
+    )
 
     profile.print()
 
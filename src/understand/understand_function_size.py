@@ -1,10 +1,10 @@
 """Create a profile for the function size of the code base."""
 
 import os
-import understand
 
 from src.profile.sqatt_profiles import create_function_size_profile
 from src.reporting.reporting import create_report_directory
+from src.understand.understand_sharding import determine_profile_in_parallel
 
 
 def determine_function_size_profile(profile, understand_database):
@@ -20,14 +20,14 @@ def determine_function_size_profile(profile, understand_database):
     return profile
 
 
-def analyze_function_size(database, output):
+def analyze_function_size(database, output, jobs=1):
     """Analyze the function size."""
 
     print("Analyzing function size.")
 
-    profile = create_function_size_profile()
-    understand_database = understand.open(database)
-    profile = determine_function_size_profile(profile, understand_database)
+    profile = determine_profile_in_parallel(
+        database, create_function_size_profile, determine_function_size_profile, jobs
+    )
 
     profile.print()
 
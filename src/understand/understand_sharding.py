@@ -0,0 +1,117 @@
+"""
+Shard the entities of an understand database over a pool of processes.
+
+Each worker opens its own read-only handle of the understand database and processes a contiguous
+index range of the entities. The partial results of the workers are merged in shard order, so the
+merged result is the same as the result of a single-threaded run. The results can also be consumed
+in shard order while the later shards are still processed.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import understand
+
+
+# pylint: disable=too-few-public-methods
+class DatabaseShard:
+    """Understand database of which the entity lookup is limited to one shard."""
+
+    def __init__(self, database, shard_index, shard_count):
+        """Construct the class."""
+
+        self._database = database
+        self._shard_index = shard_index
+        self._shard_count = shard_count
+
+    def ents(self, kinds):
+        """Return the entities of the requested kinds that belong to this shard."""
+
+        entities = self._database.ents(kinds)
+        shard_size = -(-len(entities) // self._shard_count)
+        start = self._shard_index * shard_size
+        end = start + shard_size
+        return entities[start:end]
+
+
+# pylint: enable=too-few-public-methods
+
+
+def _process_shard(database, shard_index, shard_count, process_database):
+    """Open the database in the worker and process the entities of one shard."""
+
+    understand_database = understand.open(database)
+    try:
+        return process_database(DatabaseShard(understand_database, shard_index, shard_count))
+    finally:
+        understand_database.close()
+
+
+def process_shards(database, process_database, jobs):
+    """
+    Process the understand database in shards and return the partial results in shard order.
+
+    With one job the database is processed in the current process as a single shard.
+
+    The process_database function receives a database of which the entity lookup is limited to one shard.
+    It must be a module level function so that it can be sent to the worker processes.
+    """
+
+    if jobs <= 1:
+        return [process_database(understand.open(database))]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(_process_shard, database, shard_index, jobs, process_database)
+            for shard_index in range(jobs)
+        ]
+        return [future.result() for future in futures]
+
+
+def iterate_shards(database, process_database, jobs, shard_count=None):
+    """
+    Process the understand database in shards and yield the partial result of each shard in shard order.
+
+    The result of a shard is yielded as soon as it and the shards before it are completed, so the results are consumed
+    while the other shards are processed and the order is the same as in a single-threaded run. By default there is
+    one shard per job.
+    """
+
+    if jobs <= 1:
+        yield process_database(understand.open(database))
+        return
+
+    shard_count = shard_count or jobs
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = deque(
+            executor.submit(_process_shard, database, shard_index, shard_count, process_database)
+            for shard_index in range(shard_count)
+        )
+        while futures:
+            yield futures.popleft().result()
+
+
+def _determine_profile(create_profile, determine_profile, database):
+    """Determine a partial profile for the provided (sharded) database."""
+
+    return determine_profile(create_profile(), database)
+
+
+def determine_profile_in_parallel(database, create_profile, determine_profile, jobs):
+    """
+    Determine a profile of the understand database using the provided number of jobs.
+
+    With more than one job the database is processed in shards and the partial profiles are merged.
+    """
+
+    if jobs <= 1:
+        return determine_profile(create_profile(), understand.open(database))
+
+    partial_profiles = process_shards(database, partial(_determine_profile, create_profile, determine_profile), jobs)
+
+    profile = create_profile()
+    for partial_profile in partial_profiles:
+        profile.merge(partial_profile)
+
+    return profile
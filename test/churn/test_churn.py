@@ -3,59 +3,46 @@
 import os
 from unittest.mock import patch, Mock, call, mock_open
 
-from src.churn.churn import calculate_churn, remove_empty_lines, save_churn, parse_arguments, get_settings
+from src.churn.churn import (
+    count_churn,
+    determine_churn,
+    save_churn,
+    parse_arguments,
+    get_settings,
+)
 
 
-def test_churn_calculation():
-    """Test if the churn is calulated correctly."""
+def test_count_churn_counts_files_in_streamed_lines():
+    """Test if the churn is counted from a stream of lines, skipping the empty lines."""
 
-    git_log = os.linesep.join(
+    git_log_lines = iter(
         [
             "test/test_lizard_analysis.py",
+            "",
             "test/test_lizard_analysis.py",
-            "test/test_lizard_analysis.py",
-            "test/repositorymining/test_analye_churn.py",
-            "test/repositorymining/test_analye_churn.py",
             "src/profile/sqatt_profiles.py",
+            "",
         ]
     )
 
-    churn = calculate_churn(git_log)
-
-    expected_churn = [
-        ("test/test_lizard_analysis.py", 3),
-        ("test/repositorymining/test_analye_churn.py", 2),
-        ("src/profile/sqatt_profiles.py", 1),
-    ]
-    assert churn == expected_churn
-
-
-def test_remove_empty_lines():
-    """Test if empty lines are removed."""
+    churn = count_churn(git_log_lines)
 
-    git_log = """
-test/repositorymining/test_analye_churn.py
-test/repositorymining/test_analye_churn.py
+    assert churn.most_common() == [("test/test_lizard_analysis.py", 2), ("src/profile/sqatt_profiles.py", 1)]
 
-test/repositorymining/test_analye_churn.py
-test/test_lizard_analysis.py
 
-test/test_lizard_analysis.py
+@patch("src.churn.churn.Subprocess")
+def test_determine_churn_streams_git_log(subprocess_mock, tmp_path):
+    """Test if the churn is determined from the streamed lines of the git log."""
 
-"""
+    subprocess_mock.return_value.execute_lines.return_value = iter(["a.py", "", "b.py", "a.py"])
+    settings = {"repository": "repo", "report_directory": str(tmp_path), "since": "1-1-2021", "incremental": False}
 
-    log = remove_empty_lines(git_log)
+    churn = determine_churn(settings)
 
-    expected_log = os.linesep.join(
-        [
-            "test/repositorymining/test_analye_churn.py",
-            "test/repositorymining/test_analye_churn.py",
-            "test/repositorymining/test_analye_churn.py",
-            "test/test_lizard_analysis.py",
-            "test/test_lizard_analysis.py",
-        ]
+    assert churn == [("a.py", 2), ("b.py", 1)]
+    subprocess_mock.return_value.execute_lines.assert_called_once_with(
+        os.path.join(str(tmp_path), "churn"), "churn", check_return_code=True
     )
-    assert log == expected_log
 
 
 @patch("src.churn.churn.csv")
@@ -92,6 +79,11 @@ def test_get_settings():
 
     settings = get_settings(args)
 
-    expected_settings = {"repository": "/bla/input", "report_directory": "bla/reports", "since": "1-1-2021"}
+    expected_settings = {
+        "repository": "/bla/input",
+        "report_directory": "bla/reports",
+        "since": "1-1-2021",
+        "incremental": False,
+    }
 
     assert settings == expected_settings
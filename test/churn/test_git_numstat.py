@@ -0,0 +1,72 @@
+"""Unit test for the parsing of the git log with numstat."""
+
+from src.churn.git_numstat import Commit, FileChange, create_numstat_command, parse_numstat_log
+
+
+def test_numstat_command_contains_period():
+    """Test if the since and until dates are added to the git log command."""
+
+    # act
+    command = create_numstat_command("repo", since="2 weeks ago", until="2021-01-01")
+
+    # assert
+    assert command[:6] == ["git", "-C", "repo", "-c", "core.quotePath=false", "log"]
+    assert command[-2:] == ["--since=2 weeks ago", "--until=2021-01-01"]
+
+
+def test_numstat_log_is_parsed_into_commits():
+    """Test if the commits are parsed with the added and deleted lines of each file."""
+
+    # arrange
+    lines = [
+        "commit 1111 2021-01-02",
+        "",
+        "3\t1\tsrc/a.py",
+        "-\t-\timage.png",
+        "commit 2222 2021-01-01",
+        "",
+        "0\t10\tsrc/b.py",
+        " delete mode 100644 src/b.py",
+    ]
+
+    # act
+    commits = list(parse_numstat_log(lines))
+
+    # assert
+    assert commits == [
+        Commit("1111", "2021-01-02", [FileChange("src/a.py", 3, 1, False), FileChange("image.png", 0, 0, False)]),
+        Commit("2222", "2021-01-01", [FileChange("src/b.py", 0, 10, True)]),
+    ]
+
+
+def test_commit_without_changes_is_parsed():
+    """Test if a commit without file changes, like a merge commit, is parsed."""
+
+    # act
+    commits = list(parse_numstat_log(["commit 1111 2021-01-02", ""]))
+
+    # assert
+    assert commits == [Commit("1111", "2021-01-02", [])]
+
+
+def test_renames_are_parsed_into_old_and_new_path():
+    """Test if the old path of a renamed file is parsed, with and without braces."""
+
+    # arrange
+    lines = [
+        "commit 1111 2021-01-02",
+        "",
+        "1\t2\tsrc/{old => new}/a.py",
+        "0\t0\tsrc/{ => sub}/b.py",
+        "3\t0\tc.py => d.py",
+    ]
+
+    # act
+    commits = list(parse_numstat_log(lines, detect_renames=True))
+
+    # assert
+    assert commits[0].changes == [
+        FileChange("src/new/a.py", 1, 2, False, "src/old/a.py"),
+        FileChange("src/sub/b.py", 0, 0, False, "src/b.py"),
+        FileChange("d.py", 3, 0, False, "c.py"),
+    ]
@@ -0,0 +1,45 @@
+"""Unit tests for the DOT writer."""
+
+import io
+
+import networkx as nx
+
+from src.includegraph.dot_writer import write_dot
+
+
+def test_graph_is_written_with_highlighted_edges():
+    """Test that the nodes and edges are written and only the provided edges are highlighted."""
+
+    # arrange
+    graph = nx.DiGraph([("a.h", "b.h"), ("b.h", "a.h"), ("main.c", "a.h")])
+    output = io.StringIO()
+
+    # act
+    write_dot(graph, output, {("a.h", "b.h"), ("b.h", "a.h")})
+
+    # assert
+    assert output.getvalue().splitlines() == [
+        "digraph {",
+        '"a.h";',
+        '"b.h";',
+        '"main.c";',
+        '"a.h" -> "b.h" [color="red"];',
+        '"b.h" -> "a.h" [color="red"];',
+        '"main.c" -> "a.h";',
+        "}",
+    ]
+
+
+def test_names_are_quoted():
+    """Test that backslashes and quotes in names are escaped."""
+
+    # arrange
+    graph = nx.DiGraph()
+    graph.add_node('C:\\src\\"odd".h')
+    output = io.StringIO()
+
+    # act
+    write_dot(graph, output)
+
+    # assert
+    assert output.getvalue().splitlines()[1] == '"C:\\\\src\\\\\\"odd\\".h";'
@@ -0,0 +1,69 @@
+"""Unit tests for the persisted include manifest."""
+
+import os
+from unittest.mock import patch
+
+from src.includegraph.include_cache import load_manifest, save_manifest, scan_files_incrementally
+from src.includegraph.include_scanner import scan_files
+
+
+def write_source_file(path, content):
+    """Write a source file."""
+
+    with open(path, "w", encoding="utf-8") as source_file:
+        source_file.write(content)
+
+
+def test_only_changed_files_are_scanned_again(tmp_path):
+    """Test that a file is only scanned again when it has changed since the previous run."""
+
+    # arrange
+    unchanged_file = os.path.join(tmp_path, "a.c")
+    changed_file = os.path.join(tmp_path, "b.c")
+    write_source_file(unchanged_file, '#include "a.h"\n')
+    write_source_file(changed_file, '#include "b.h"\n')
+    list(scan_files_incrementally([unchanged_file, changed_file], str(tmp_path)))
+
+    write_source_file(changed_file, '#include "b.h"\n#include "c.h"\n')
+
+    # act
+    with patch("src.includegraph.include_cache.scan_files", wraps=scan_files) as scan:
+        results = list(scan_files_incrementally([unchanged_file, changed_file], str(tmp_path)))
+
+    # assert
+    scan.assert_called_once_with([changed_file], 1)
+    assert sorted(results) == [(unchanged_file, ['"a.h"'], 1), (changed_file, ['"b.h"', '"c.h"'], 2)]
+
+
+def test_removed_files_are_left_out_of_the_manifest(tmp_path):
+    """Test that files that no longer exist are removed from the manifest."""
+
+    # arrange
+    source_file = os.path.join(tmp_path, "a.c")
+    removed_file = os.path.join(tmp_path, "b.c")
+    write_source_file(source_file, "")
+    write_source_file(removed_file, "")
+    list(scan_files_incrementally([source_file, removed_file], str(tmp_path)))
+    os.remove(removed_file)
+
+    # act
+    results = list(scan_files_incrementally([source_file], str(tmp_path)))
+
+    # assert
+    assert results == [(source_file, [], 0)]
+    assert list(load_manifest(os.path.join(tmp_path, "include_scan_cache.json"))) == [source_file]
+
+
+def test_manifest_with_other_version_is_ignored(tmp_path):
+    """Test that a manifest with another version is treated as empty."""
+
+    # arrange
+    manifest_file = os.path.join(tmp_path, "include_scan_cache.json")
+    save_manifest(manifest_file, {"a.c": {}})
+    with open(manifest_file, "r", encoding="utf-8") as manifest:
+        content = manifest.read().replace('"version": 1', '"version": 0')
+    with open(manifest_file, "w", encoding="utf-8") as manifest:
+        manifest.write(content)
+
+    # act & assert
+    assert load_manifest(manifest_file) == {}
@@ -0,0 +1,76 @@
+"""Unit tests for the include cost analysis."""
+
+import networkx as nx
+
+from src.includegraph.include_cost import bitset_to_mask, determine_include_cost, rank_include_cost
+
+
+def create_graph(edges, lines):
+    """Create an include graph with the lines of code per file."""
+
+    graph = nx.DiGraph(edges)
+    nx.set_node_attributes(graph, lines, "lines")
+    return graph
+
+
+def test_bitset_is_converted_to_mask():
+    """Test that a bitset is converted to a boolean mask."""
+
+    # act
+    mask = bitset_to_mask(0b1000000101, 10)
+
+    # assert
+    assert mask.tolist() == [True, False, True, False, False, False, False, False, False, True]
+
+
+def test_include_cost_counts_transitive_includes_once():
+    """Test that each transitively included file is counted once."""
+
+    # arrange
+    graph = create_graph(
+        [("main.c", "a.h"), ("main.c", "b.h"), ("a.h", "c.h"), ("b.h", "c.h")],
+        {"main.c": 100, "a.h": 10, "b.h": 20, "c.h": 30},
+    )
+
+    # act
+    include_cost = determine_include_cost(graph)
+
+    # assert
+    assert include_cost == {"main.c": (3, 60), "a.h": (1, 30), "b.h": (1, 30), "c.h": (0, 0)}
+
+
+def test_include_cost_of_files_in_a_cycle_includes_the_other_files_of_the_cycle():
+    """Test that files in a cycle include each other, but not themselves."""
+
+    # arrange
+    graph = create_graph(
+        [("main.c", "a.h"), ("a.h", "b.h"), ("b.h", "a.h"), ("b.h", "vector")],
+        {"main.c": 100, "a.h": 10, "b.h": 20},
+    )
+
+    # act
+    include_cost = determine_include_cost(graph)
+
+    # assert
+    assert include_cost["main.c"] == (3, 30)
+    assert include_cost["a.h"] == (2, 20)
+    assert include_cost["b.h"] == (2, 10)
+    assert include_cost["vector"] == (0, 0)
+
+
+def test_include_cost_is_ranked_per_file_type():
+    """Test that the headers and translation units are ranked separately, without unresolved includes."""
+
+    # arrange
+    include_cost = {"main.c": (3, 60), "a.h": (1, 30), "b.h": (2, 40), "test.cpp": (1, 70), "vector": (0, 0)}
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["main.c", "a.h", "b.h", "test.cpp"], lines=10)
+    graph.add_node("vector")
+
+    # act
+    headers = rank_include_cost(graph, include_cost, False)
+    translation_units = rank_include_cost(graph, include_cost, True)
+
+    # assert
+    assert headers == [("b.h", 2, 40), ("a.h", 1, 30)]
+    assert translation_units == [("test.cpp", 1, 70), ("main.c", 3, 60)]
@@ -0,0 +1,79 @@
+"""Unit tests for the include cycle analysis."""
+
+import networkx as nx
+
+from src.includegraph.include_cycles import (
+    determine_cycle_edges,
+    determine_cycles,
+    determine_cyclic_components,
+    determine_feedback_edges,
+)
+
+
+def test_cyclic_components_are_sorted_by_size():
+    """Test that only components with a cycle are returned, the largest first."""
+
+    # arrange
+    graph = nx.DiGraph([("a", "b"), ("b", "a"), ("c", "d"), ("d", "e"), ("e", "c"), ("e", "f"), ("g", "g")])
+
+    # act
+    components = determine_cyclic_components(graph)
+
+    # assert
+    assert components == [{"c", "d", "e"}, {"a", "b"}, {"g"}]
+
+
+def test_removing_feedback_edges_breaks_all_cycles():
+    """Test that the graph is acyclic after removing the feedback edges of all components."""
+
+    # arrange
+    graph = nx.DiGraph([("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("d", "b"), ("d", "e"), ("e", "e")])
+
+    # act
+    feedback_edges = [
+        edge for component in determine_cyclic_components(graph) for edge in determine_feedback_edges(graph, component)
+    ]
+
+    # assert
+    graph.remove_edges_from(feedback_edges)
+    assert nx.is_directed_acyclic_graph(graph)
+    assert len(feedback_edges) == 3
+
+
+def test_cycles_are_limited_to_maximum_length():
+    """Test that only the cycles up to the maximum length are determined."""
+
+    # arrange
+    graph = nx.DiGraph([("a", "b"), ("b", "a"), ("b", "c"), ("c", "a")])
+
+    # act
+    cycles = determine_cycles(graph, determine_cyclic_components(graph), max_length=2)
+
+    # assert
+    assert [sorted(cycle) for cycle in cycles] == [["a", "b"]]
+
+
+def test_cycles_are_limited_to_maximum_count():
+    """Test that no more cycles than the maximum count are determined."""
+
+    # arrange
+    graph = nx.complete_graph(6, create_using=nx.DiGraph)
+
+    # act
+    cycles = determine_cycles(graph, determine_cyclic_components(graph), max_count=10)
+
+    # assert
+    assert len(cycles) == 10
+
+
+def test_cycle_edges_are_the_edges_within_cyclic_components():
+    """Test that the cycle edges are exactly the edges that are part of a cycle."""
+
+    # arrange
+    graph = nx.DiGraph([("a", "b"), ("b", "a"), ("b", "c"), ("c", "d"), ("d", "c"), ("e", "e")])
+
+    # act
+    cycle_edges = determine_cycle_edges(graph, determine_cyclic_components(graph))
+
+    # assert
+    assert cycle_edges == {("a", "b"), ("b", "a"), ("c", "d"), ("d", "c"), ("e", "e")}
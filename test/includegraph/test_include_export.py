@@ -0,0 +1,57 @@
+"""Unit tests for the export of the include graph."""
+
+import networkx as nx
+
+from src.includegraph.include_export import create_csr, csr_to_graph, export_csr, export_graphml, load_csr
+
+
+def create_graph():
+    """Create an include graph with an unresolved include."""
+
+    graph = nx.DiGraph([("main.c", "b.h"), ("main.c", "a.h"), ("a.h", "stdio.h")])
+    nx.set_node_attributes(graph, {"main.c": 100, "a.h": 10, "b.h": 20}, "lines")
+    graph.nodes["stdio.h"]["lines"] = None
+    return graph
+
+
+def test_csr_contains_sorted_targets_per_node():
+    """Test that the targets of each node are stored between its offsets."""
+
+    # act
+    names, lines, offsets, targets = create_csr(create_graph())
+
+    # assert
+    assert names.tolist() == ["a.h", "b.h", "main.c", "stdio.h"]
+    assert lines.tolist() == [10, 20, 100, -1]
+    assert offsets.tolist() == [0, 1, 1, 3, 3]
+    assert targets.tolist() == [3, 0, 1]
+
+
+def test_csr_file_is_loaded_as_the_exported_graph(tmp_path):
+    """Test that the graph loaded from a csr file equals the exported graph."""
+
+    # arrange
+    graph = create_graph()
+    csr_file = str(tmp_path / "include_graph.npz")
+
+    # act
+    export_csr(graph, csr_file)
+    loaded_graph = csr_to_graph(*load_csr(csr_file))
+
+    # assert
+    assert nx.utils.graphs_equal(loaded_graph, graph)
+
+
+def test_graphml_export_omits_unknown_lines(tmp_path):
+    """Test that the GraphML export only contains the lines of the resolved files."""
+
+    # arrange
+    graphml_file = str(tmp_path / "include_graph.graphml")
+
+    # act
+    export_graphml(create_graph(), graphml_file)
+    loaded_graph = nx.read_graphml(graphml_file)
+
+    # assert
+    assert dict(loaded_graph.nodes(data="lines")) == {"main.c": 100, "a.h": 10, "b.h": 20, "stdio.h": None}
+    assert sorted(loaded_graph.edges) == [("a.h", "stdio.h"), ("main.c", "a.h"), ("main.c", "b.h")]
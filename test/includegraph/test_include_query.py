@@ -0,0 +1,79 @@
+"""Unit tests for the include queries."""
+
+import io
+import os
+
+import networkx as nx
+import pytest
+
+from src.includegraph.include_query import ReachabilityIndex, answer_queries
+
+
+@pytest.fixture(name="index")
+def fixture_index():
+    """Create a reachability index of a small include graph with a cycle."""
+
+    graph = nx.DiGraph(
+        [
+            ("/src/main.c", "/src/a.h"),
+            ("/src/a.h", "/src/b.h"),
+            ("/src/b.h", "/src/c.h"),
+            ("/src/c.h", "/src/b.h"),
+            ("/src/c.h", "/lib/d.h"),
+            ("/src/other.c", "/lib/d.h"),
+        ]
+    )
+    return ReachabilityIndex(graph)
+
+
+def test_includes_is_transitive(index):
+    """Test that a file includes the files that are included by the files it includes."""
+
+    # act & assert
+    assert index.includes("/src/main.c", "/lib/d.h")
+    assert not index.includes("/lib/d.h", "/src/main.c")
+    assert not index.includes("/src/other.c", "/src/a.h")
+
+
+def test_file_only_includes_itself_in_a_cycle(index):
+    """Test that a file includes itself only when it is part of a cycle."""
+
+    # act & assert
+    assert index.includes("/src/b.h", "/src/b.h")
+    assert not index.includes("/src/a.h", "/src/a.h")
+
+
+def test_path_is_a_shortest_include_path(index):
+    """Test that the path is an include path from the source to the target."""
+
+    # act & assert
+    assert index.path("/src/main.c", "/lib/d.h") == ["/src/main.c", "/src/a.h", "/src/b.h", "/src/c.h", "/lib/d.h"]
+    assert index.path("/src/b.h", "/src/b.h") == ["/src/b.h", "/src/c.h", "/src/b.h"]
+    assert index.path("/src/other.c", "/src/a.h") is None
+
+
+def test_includers_are_all_files_that_include_the_file(index):
+    """Test that all files that include the file, directly or indirectly, are determined."""
+
+    # act & assert
+    assert index.includers("/src/b.h") == ["/src/a.h", "/src/b.h", "/src/c.h", "/src/main.c"]
+    assert index.includers("/src/a.h") == ["/src/main.c"]
+
+
+def test_queries_are_answered_per_line(index):
+    """Test that each query is answered on its own line and errors do not stop the other queries."""
+
+    # arrange
+    queries = io.StringIO("includes main.c d.h\n\nincluders a.h\npath other.c unknown.h\nremove a.h\n")
+    output = io.StringIO()
+
+    # act
+    answer_queries(index, queries, output)
+
+    # assert
+    assert output.getvalue().splitlines() == [
+        "includes main.c d.h: yes",
+        "includers a.h: /src/main.c",
+        "path other.c unknown.h: error: unknown.h is not in the include graph",
+        "remove a.h: error: invalid query: remove a.h",
+    ]
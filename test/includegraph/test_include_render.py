@@ -0,0 +1,133 @@
+"""Unit tests for the clustered rendering of the include graph."""
+
+import os
+
+import networkx as nx
+from mock import patch
+
+from src.includegraph.include_render import (
+    EXTERNAL_CLUSTER,
+    create_cluster_graph,
+    create_drill_down_graph,
+    determine_cluster,
+    render_clusters,
+)
+
+ROOT = os.path.abspath(os.sep + "project")
+A_H = os.path.join(ROOT, "a", "x", "a.h")
+A_C = os.path.join(ROOT, "a", "y", "a.c")
+B_H = os.path.join(ROOT, "b", "b.h")
+B_C = os.path.join(ROOT, "b", "b.c")
+
+
+def test_cluster_is_directory_relative_to_analysis_directory():
+    """Test that the cluster of a file is its directory relative to the analysis directory."""
+
+    # act
+    cluster = determine_cluster(A_H, ROOT)
+
+    # assert
+    assert cluster == os.path.join("a", "x")
+
+
+def test_cluster_is_truncated_to_cluster_depth():
+    """Test that the cluster is limited to the first directory levels."""
+
+    # act
+    cluster = determine_cluster(A_H, ROOT, 1)
+
+    # assert
+    assert cluster == "a"
+
+
+def test_unresolved_include_is_external_cluster():
+    """Test that an include that is not resolved to a file is part of the external cluster."""
+
+    # act
+    cluster = determine_cluster("stdio.h", ROOT)
+
+    # assert
+    assert cluster == EXTERNAL_CLUSTER
+
+
+def test_cluster_graph_counts_includes_between_clusters():
+    """Test that the cluster graph has one edge per pair of clusters weighted by the number of includes."""
+
+    # arrange
+    graph = nx.DiGraph([(A_C, A_H), (A_C, B_H), (A_H, B_H), (B_C, B_H), (B_H, A_H)])
+    cluster_of = {node: determine_cluster(node, ROOT, 1) for node in graph}
+
+    # act
+    cluster_graph, cluster_cycle_edges = create_cluster_graph(graph, cluster_of, {(A_H, B_H), (B_H, A_H)})
+
+    # assert
+    assert dict(cluster_graph.nodes(data="files")) == {"a": 2, "b": 2}
+    assert sorted(cluster_graph.edges(data="weight")) == [("a", "b", 2), ("b", "a", 1)]
+    assert cluster_cycle_edges == {("a", "b"), ("b", "a")}
+
+
+def test_drill_down_graph_collapses_other_clusters():
+    """Test that the drill-down shows the files of the cluster and the other clusters as single nodes."""
+
+    # arrange
+    graph = nx.DiGraph([(A_C, A_H), (A_C, B_H), (A_H, B_H), (B_C, B_H), (B_H, A_H)])
+    cluster_of = {node: determine_cluster(node, ROOT, 1) for node in graph}
+
+    # act
+    drill_down_graph, drill_down_cycle_edges = create_drill_down_graph(graph, cluster_of, "a", {(B_H, A_H)})
+
+    # assert
+    assert sorted(drill_down_graph.edges) == sorted([(A_C, A_H), (A_C, "b"), (A_H, "b"), ("b", A_H)])
+    assert drill_down_cycle_edges == {("b", A_H)}
+
+
+@patch("src.includegraph.include_render.graphviz.render")
+def test_render_clusters_links_overview_to_drill_downs(render_mock, tmp_path):
+    """Test that the html page links the overview to an svg per cluster."""
+
+    # arrange
+    graph = nx.DiGraph([(A_C, A_H), (A_C, B_H)])
+    settings = {
+        "analysis_directory": ROOT,
+        "report_directory": str(tmp_path),
+        "cluster_depth": 1,
+        "render_drill_downs": True,
+    }
+
+    # act
+    html_file = render_clusters(graph, set(), settings)
+
+    # assert
+    with open(html_file, "r", encoding="utf-8") as page:
+        content = page.read()
+
+    assert 'href="clusters/cluster_0.svg">a</a>' in content
+    assert 'href="clusters/cluster_1.svg">b</a>' in content
+    assert render_mock.call_count == 3
+    assert 'URL="clusters/cluster_1.svg"' in (tmp_path / "include_clusters").read_text(encoding="utf-8")
+
+
+@patch("src.includegraph.include_render.graphviz.render")
+def test_render_clusters_only_renders_overview_by_default(render_mock, tmp_path):
+    """Test that only the overview is rendered when the drill-downs are not requested."""
+
+    # arrange
+    graph = nx.DiGraph([(A_C, A_H), (A_C, B_H)])
+    settings = {
+        "analysis_directory": ROOT,
+        "report_directory": str(tmp_path),
+        "cluster_depth": 1,
+        "render_drill_downs": False,
+    }
+
+    # act
+    html_file = render_clusters(graph, set(), settings)
+
+    # assert
+    with open(html_file, "r", encoding="utf-8") as page:
+        content = page.read()
+
+    render_mock.assert_called_once_with("dot", format="svg", filepath=str(tmp_path / "include_clusters"))
+    assert "<td>a</td>" in content
+    assert "--drill-down &lt;cluster&gt;" in content
+    assert "URL=" not in (tmp_path / "include_clusters").read_text(encoding="utf-8")
@@ -0,0 +1,142 @@
+"""Unit tests for the include resolver."""
+
+import json
+import os
+
+import networkx as nx
+import pytest
+
+from src.includegraph.include_resolver import IncludeResolver, find_node, index_nodes_by_name, read_compile_commands
+
+
+def create_file(*path):
+    """Create an empty file and return its path."""
+
+    os.makedirs(os.path.dirname(os.path.join(*path)), exist_ok=True)
+    with open(os.path.join(*path), "wb"):
+        pass
+
+    return os.path.join(*path)
+
+
+def test_quoted_include_is_resolved_in_directory_of_including_file_first(tmp_path):
+    """Test that a quoted include is searched in the directory of the including file before the include dirs."""
+
+    # arrange
+    local_header = create_file(str(tmp_path), "src", "config.h")
+    create_file(str(tmp_path), "include", "config.h")
+    resolver = IncludeResolver([os.path.join(tmp_path, "include")])
+
+    # act
+    resolved = resolver.resolve(os.path.join(tmp_path, "src", "main.c"), '"config.h"')
+
+    # assert
+    assert resolved == local_header
+
+
+def test_angled_include_is_resolved_in_include_directories_only(tmp_path):
+    """Test that an angled include is only searched in the include directories."""
+
+    # arrange
+    create_file(str(tmp_path), "src", "config.h")
+    include_header = create_file(str(tmp_path), "include", "sub", "config.h")
+    resolver = IncludeResolver([os.path.join(tmp_path, "include")])
+
+    # act
+    resolved = resolver.resolve(os.path.join(tmp_path, "src", "main.c"), "<sub/config.h>")
+
+    # assert
+    assert resolved == include_header
+
+
+def test_unresolved_include_is_returned_as_its_name(tmp_path):
+    """Test that an include that can not be found is returned as its name."""
+
+    # arrange
+    resolver = IncludeResolver([str(tmp_path)])
+
+    # act
+    resolved = resolver.resolve(os.path.join(tmp_path, "main.c"), "<vector>")
+
+    # assert
+    assert resolved == "vector"
+
+
+def test_resolved_includes_are_memoized(tmp_path):
+    """Test that an include is resolved only once per including directory."""
+
+    # arrange
+    header = create_file(str(tmp_path), "config.h")
+    resolver = IncludeResolver()
+    resolver.resolve(os.path.join(tmp_path, "main.c"), '"config.h"')
+    os.remove(header)
+
+    # act
+    resolved = resolver.resolve(os.path.join(tmp_path, "other.c"), '"config.h"')
+
+    # assert
+    assert resolved == header
+
+
+def test_include_directories_are_read_from_compile_commands(tmp_path):
+    """Test that the include directories are read from the compile commands."""
+
+    # arrange
+    compile_commands_file = os.path.join(tmp_path, "compile_commands.json")
+    with open(compile_commands_file, "w", encoding="utf-8") as compile_commands:
+        json.dump(
+            [
+                {"directory": "/build", "command": "cc -Iinclude -I /opt/include -c main.c", "file": "main.c"},
+                {"directory": "/build", "arguments": ["cc", "-isystem", "sys", "-Iinclude", "-c", "a.c"]},
+            ],
+            compile_commands,
+        )
+
+    # act
+    include_directories = read_compile_commands(compile_commands_file)
+
+    # assert
+    assert include_directories == [
+        os.path.normpath("/build/include"),
+        os.path.normpath("/opt/include"),
+        os.path.normpath("/build/sys"),
+    ]
+
+
+def test_find_node_by_unique_file_name():
+    """Test that a node can be found by a unique trailing part of its path."""
+
+    # arrange
+    graph = nx.DiGraph([(os.path.join(os.sep, "src", "main.c"), os.path.join(os.sep, "src", "config.h"))])
+
+    # act
+    node = find_node(graph, "config.h")
+
+    # assert
+    assert node == os.path.join(os.sep, "src", "config.h")
+
+
+def test_find_node_by_trailing_path_in_index_of_file_names():
+    """Test that a node is found by a trailing part of its path among the nodes with the same file name."""
+
+    # arrange
+    app_config = os.path.join(os.sep, "app", "config.h")
+    lib_config = os.path.join(os.sep, "lib", "config.h")
+    graph = nx.DiGraph([(app_config, lib_config), (lib_config, os.path.join(os.sep, "lib", "types.h"))])
+
+    # act
+    node = find_node(graph, os.path.join("lib", "config.h"), index_nodes_by_name(graph))
+
+    # assert
+    assert node == lib_config
+
+
+def test_find_node_raises_when_file_name_is_ambiguous():
+    """Test that finding a node by an ambiguous name raises an exception."""
+
+    # arrange
+    graph = nx.DiGraph([(os.path.join(os.sep, "app", "config.h"), os.path.join(os.sep, "lib", "config.h"))])
+
+    # act & assert
+    with pytest.raises(nx.NodeNotFound):
+        find_node(graph, "config.h")
@@ -0,0 +1,89 @@
+"""Unit tests for the include scanner."""
+
+import os
+from unittest.mock import patch
+
+from src.includegraph.include_scanner import count_lines, find_includes, find_source_files, scan_files, scan_includes
+
+
+def test_find_includes_only_matches_preprocessor_lines():
+    """Test that only include directives on preprocessor lines are found."""
+
+    # arrange
+    content = (
+        b'#include "foo.h"\n'
+        b"  #  include <vector>\n"
+        b'// #include "commented.h" is not at the start of the line\n'
+        b'printf("#include <stdio.h>");\n'
+        b"#include\t<sys/types.h> // comment\n"
+        b"#define INCLUDE 1\n"
+    )
+
+    # act
+    includes = find_includes(content)
+
+    # assert
+    assert includes == ['"foo.h"', "<vector>", "<sys/types.h>"]
+
+
+def test_scan_includes_reads_large_files_memory_mapped(tmp_path):
+    """Test that large files are scanned through a memory map."""
+
+    # arrange
+    source_file = os.path.join(tmp_path, "large.cpp")
+    with open(source_file, "wb") as output:
+        output.write(b'#include "first.h"\n' + b"int a;\n" * 10 + b"#include <last.h>\n")
+
+    # act
+    with patch("src.includegraph.include_scanner.MMAP_THRESHOLD", 10):
+        includes = scan_includes(source_file)
+
+    # assert
+    assert includes == ['"first.h"', "<last.h>"]
+
+
+def test_scan_files_in_process_pool(tmp_path):
+    """Test that the files are scanned in a pool of processes."""
+
+    # arrange
+    for name, include in [("a.c", "a.h"), ("b.c", "b.h"), ("c.c", "c.h")]:
+        with open(os.path.join(tmp_path, name), "wb") as output:
+            output.write(f'#include "{include}"\n'.encode())
+
+    file_names = sorted(find_source_files(str(tmp_path), None))
+
+    # act
+    results = list(scan_files(file_names, jobs=2))
+
+    # assert
+    assert results == [
+        (os.path.join(tmp_path, "a.c"), ['"a.h"'], 1),
+        (os.path.join(tmp_path, "b.c"), ['"b.h"'], 1),
+        (os.path.join(tmp_path, "c.c"), ['"c.h"'], 1),
+    ]
+
+
+def test_lines_are_counted():
+    """Test that the last line is counted, also when it does not end with a newline."""
+
+    # act & assert
+    assert count_lines(b"") == 0
+    assert count_lines(b"a\nb\n") == 2
+    assert count_lines(b"a\nb") == 2
+
+
+def test_find_source_files_skips_excluded_directories(tmp_path):
+    """Test that the files in excluded directories are skipped."""
+
+    # arrange
+    os.makedirs(os.path.join(tmp_path, "src"))
+    os.makedirs(os.path.join(tmp_path, "external"))
+    for name in [os.path.join("src", "a.cpp"), os.path.join("src", "readme.md"), os.path.join("external", "b.h")]:
+        with open(os.path.join(tmp_path, name), "wb"):
+            pass
+
+    # act
+    source_files = list(find_source_files(str(tmp_path), ["external"]))
+
+    # assert
+    assert source_files == [os.path.join(tmp_path, "src", "a.cpp")]
@@ -0,0 +1,83 @@
+"""Unit tests for the include graph analysis."""
+
+import os
+
+import networkx as nx
+from mock import patch
+
+from src.includegraph.includegraph import build_include_graph, show_include_graph
+
+
+def write_source_file(directory, name, content):
+    """Write a source file to the directory."""
+
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as source_file:
+        source_file.write(content)
+
+
+def test_build_include_graph_creates_edge_per_include(tmp_path):
+    """Test that the include graph has an edge from each file to the files it includes."""
+
+    # arrange
+    write_source_file(tmp_path, "main.cpp", '#include "a.h"\n#include <vector>\n')
+    write_source_file(tmp_path, "a.h", '#include "b.h"\n')
+    settings = {
+        "analysis_directory": str(tmp_path),
+        "report_directory": str(tmp_path),
+        "rebuild": False,
+        "excludes": None,
+        "jobs": 1,
+        "include_directories": None,
+        "compile_commands": None,
+    }
+
+    # act
+    graph = build_include_graph(settings)
+
+    # assert
+    main_file = os.path.join(tmp_path, "main.cpp")
+    a_file = os.path.join(tmp_path, "a.h")
+    assert sorted(graph.edges) == [(a_file, "b.h"), (main_file, a_file), (main_file, "vector")]
+
+
+def test_files_with_the_same_name_are_different_nodes(tmp_path):
+    """Test that files with the same name in different directories are different nodes."""
+
+    # arrange
+    for directory in ["app", "lib"]:
+        os.makedirs(os.path.join(tmp_path, directory))
+        write_source_file(os.path.join(tmp_path, directory), "config.h", "")
+        write_source_file(os.path.join(tmp_path, directory), "main.c", '#include "config.h"\n')
+
+    settings = {
+        "analysis_directory": str(tmp_path),
+        "report_directory": str(tmp_path),
+        "rebuild": False,
+        "excludes": None,
+        "jobs": 1,
+        "include_directories": None,
+        "compile_commands": None,
+    }
+
+    # act
+    graph = build_include_graph(settings)
+
+    # assert
+    assert graph.has_edge(os.path.join(tmp_path, "app", "main.c"), os.path.join(tmp_path, "app", "config.h"))
+    assert graph.has_edge(os.path.join(tmp_path, "lib", "main.c"), os.path.join(tmp_path, "lib", "config.h"))
+    assert graph.number_of_nodes() == 4
+
+
+@patch("src.includegraph.includegraph.graphviz")
+def test_headless_include_graph_is_rendered_without_viewer(graphviz_mock, tmp_path):
+    """Test that the include graph is rendered but not opened in a viewer when running headless."""
+
+    # arrange
+    settings = {"report_directory": str(tmp_path), "clusters": False, "drill_down": None, "headless": True}
+
+    # act
+    show_include_graph(nx.DiGraph([("main.c", "main.h")]), set(), settings)
+
+    # assert
+    graphviz_mock.render.assert_called_once()
+    graphviz_mock.view.assert_not_called()
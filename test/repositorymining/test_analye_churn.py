@@ -9,6 +9,7 @@ import pandas
 from src.repositorymining.analyze_churn import (
     measure_file_complexity,
     measure_file_churn,
+    merge_window_churn,
     save_file_churn,
     analyze_churn_complexity,
     show_churn_complexity_chart,
@@ -59,6 +60,9 @@ def test_measure_churn_returns_sorted_churn_per_file(code_churn_mock):
         "period_start": datetime(year=2024, month=1, day=1),
         "period_end": datetime(year=2024, month=3, day=1),
         "period_frequency": "WEEKLY",
+        "incremental": False,
+        "churn_backend": "pydriller",
+        "jobs": 1,
     }
 
     # act
@@ -186,3 +190,65 @@ def test_show_code_volume_profile_figure_created_with_correct_values(figure_mock
 
     figure_mock().update_layout.assert_called_once()
     figure_mock().show.assert_called_once()
+
+
+@patch("src.repositorymining.analyze_churn.Subprocess")
+def test_measure_churn_with_numstat_follows_renames_and_skips_deletions(subprocess_mock, tmp_path):
+    """Test that the numstat churn is attributed to the latest name of a file and deleted files are skipped."""
+
+    # arrange
+    subprocess_mock.return_value.execute_lines.return_value = [
+        "commit 3333 2024-02-03",
+        "",
+        "0\t4\told.py",
+        " delete mode 100644 old.py",
+        "commit 2222 2024-02-02",
+        "",
+        "1\t1\tsrc/{a.py => b.py}",
+        "commit 1111 2024-02-01",
+        "",
+        "10\t0\tsrc/a.py",
+        "2\t0\told.py",
+    ]
+
+    settings = {
+        "repository": "github/my_repository",
+        "report_directory": str(tmp_path),
+        "period_start": datetime(year=2024, month=1, day=1),
+        "period_end": datetime(year=2024, month=3, day=1),
+        "period_frequency": "WEEKLY",
+        "incremental": False,
+        "churn_backend": "numstat",
+        "detect_renames": True,
+        "jobs": 1,
+    }
+
+    # act
+    churn_per_file = measure_file_churn(settings)
+
+    # assert
+    assert churn_per_file == [
+        (os.path.join("github/my_repository", "src/b.py"), 12),
+        (os.path.join("github/my_repository", "old.py"), 2),
+    ]
+    command = subprocess_mock.call_args[0][0]
+    assert "-M" in command
+    assert "--since=2024-01-01T00:00:00+00:00" in command
+    assert "--until=2024-03-01T00:00:00+00:00" in command
+
+
+def test_merge_window_churn_attributes_churn_to_latest_name():
+    """Test that the churn of a file renamed in a later window is attributed to its latest name."""
+
+    # arrange
+    window_churns = [
+        ({"a.py": 3, "b.py": 1}, {}),
+        ({"c.py": 2}, {"a.py": "c.py"}),
+        ({"d.py": 4}, {"c.py": "d.py"}),
+    ]
+
+    # act
+    churn = merge_window_churn(window_churns)
+
+    # assert
+    assert churn == {"d.py": 9, "b.py": 1}
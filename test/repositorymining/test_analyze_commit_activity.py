@@ -0,0 +1,100 @@
+"""Unit test for the commit activity analysis."""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import pandas as pd
+
+from src.repositorymining.analyze_commit_activity import (
+    classify_commit,
+    classify_paths,
+    count_commits_per_period,
+    determine_commit_activity,
+    determine_periods,
+)
+
+
+def test_commit_is_classified_as_production_and_test_code():
+    """Test that a commit is classified by the paths of its modified files, ignoring deleted files."""
+
+    # arrange
+    commit = Mock(modified_files=[Mock(new_path="src/main.py"), Mock(new_path="test/TestMain.py"), Mock(new_path=None)])
+
+    # act
+    production, test = classify_commit(commit)
+
+    # assert
+    assert production
+    assert test
+
+
+def test_paths_are_classified_as_production_code():
+    """Test that paths without test in their name are production code."""
+
+    # act
+    production, test = classify_paths(["src/main.py", "docs/readme.md"])
+
+    # assert
+    assert production
+    assert not test
+
+
+def create_commits():
+    """Create the collected commits."""
+
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(
+                ["2024-01-08 10:00:00", "2024-01-14 00:00:00", "2024-01-16 12:00:00", "2024-02-01 00:00:00"]
+            ),
+            "production": [True, True, False, True],
+            "test": [False, True, True, False],
+        }
+    )
+
+
+def test_commits_are_counted_per_week():
+    """Test that the commits are counted in the week they are made, a week starting at the start date."""
+
+    # arrange
+    periods = determine_periods(datetime(2024, 1, 7, 0, 0, 0, 500), datetime(2024, 1, 25), "WEEKLY")
+
+    # act
+    counts = count_commits_per_period(create_commits(), periods, "WEEKLY")
+
+    # assert
+    assert periods.tolist() == [pd.Timestamp(2024, 1, 7), pd.Timestamp(2024, 1, 14), pd.Timestamp(2024, 1, 21)]
+    assert counts["commit_count"].tolist() == [1, 2, 0]
+    assert counts["production_commit_count"].tolist() == [1, 1, 0]
+    assert counts["test_commit_count"].tolist() == [0, 2, 0]
+
+
+def test_commits_are_counted_per_month():
+    """Test that the commits are counted per calendar month."""
+
+    # arrange
+    periods = determine_periods(datetime(2024, 1, 7, 15), datetime(2024, 3, 3), "MONTHLY")
+
+    # act
+    counts = count_commits_per_period(create_commits(), periods, "MONTHLY")
+
+    # assert
+    assert periods.tolist() == [pd.Timestamp(2024, 1, 1), pd.Timestamp(2024, 2, 1), pd.Timestamp(2024, 3, 1)]
+    assert counts["commit_count"].tolist() == [3, 1, 0]
+    assert counts["production_commit_count"].tolist() == [2, 1, 0]
+    assert counts["test_commit_count"].tolist() == [2, 0, 0]
+
+
+def test_commit_activity_is_cumulative_for_production_and_test_code():
+    """Test that the production and test commits are accumulated over the periods and the commits are not."""
+
+    # arrange
+    periods = determine_periods(datetime(2024, 1, 1), datetime(2024, 2, 1), "MONTHLY")
+
+    # act
+    dataframe = determine_commit_activity(create_commits(), periods, "MONTHLY")
+
+    # assert
+    assert dataframe["production_commit_count"].tolist() == [2, 3]
+    assert dataframe["test_commit_count"].tolist() == [2, 2]
+    assert dataframe["commit_count"].tolist() == [3, 1]
@@ -0,0 +1,134 @@
+"""Unit test for the commit cache."""
+
+import subprocess  # nosec
+
+from src.repositorymining.commit_cache import CommitCache
+
+
+def git(repository, *arguments):
+    """Run a git command in the repository."""
+
+    subprocess.run(
+        ["git", "-C", str(repository), "-c", "user.email=a@b", "-c", "user.name=a", *arguments],
+        check=True,
+        capture_output=True,
+    )  # nosec
+
+
+def commit(repository, message, date, monkeypatch):
+    """Commit the staged changes on the date."""
+
+    monkeypatch.setenv("GIT_COMMITTER_DATE", date)
+    git(repository, "commit", "-q", "-m", message, "--date", date)
+
+
+def commit_file(repository, file_name, content, date, monkeypatch):
+    """Write the file and commit it on the date."""
+
+    (repository / file_name).write_text(content, encoding="utf-8")
+    git(repository, "add", file_name)
+    commit(repository, file_name, date, monkeypatch)
+
+
+def create_repository(tmp_path, monkeypatch):
+    """Create a repository in which a file is changed, renamed and deleted."""
+
+    repository = tmp_path / "repo"
+    repository.mkdir()
+    git(repository, "init", "-q")
+    commit_file(repository, "a.py", "1\n2\n3\n4\n", "2021-01-01T12:00:00+00:00", monkeypatch)
+    commit_file(repository, "b.py", "1\n", "2021-01-02T12:00:00+00:00", monkeypatch)
+    git(repository, "mv", "a.py", "c.py")
+    commit(repository, "rename", "2021-01-03T12:00:00+00:00", monkeypatch)
+    git(repository, "rm", "-q", "b.py")
+    commit(repository, "remove", "2021-01-04T12:00:00+00:00", monkeypatch)
+    return repository
+
+
+def test_file_commit_counts_follow_the_git_log(tmp_path, monkeypatch):
+    """Test that the commits are counted per path, a renamed file under its new path and a deleted file too."""
+
+    # arrange
+    repository = create_repository(tmp_path, monkeypatch)
+    cache = CommitCache(str(repository), str(tmp_path / "report"))
+
+    # act
+    added_commits = cache.update()
+
+    # assert
+    assert added_commits == 4
+    assert cache.file_commit_counts() == [("b.py", 2), ("c.py", 1), ("a.py", 1)]
+    cache.close()
+
+
+def test_line_churn_is_attributed_to_the_latest_name(tmp_path, monkeypatch):
+    """Test that the line churn of a renamed file is attributed to its latest name and deleted files are skipped."""
+
+    # arrange
+    repository = create_repository(tmp_path, monkeypatch)
+    cache = CommitCache(str(repository), str(tmp_path / "report"))
+    cache.update()
+
+    # act
+    churn = cache.line_churn()
+    churn_since_second_day = cache.line_churn(since=1609588800)
+
+    # assert
+    assert churn == {"c.py": 4, "b.py": 1}
+    assert churn_since_second_day == {"c.py": 0, "b.py": 1}
+    cache.close()
+
+
+def test_commit_paths_contain_the_existing_paths_of_each_commit(tmp_path, monkeypatch):
+    """Test that each commit has a row per path that exists after the commit, or one row without a path."""
+
+    # arrange
+    repository = create_repository(tmp_path, monkeypatch)
+    cache = CommitCache(str(repository), str(tmp_path / "report"))
+    cache.update()
+
+    # act
+    commit_paths = cache.commit_paths()
+
+    # assert
+    assert commit_paths["path"].fillna("").tolist() == ["", "c.py", "b.py", "a.py"]
+    assert str(commit_paths["date"].iloc[0]) == "2021-01-04 12:00:00"
+    cache.close()
+
+
+def test_only_new_commits_are_added(tmp_path, monkeypatch):
+    """Test that an update only reads the commits since the previous update and keeps them in the order of git log."""
+
+    # arrange
+    repository = create_repository(tmp_path, monkeypatch)
+    cache = CommitCache(str(repository), str(tmp_path / "report"))
+    cache.update()
+    commit_file(repository, "c.py", "1\n", "2021-01-05T12:00:00+00:00", monkeypatch)
+
+    # act
+    added_commits = cache.update()
+    unchanged_commits = cache.update()
+
+    # assert
+    assert added_commits == 1
+    assert unchanged_commits == 0
+    assert cache.file_commit_counts() == [("c.py", 2), ("b.py", 2), ("a.py", 1)]
+    cache.close()
+
+
+def test_cache_is_rebuilt_when_history_is_rewritten(tmp_path, monkeypatch):
+    """Test that the cache is rebuilt when the last processed commit is no longer in the history."""
+
+    # arrange
+    repository = create_repository(tmp_path, monkeypatch)
+    cache = CommitCache(str(repository), str(tmp_path / "report"))
+    cache.update()
+    git(repository, "reset", "-q", "--hard", "HEAD~2")
+
+    # act
+    added_commits = cache.update()
+
+    # assert
+    assert added_commits == 2
+    assert cache.file_commit_counts() == [("b.py", 1), ("a.py", 1)]
+    cache.close()
@@ -0,0 +1,87 @@
+"""Unit test for scanning the commits with git log."""
+
+from datetime import datetime, timedelta, timezone
+
+from src.repositorymining.git_commits import (
+    CommitChanges,
+    CommitRecord,
+    FileChangeRecord,
+    create_name_status_command,
+    parse_name_status_log,
+    parse_raw_numstat_log,
+)
+
+
+def test_name_status_command_contains_period_in_utc():
+    """Test that the period is added to the git log command, dates without timezone in UTC."""
+
+    # act
+    command = create_name_status_command("repo", since=datetime(2024, 1, 1), until="2024-03-01T12:00:00+01:00")
+
+    # assert
+    assert command[:6] == ["git", "-C", "repo", "-c", "core.quotePath=false", "log"]
+    assert command[-2:] == ["--since=2024-01-01T00:00:00+00:00", "--until=2024-03-01T12:00:00+01:00"]
+
+
+def test_name_status_log_is_parsed_into_commit_records():
+    """Test that the commits are parsed with the paths that exist after the commit."""
+
+    # arrange
+    lines = [
+        "commit 2222\t2024-01-02T10:00:00+01:00\tJane Doe",
+        "",
+        "M\tsrc/main.py",
+        "R087\tsrc/old.py\tsrc/new.py",
+        "D\ttest/test_old.py",
+        "commit 1111\t2024-01-01T10:00:00+00:00\tJohn Doe",
+    ]
+
+    # act
+    commits = list(parse_name_status_log(lines))
+
+    # assert
+    assert commits == [
+        CommitRecord(
+            "2222",
+            datetime(2024, 1, 2, 10, tzinfo=timezone(timedelta(hours=1))),
+            "Jane Doe",
+            ["src/main.py", "src/new.py"],
+        ),
+        CommitRecord("1111", datetime(2024, 1, 1, 10, tzinfo=timezone.utc), "John Doe", []),
+    ]
+
+
+def test_raw_numstat_log_is_parsed_into_file_changes():
+    """Test that the raw status and the numstat of each changed file are combined."""
+
+    # arrange
+    lines = [
+        "commit 2222\t1704189600\tJane Doe",
+        "",
+        ":100644 100644 abc1234 def5678 M\tsrc/main.py",
+        ":100644 100644 abc1234 def5678 R087\tsrc/old.py\tsrc/new.py",
+        ":100644 000000 abc1234 0000000 D\timage.png",
+        "3\t1\tsrc/main.py",
+        "1\t1\tsrc/{old.py => new.py}",
+        "-\t-\timage.png",
+        "commit 1111\t1704103200\tJohn Doe",
+        "",
+    ]
+
+    # act
+    commits = list(parse_raw_numstat_log(lines))
+
+    # assert
+    assert commits == [
+        CommitChanges(
+            "2222",
+            1704189600,
+            "Jane Doe",
+            [
+                FileChangeRecord("M", "src/main.py", None, 3, 1),
+                FileChangeRecord("R", "src/new.py", "src/old.py", 1, 1),
+                FileChangeRecord("D", "image.png", None, 0, 0),
+            ],
+        ),
+        CommitChanges("1111", 1704103200, "John Doe", []),
+    ]
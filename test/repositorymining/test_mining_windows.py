@@ -0,0 +1,29 @@
+"""Unit test for splitting a period into windows."""
+
+from datetime import datetime
+
+from src.repositorymining.mining_windows import determine_windows
+
+
+def test_windows_start_at_the_beginning_of_a_week_and_do_not_overlap():
+    """Test that the period is split in consecutive windows of whole weeks."""
+
+    # act
+    windows = determine_windows(datetime(2024, 1, 3, 10), datetime(2024, 3, 1), 3)
+
+    # assert
+    assert windows == [
+        (datetime(2024, 1, 3, 10), datetime(2024, 1, 20, 23, 59, 59)),
+        (datetime(2024, 1, 21), datetime(2024, 2, 10, 23, 59, 59)),
+        (datetime(2024, 2, 11), datetime(2024, 3, 1)),
+    ]
+
+
+def test_short_period_is_not_split():
+    """Test that a period within one week is a single window."""
+
+    # act
+    windows = determine_windows(datetime(2024, 1, 3), datetime(2024, 1, 5), 4)
+
+    # assert
+    assert windows == [(datetime(2024, 1, 3), datetime(2024, 1, 5))]
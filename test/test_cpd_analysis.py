@@ -7,9 +7,13 @@ import pytest
 from src.cpd.cpd_analysis import (
     measure_code_duplication,
     measure_lines_of_code,
-    determine_duplicate_lines_of_code,
+    determine_unique_duplicate_lines_of_code,
+    aggregate_duplication,
+    count_merged_lines,
     determine_colors,
     determine_total_lines_of_code,
+    read_total_lines_of_code,
+    analyze_duplication,
     show_duplication_profile,
     parse_arguments,
     get_settings,
@@ -96,7 +100,7 @@ def test_determine_duplicated_loc_calculates_correct_number_of_duplicated_lines(
     )
 
     # act
-    duplicated_loc = int(determine_duplicate_lines_of_code(data))
+    duplicated_loc = aggregate_duplication(data)["duplicated_loc"]
 
     # assert
     assert duplicated_loc == 212
@@ -116,7 +120,7 @@ def test_determine_duplicated_loc_calculates_correct_number_of_duplicated_lines_
     )
 
     # act
-    duplicated_loc = int(determine_duplicate_lines_of_code(data))
+    duplicated_loc = aggregate_duplication(data)["duplicated_loc"]
 
     # assert
     assert duplicated_loc == 212
@@ -129,7 +133,7 @@ def test_determine_duplicated_loc_returns_0_when_provided_string_is_empty():
     data = ""
 
     # act
-    duplicated_loc = int(determine_duplicate_lines_of_code(data))
+    duplicated_loc = aggregate_duplication(data)["duplicated_loc"]
 
     # assert
     assert duplicated_loc == 0
@@ -143,7 +147,7 @@ def test_determine_duplicated_loc_raises_exception_when_provided_string_is_corru
 
     # act & assert
     with pytest.raises(ValueError):
-        determine_duplicate_lines_of_code(data)
+        aggregate_duplication(data)
 
 
 def test_determine_duplicated_loc_raises_when_provided_string_has_wrong_header():
@@ -159,7 +163,7 @@ def test_determine_duplicated_loc_raises_when_provided_string_has_wrong_header()
 
     # act & assert
     with pytest.raises(ValueError):
-        determine_duplicate_lines_of_code(data)
+        aggregate_duplication(data)
 
 
 def test_determine_duplicated_loc_raises_exception_when_lines_count_is_string():
@@ -175,7 +179,68 @@ def test_determine_duplicated_loc_raises_exception_when_lines_count_is_string():
 
     # act & assert
     with pytest.raises(ValueError):
-        determine_duplicate_lines_of_code(data)
+        aggregate_duplication(data)
+
+
+def test_unique_duplicated_loc_counts_overlapping_duplicates_once():
+    """Test that lines of overlapping and nested duplicates are counted once per file."""
+
+    # arrange
+    data = (
+        "lines,tokens,occurrences\n"
+        "40, 84, 2, 210,\\west\\west_dotcover.py, 19,\\west\\west_resharper_profile.py\n"
+        "15, 78, 2, 220,\\west\\west_dotcover.py, 105,\\west\\west_riskmatrix.py\n"
+        "10, 82, 2, 250,\\west\\west_dotcover.py, 110,\\west\\west_riskmatrix.py\n"
+    )
+
+    # act
+    duplicated_loc_per_file = determine_unique_duplicate_lines_of_code(data)
+
+    # assert
+    assert duplicated_loc_per_file == {
+        "\\west\\west_dotcover.py": 50,
+        "\\west\\west_resharper_profile.py": 40,
+        "\\west\\west_riskmatrix.py": 15,
+    }
+
+
+def test_aggregate_duplication_streams_lines_and_aggregates_per_file_and_language():
+    """Test that the duplicated lines of code are aggregated per file and language from a stream of lines."""
+
+    # arrange
+    lines = iter(
+        [
+            "Added ./src to the list of files",
+            "lines,tokens,occurrences",
+            "40, 84, 2, 210,src/dotcover.py, 19,src/resharper.cpp",
+            "15, 78, 3, 76,src/riskmatrix.py, 105,src/riskmatrix.py, 1,src/main.cpp",
+        ]
+    )
+
+    # act
+    metrics = aggregate_duplication(lines)
+
+    # assert
+    assert metrics == {
+        "duplicated_loc": 125,
+        "duplicated_loc_per_file": {
+            "src/dotcover.py": 40,
+            "src/main.cpp": 15,
+            "src/resharper.cpp": 40,
+            "src/riskmatrix.py": 30,
+        },
+        "duplicated_loc_per_language": {"cpp": 55, "python": 70},
+    }
+
+
+def test_count_merged_lines_merges_adjacent_ranges():
+    """Test that adjacent ranges are merged and separate ranges are counted apart."""
+
+    # act
+    count = count_merged_lines([(11, 20), (1, 10), (30, 30), (5, 8)])
+
+    # assert
+    assert count == 21
 
 
 def test_determine_total_lines_of_code_is_correct():
@@ -228,6 +293,65 @@ def test_determine_total_lines_of_code_is_0_when_sum_not_in_string():
     assert total_loc == 0
 
 
+def test_total_lines_of_code_is_read_from_sum_row_of_cloc_report(tmp_path):
+    """Test that the total lines of code are read from the SUM row of a cloc report."""
+
+    # arrange
+    report_file = tmp_path / "cloc.csv"
+    report_file.write_text(
+        'files,language,blank,comment,code,"github.com/AlDanial/cloc v 1.82"\n'
+        "58,Python,992,495,2178\n"
+        "81,SUM,1066,500,5003\n",
+        encoding="utf-8",
+    )
+
+    # act
+    total_loc = read_total_lines_of_code(str(report_file))
+
+    # assert
+    assert total_loc == 5003
+
+
+def test_total_lines_of_code_is_read_from_language_profile(tmp_path):
+    """Test that the total lines of code are the sum of the languages in a language profile."""
+
+    # arrange
+    report_file = tmp_path / "language_profile.csv"
+    report_file.write_text(
+        '"Language","Number Of Files","Blank Lines","Lines Of Code","Comment Lines"\n'
+        '"Python","58","992","2178","495"\n'
+        '"C++","23","74","2825","5"\n',
+        encoding="utf-8",
+    )
+
+    # act
+    total_loc = read_total_lines_of_code(str(report_file))
+
+    # assert
+    assert total_loc == 5003
+
+
+@patch("src.cpd.cpd_analysis.measure_lines_of_code")
+@patch("src.cpd.cpd_analysis.read_total_lines_of_code")
+@patch("src.cpd.cpd_analysis.measure_code_duplication")
+def test_analyze_duplication_reuses_cloc_report(cpd_mock, read_mock, cloc_mock):
+    """Test that cloc is not run when a cloc report is provided."""
+
+    # arrange
+    settings = {"engine": "cpd", "exact": False, "cloc_report": "cloc.csv"}
+    cpd_mock.return_value = "lines,tokens,occurrences\n10, 84, 2, 1, a.py, 5, b.py\n"
+    read_mock.return_value = 1000
+
+    # act
+    metrics = analyze_duplication(settings)
+
+    # assert
+    assert metrics["duplicated_loc"] == 20
+    assert metrics["total_loc"] == 1000
+    read_mock.assert_called_once_with("cloc.csv")
+    cloc_mock.assert_not_called()
+
+
 TEST_DATA = [
     (0, ["rgb(204, 5, 5)", "rgb(121, 185, 79)"]),
     (3, ["rgb(121, 185, 79)", "rgb(121, 185, 79)"]),
@@ -291,6 +415,12 @@ def test_options_have_correct_default(os_path_join_mock):
         "language": "python",
         "report_directory": "/bin/reports",
         "analysis_directory": "/bla/input",
+        "engine": "cpd",
+        "jobs": 1,
+        "exact": False,
+        "cloc_report": None,
+        "changed_files": None,
+        "diff_range": None,
     }
 
     # act
@@ -304,12 +434,30 @@ def test_options_have_correct_value():
     """Test that the default output directory is correct."""
 
     # arrange
-    args = parse_arguments(["/bla/input", "--tokens=16", "--language=java", "--output=/bin/reports"])
+    args = parse_arguments(
+        [
+            "/bla/input",
+            "--tokens=16",
+            "--language=java",
+            "--output=/bin/reports",
+            "--engine=native",
+            "--jobs=4",
+            "--exact",
+            "--cloc-report=cloc.csv",
+            "--diff-range=main...HEAD",
+        ]
+    )
     expected_defaults = {
         "tokens": "16",
         "language": "java",
         "report_directory": "/bin/reports",
         "analysis_directory": "/bla/input",
+        "engine": "native",
+        "jobs": 4,
+        "exact": True,
+        "cloc_report": "cloc.csv",
+        "changed_files": None,
+        "diff_range": "main...HEAD",
     }
 
     # act
@@ -319,6 +467,28 @@ def test_options_have_correct_value():
     assert settings == expected_defaults
 
 
+@pytest.mark.parametrize("option", ["--engine=native", "--diff-range=main...HEAD"])
+def test_language_unsupported_by_native_tokenizer_is_rejected(option, capsys):
+    """Test that a language the native tokenizer does not support is rejected with a clear error."""
+
+    # act
+    with pytest.raises(SystemExit):
+        parse_arguments(["/bla/input", "--language=ruby", option])
+
+    # assert
+    assert "do not support ruby" in capsys.readouterr().err
+
+
+def test_language_unsupported_by_native_tokenizer_is_accepted_by_cpd():
+    """Test that cpd is still used for the languages that the native tokenizer does not support."""
+
+    # act
+    args = parse_arguments(["/bla/input", "--language=ruby"])
+
+    # assert
+    assert args.language == "ruby"
+
+
 @patch("src.cpd.cpd_analysis.csv")
 def test_that_profile_is_saved_correctly(csv_mock):
     """Test that the code duplication profile is save correctly."""
@@ -0,0 +1,119 @@
+"""Unit tests for the incremental duplication detection with a fingerprint index."""
+
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+from src.cpd.cpd_index import FingerprintIndex, determine_fingerprints, find_new_duplicates, winnow
+
+DUPLICATED_CODE = "def f(a, b):\n    c = a + b\n    d = c * a - b\n    return [c, d, a, b]\n"
+
+
+def test_winnow_selects_rightmost_minimum_of_each_window():
+    """Test that winnowing selects the position of the rightmost minimum hash of each window."""
+
+    # act
+    positions = winnow(np.array([5, 1, 4, 1, 3, 2, 6], dtype=np.int64), 3)
+
+    # assert
+    assert positions.tolist() == [1, 3, 5]
+
+
+def test_duplicated_tokens_share_a_fingerprint():
+    """Test that a run of the minimum number of tokens has a fingerprint in common with its duplicate."""
+
+    # arrange
+    tokens = [f"token{index}" for index in range(60)]
+
+    # act
+    fingerprints = {fingerprint for fingerprint, _ in determine_fingerprints(tokens, 30)}
+    duplicate_fingerprints = {fingerprint for fingerprint, _ in determine_fingerprints(["x"] + tokens[10:40], 30)}
+
+    # assert
+    assert fingerprints & duplicate_fingerprints
+
+
+def test_new_duplicate_of_changed_file_is_found(tmp_path):
+    """Test that a duplicate introduced by a changed file is found, and only fingerprinted files are indexed."""
+
+    # arrange
+    original_file = str(tmp_path / "original.py")
+    changed_file = str(tmp_path / "changed.py")
+    with open(original_file, "w", encoding="utf-8") as source_file:
+        source_file.write(DUPLICATED_CODE)
+    with open(changed_file, "w", encoding="utf-8") as source_file:
+        source_file.write("x = 1\n")
+
+    index = FingerprintIndex(str(tmp_path / "index.sqlite"), "python", 20)
+    index.update([original_file, changed_file])
+
+    with open(changed_file, "w", encoding="utf-8") as source_file:
+        source_file.write("import os\n\n" + DUPLICATED_CODE)
+    os.utime(changed_file, ns=(0, 0))
+
+    # act
+    updated_files = index.update([original_file, changed_file])
+    rows = list(find_new_duplicates(index, [changed_file], "python", 20))
+    index.update([original_file, changed_file])
+    rows_after_rerun = list(find_new_duplicates(index, [changed_file], "python", 20))
+    index.close()
+
+    # assert
+    assert updated_files == [changed_file]
+    assert rows == [[4, 30, 2, 3, changed_file, 1, original_file]]
+    assert not rows_after_rerun
+
+
+def test_file_with_new_modification_time_and_same_content_is_not_fingerprinted_again(tmp_path):
+    """Test that a touched file is recognized by its content hash and only its modification time is refreshed."""
+
+    # arrange
+    touched_file = str(tmp_path / "touched.py")
+    with open(touched_file, "w", encoding="utf-8") as source_file:
+        source_file.write(DUPLICATED_CODE)
+
+    index = FingerprintIndex(str(tmp_path / "index.sqlite"), "python", 20)
+    index.update([touched_file])
+    os.utime(touched_file, ns=(0, 0))
+
+    # act
+    updated_files = index.update([touched_file])
+    with patch("src.cpd.cpd_index.determine_content_hash") as content_hash_mock:
+        updated_again_files = index.update([touched_file])
+    index.close()
+
+    # assert
+    assert not updated_files
+    assert not updated_again_files
+    content_hash_mock.assert_not_called()
+
+
+def test_duplicate_that_existed_before_the_change_is_not_reported(tmp_path):
+    """Test that only duplicates introduced since the previous update are reported, not existing ones."""
+
+    # arrange
+    original_file = str(tmp_path / "original.py")
+    changed_file = str(tmp_path / "changed.py")
+    with open(original_file, "w", encoding="utf-8") as source_file:
+        source_file.write(DUPLICATED_CODE)
+    with open(changed_file, "w", encoding="utf-8") as source_file:
+        source_file.write("import os\n\n" + DUPLICATED_CODE)
+
+    index = FingerprintIndex(str(tmp_path / "index.sqlite"), "python", 20)
+    index.update([original_file, changed_file])
+    index.close()
+
+    with open(changed_file, "a", encoding="utf-8") as source_file:
+        source_file.write("\n\nprint(os.getcwd())\n")
+    os.utime(changed_file, ns=(0, 0))
+
+    # act
+    index = FingerprintIndex(str(tmp_path / "index.sqlite"), "python", 20)
+    updated_files = index.update([original_file, changed_file])
+    rows = list(find_new_duplicates(index, [changed_file], "python", 20))
+    index.close()
+
+    # assert
+    assert updated_files == [changed_file]
+    assert not rows
@@ -0,0 +1,115 @@
+"""Unit tests for the native code duplication detection."""
+
+import numpy as np
+
+from src.cpd.cpd_native import (
+    HASH_BASE,
+    HASH_BASE_INVERSE,
+    detect_duplicates,
+    determine_powers,
+    determine_window_hashes,
+    find_duplicates,
+    tokenize,
+)
+
+
+def test_tokenize_skips_comments_and_whitespace():
+    """Test that comments and whitespace are not tokens and that each token has its line number."""
+
+    # arrange
+    content = 'int a = 1; // one\n/* two\nlines */\nreturn "a // b";\n'
+
+    # act
+    tokens, lines = tokenize(content, "cpp")
+
+    # assert
+    assert tokens == ["int", "a", "=", "1", ";", "return", '"a // b"', ";"]
+    assert lines == [1, 1, 1, 1, 1, 4, 4, 4]
+
+
+def test_equal_windows_have_equal_hashes():
+    """Test that windows with the same tokens have the same rolling hash at different positions."""
+
+    # arrange
+    token_ids = np.array([1, 2, 3, 4, 9, 1, 2, 3, 4], dtype=np.int64)
+    powers = determine_powers(HASH_BASE, len(token_ids))
+    inverse_powers = determine_powers(HASH_BASE_INVERSE, len(token_ids))
+
+    # act
+    hashes = determine_window_hashes(token_ids, 4, powers, inverse_powers)
+
+    # assert
+    assert len(hashes) == 6
+    assert hashes[0] == hashes[5]
+    assert len(set(hashes.tolist())) == 5
+
+
+def test_duplicate_is_reported_once_with_its_full_length():
+    """Test that a duplicate longer than the minimum is reported once, extended to its full length."""
+
+    # arrange
+    files = [np.array([7, 1, 2, 3, 4, 5, 8], dtype=np.int64), np.array([1, 2, 3, 4, 5, 9], dtype=np.int64)]
+
+    # act
+    duplicates = find_duplicates(files, 3)
+
+    # assert
+    assert duplicates == [(5, [(0, 1), (1, 0)])]
+
+
+def test_duplicates_are_detected_in_files(tmp_path):
+    """Test that the duplicates are reported as cpd csv rows with the line and file of each occurrence."""
+
+    # arrange
+    duplicated_code = "def f(a, b):\n    c = a + b\n    return c * 2\n"
+    first_file = tmp_path / "first.py"
+    second_file = tmp_path / "second.py"
+    first_file.write_text(duplicated_code, encoding="utf-8")
+    second_file.write_text("import os\n\n" + duplicated_code, encoding="utf-8")
+
+    # act
+    rows = list(detect_duplicates([str(first_file), str(second_file)], "python", 10))
+
+    # assert
+    assert rows == [[3, 17, 2, 1, str(first_file), 3, str(second_file)]]
+
+
+def test_longer_duplicate_is_not_hidden_by_an_occurrence_that_diverges_earlier():
+    """Test that a third occurrence sharing only the head does not hide the longer duplicate of the other two."""
+
+    # arrange
+    files = [
+        np.array([7, 1, 2, 3, 4, 5, 6, 8], dtype=np.int64),
+        np.array([9, 1, 2, 3, 4, 5, 6], dtype=np.int64),
+        np.array([1, 2, 3, 10, 11], dtype=np.int64),
+    ]
+
+    # act
+    duplicates = find_duplicates(files, 3)
+
+    # assert
+    assert duplicates == [(6, [(0, 1), (1, 1)]), (3, [(0, 1), (1, 1), (2, 0)])]
+
+
+def test_duplicates_in_three_files_are_reported_like_cpd(tmp_path):
+    """Test that the long duplicate of two files and the short duplicate shared by a third file are both reported."""
+
+    # arrange
+    head = "int sum(int a, int b) {\n    int c = a + b;\n"
+    tail = "".join(f"    c = c * {index} + a;\n" for index in range(12)) + "    return c;\n}\n"
+    first_file = tmp_path / "first.cpp"
+    second_file = tmp_path / "second.cpp"
+    third_file = tmp_path / "third.cpp"
+    first_file.write_text(head + tail, encoding="utf-8")
+    second_file.write_text("#include <a>\n" + head + tail, encoding="utf-8")
+    third_file.write_text(head + "    return a;\n}\n", encoding="utf-8")
+    file_names = [str(first_file), str(second_file), str(third_file)]
+
+    # act
+    rows = list(detect_duplicates(file_names, "cpp", 15))
+
+    # assert
+    assert rows == [
+        [16, 117, 2, 1, str(first_file), 2, str(second_file)],
+        [2, 17, 3, 1, str(first_file), 2, str(second_file), 1, str(third_file)],
+    ]
@@ -172,3 +172,26 @@ def test_profile_is_shown_correctly(figure_mock):
     )
 
     figure_mock().show.assert_called_once()
+
+
+def test_profiles_are_merged_correctly():
+    """Test that the loc of a partial profile is added to the profile."""
+
+    # arrange
+    profile = create_function_size_profile()
+    profile.update_loc(10)
+    profile.update_loc(40)
+
+    partial_profile = create_function_size_profile()
+    partial_profile.update_loc(12)
+    partial_profile.update_loc(100)
+
+    # act
+    profile.merge(partial_profile)
+
+    # assert
+    assert profile.regions()[0].loc() == 22
+    assert profile.regions()[1].loc() == 0
+    assert profile.regions()[2].loc() == 40
+    assert profile.regions()[3].loc() == 100
+    assert profile.total_loc() == 162
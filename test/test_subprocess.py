@@ -393,3 +393,73 @@ class TestSubprocessPipe(TestCase):
 
         # Assert
         self.print_mock.assert_called_once_with("standard_output")
+
+
+class TestSubprocessLines(TestCase):
+    """Test the streaming of the output lines of a subprocess."""
+
+    def setUp(self):
+        """Prepare of the test cases."""
+
+        self.which_mock = patch("src.facility.subprocess.which").start()
+        self.open_mock = patch("src.facility.subprocess.open").start()
+        self.popen_mock = patch("src.facility.subprocess.Popen").start()
+        self.strftime_mock = patch("src.facility.subprocess.strftime").start()
+
+        # Arrange
+        self.which_mock.return_value = "/test_path/test_command"
+        self.process_mock = self.popen_mock.return_value.__enter__.return_value
+        self.process_mock.stdout = [b"first line\n", b"second line\r\n"]
+        self.process_mock.wait.return_value = 0
+        self.strftime_mock.return_value = "yyyymmdd-hhmmss"
+
+    def tearDown(self):
+        """Tear down of test cases."""
+
+        patch.stopall()
+
+    def test_execute_lines_yields_stdout_lines_without_line_endings(self):
+        """Test that execute lines yields each line of stdout without its line ending."""
+
+        # Arrange
+        command = ["test_command", "test_arguments"]
+
+        # Act
+        process = Subprocess(command)
+        lines = list(process.execute_lines("test_directory", "filename"))
+
+        # Assert
+        assert lines == ["first line", "second line"]
+
+    def test_execute_lines_saves_stdout_to_file(self):
+        """Test that execute lines writes each line of stdout to the log file."""
+
+        # Arrange
+        command = ["test_command", "test_arguments"]
+
+        # Act
+        process = Subprocess(command)
+        list(process.execute_lines("test_directory", "filename"))
+
+        # Assert
+        self.open_mock.assert_called_once_with(join("test_directory", "filename_yyyymmdd-hhmmss.log"), "wb")
+        self.open_mock.assert_has_calls(
+            [call().__enter__().write(b"first line\n"), call().__enter__().write(b"second line\r\n")]
+        )
+
+    def test_execute_lines_raises_exception_after_last_line_with_non_zero_return_code(self):
+        """Test that execute lines raises a process error after the last line when the return code is non zero."""
+
+        # Arrange
+        command = ["test_command", "test_arguments"]
+        self.process_mock.wait.return_value = 1
+        lines = []
+
+        # Act
+        process = Subprocess(command)
+        with raises(ProcessError):
+            for line in process.execute_lines("test_directory", "filename"):
+                lines.append(line)
+
+        # Assert
+        assert lines == ["first line", "second line"]
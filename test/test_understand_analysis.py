@@ -279,20 +279,31 @@ def test_option_file_should_have_correct_default_values(metrics_mocks):
     args.func(args)
 
     # assert
-    metrics_mocks.file_mock.assert_called_with("db", "./reports", None, None)
+    metrics_mocks.file_mock.assert_called_with("db", "./reports", None, None, None, 1)
 
 
 def test_options_file_should_have_correct_values(metrics_mocks):
     """Test that the options for file have correct provided values."""
 
     # arrange
-    args = parse_arguments(["metrics", "--file", "--output=/bla/reports", "--module=foo", "--sort=CountLine", "db"])
+    args = parse_arguments(
+        [
+            "metrics",
+            "--file",
+            "--output=/bla/reports",
+            "--module=foo",
+            "--sort=CountLine",
+            "--top=10",
+            "--page=2",
+            "db",
+        ]
+    )
 
     # act
     args.func(args)
 
     # assert
-    metrics_mocks.file_mock.assert_called_with("db", "/bla/reports", "foo", "CountLine")
+    metrics_mocks.file_mock.assert_called_with("db", "/bla/reports", ["foo"], "CountLine", 10, 2)
 
 
 def test_option_function_collects_only_function_metrics(metrics_mocks):
@@ -310,3 +321,29 @@ def test_option_function_collects_only_function_metrics(metrics_mocks):
 
 
 # pylint: enable=redefined-outer-name
+
+
+def test_option_jobs_is_passed_to_the_analysis(analysis_mocks):  # pylint: disable=redefined-outer-name
+    """Test that the number of jobs is passed to the analysis of the functions."""
+
+    # arrange
+    args = parse_arguments(["analysis", "--complexity", "--jobs=4", "db"])
+
+    # act
+    args.func(args)
+
+    # assert
+    analysis_mocks.complexity_mock.assert_called_once_with("db", "./reports", 4)
+
+
+def test_option_function_has_correct_export_values(metrics_mocks):  # pylint: disable=redefined-outer-name
+    """Test that the export format and compression are passed to the function metrics collection."""
+
+    # arrange
+    args = parse_arguments(["metrics", "--function", "--format=parquet", "--compression=zstd", "db"])
+
+    # act
+    args.func(args)
+
+    # assert
+    metrics_mocks.function_mock.assert_called_with("db", "./reports", 1, "parquet", "zstd")
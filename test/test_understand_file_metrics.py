@@ -0,0 +1,93 @@
+"""Unit test for the collection of file metrics from an understand database."""
+
+from unittest.mock import Mock
+
+import sys
+
+sys.modules["understand"] = Mock()
+
+# pylint: disable=wrong-import-position
+from src.understand.understand_file_metrics import FileIndex, get_module_metrics, select_sorted_metrics
+
+# pylint: enable=wrong-import-position
+
+
+def create_file(name, metrics=None):
+    """Create a mocked file entity."""
+
+    file = Mock()
+    file.longname.return_value = name
+    file.name.return_value = name.rsplit("/", 1)[-1]
+    file.metric.return_value = metrics
+    return file
+
+
+def test_file_index_finds_files_of_which_the_name_matches_the_module():
+    """Test that the file index returns the files of which the name matches the regular expression of the module."""
+
+    # arrange
+    database = Mock()
+    files = [create_file("/src/foo/foo_a.c"), create_file("/src/bar/b.c"), create_file("/src/bar/Foo_c.c")]
+    database.ents.return_value = files
+
+    # act
+    file_index = FileIndex(database)
+
+    # assert
+    assert file_index.files("foo") == [files[0], files[2]]
+    assert file_index.files(r"^b\.c$") == [files[1]]
+    assert file_index.files("bar") == []
+    assert file_index.files() == files
+    database.lookup.assert_not_called()
+
+
+def test_file_index_groups_files_with_the_same_name():
+    """Test that files with the same name in different directories are all returned for the module."""
+
+    # arrange
+    database = Mock()
+    files = [create_file("/src/foo/a.c"), create_file("/src/bar/a.c")]
+    database.ents.return_value = files
+
+    # act
+    module_files = FileIndex(database).files("a.c")
+
+    # assert
+    assert module_files == files
+
+
+def test_module_metrics_are_retrieved_once_per_file():
+    """Test that the metrics of a file are retrieved only once when a cache is used."""
+
+    # arrange
+    file = create_file("/src/foo/a.c", {"CountLine": 10})
+    metrics_cache = {}
+
+    # act
+    get_module_metrics([file], metrics_cache)
+    module_metrics = get_module_metrics([file], metrics_cache)
+
+    # assert
+    file.metric.assert_called_once()
+    assert module_metrics == {"/src/foo/a.c": {"CountLine": 10}}
+
+
+def test_select_sorted_metrics_returns_requested_page():
+    """Test that the requested page of the sorted metrics is selected."""
+
+    # arrange
+    module_metrics = {
+        "a.c": {"CountLine": 10},
+        "b.c": {"CountLine": 50},
+        "c.c": {"CountLine": None},
+        "d.c": {"CountLine": 30},
+        "e.c": {"CountLine": 20},
+    }
+
+    # act
+    first_page = select_sorted_metrics(module_metrics, "CountLine", 2)
+    second_page = select_sorted_metrics(module_metrics, "CountLine", 2, 2)
+
+    # assert
+    assert list(first_page) == ["b.c", "d.c"]
+    assert list(second_page) == ["e.c", "a.c"]
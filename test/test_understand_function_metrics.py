@@ -0,0 +1,130 @@
+"""Unit test for the collection of function metrics from an understand database."""
+
+import gzip
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+import sys
+
+sys.modules["understand"] = Mock()
+
+# pylint: disable=wrong-import-position
+from src.understand.understand_function_metrics import (
+    determine_function_metrics,
+    save_function_metrics_csv,
+    save_function_metrics_parquet,
+    split_in_chunks,
+)
+
+# pylint: enable=wrong-import-position
+
+
+def create_function(name, number_of_parameters):
+    """Create a mocked function entity."""
+
+    function = Mock()
+    function.longname.return_value = name
+    function.metric.return_value = {"CountLineCode": 12, "Cyclomatic": 3, "CountInput": 4, "CountOutput": 5}
+    function.ents.return_value = [Mock()] * number_of_parameters
+    return function
+
+
+def test_function_metrics_count_the_parameter_entities():
+    """Test that the number of parameters is the number of parameter entities of the function."""
+
+    # arrange
+    database = Mock()
+    database.ents.return_value = [create_function("foo", 0), create_function("bar", 3)]
+
+    # act
+    rows = list(determine_function_metrics(database))
+
+    # assert
+    assert rows == [["foo", 12, 3, 4, 5, 0], ["bar", 12, 3, 4, 5, 3]]
+    database.ents.return_value[1].ents.assert_called_once_with("Define", "Parameter")
+
+
+def test_rows_are_split_in_chunks():
+    """Test that the rows are split in chunks of the requested size."""
+
+    # act
+    chunks = list(split_in_chunks(range(5), 2))
+
+    # assert
+    assert chunks == [[0, 1], [2, 3], [4]]
+
+
+def test_function_metrics_are_saved_gzip_compressed(tmp_path):
+    """Test that the function metrics are saved to a gzip compressed csv file."""
+
+    # arrange
+    report_file = os.path.join(tmp_path, "function_metrics.csv")
+
+    # act
+    save_function_metrics_csv(iter([["foo", 12, 3, 4, 5, 0]]), report_file, "gzip")
+
+    # assert
+    with gzip.open(report_file + ".gz", "rt", encoding="utf-8") as csv_file:
+        assert csv_file.read().splitlines() == [
+            '"FunctionName","LinesOfCode","CyclomaticComplexity","Fan-in","Fan-out","NumberOfParameters"',
+            '"foo","12","3","4","5","0"',
+        ]
+
+
+def test_function_metrics_are_saved_zstd_compressed(tmp_path):
+    """Test that the function metrics are saved to a zstd compressed csv file."""
+
+    # arrange
+    zstandard = pytest.importorskip("zstandard")
+    report_file = os.path.join(tmp_path, "function_metrics.csv")
+
+    # act
+    save_function_metrics_csv(iter([["foo", 12, 3, 4, 5, 0]]), report_file, "zstd")
+
+    # assert
+    with zstandard.open(report_file + ".zst", "rt", encoding="utf-8") as csv_file:
+        assert csv_file.read().splitlines() == [
+            '"FunctionName","LinesOfCode","CyclomaticComplexity","Fan-in","Fan-out","NumberOfParameters"',
+            '"foo","12","3","4","5","0"',
+        ]
+
+
+def test_function_metrics_are_saved_to_parquet(tmp_path):
+    """Test that the function metrics are saved to a parquet file with a string name and integer metrics."""
+
+    # arrange
+    parquet = pytest.importorskip("pyarrow.parquet")
+    report_file = os.path.join(tmp_path, "function_metrics")
+
+    # act
+    save_function_metrics_parquet(iter([["foo", 12, 3, 4, 5, 0], ["bar", 1, 1, 0, 0, 2]]), report_file, "gzip")
+
+    # assert
+    table = parquet.read_table(report_file + ".parquet")
+    assert table.column_names == [
+        "FunctionName",
+        "LinesOfCode",
+        "CyclomaticComplexity",
+        "Fan-in",
+        "Fan-out",
+        "NumberOfParameters",
+    ]
+    assert table.to_pylist()[1] == {
+        "FunctionName": "bar",
+        "LinesOfCode": 1,
+        "CyclomaticComplexity": 1,
+        "Fan-in": 0,
+        "Fan-out": 0,
+        "NumberOfParameters": 2,
+    }
+
+
+@patch("src.understand.understand_function_metrics.importlib.import_module", side_effect=ImportError)
+def test_missing_optional_dependency_raises_with_the_extra_to_install(_, tmp_path):
+    """Test that a clear message with the extra to install is given when pyarrow is not installed."""
+
+    # act & assert
+    with pytest.raises(ImportError, match=r"install sqatt\[parquet\]"):
+        save_function_metrics_parquet(iter([]), os.path.join(tmp_path, "function_metrics"), "none")
@@ -0,0 +1,118 @@
+"""Unit test for sharding the entities of an understand database."""
+
+from concurrent.futures import Future
+from unittest.mock import Mock, patch
+
+import sys
+
+sys.modules["understand"] = Mock()
+
+# pylint: disable=wrong-import-position
+from src.profile.sqatt_profiles import create_function_size_profile
+from src.understand.understand_function_size import determine_function_size_profile
+from src.understand.understand_sharding import (
+    DatabaseShard,
+    determine_profile_in_parallel,
+    iterate_shards,
+    process_shards,
+)
+
+# pylint: enable=wrong-import-position
+
+
+def create_function(lines_of_code):
+    """Create a mocked function entity with the provided lines of code."""
+
+    function = Mock()
+    function.metric.return_value = {"CountLineCode": lines_of_code}
+    return function
+
+
+def test_shards_together_contain_all_entities_in_order():
+    """Test that the shards of a database together contain all entities in the original order."""
+
+    # arrange
+    database = Mock()
+    database.ents.return_value = list(range(10))
+
+    # act
+    shards = [DatabaseShard(database, shard_index, 3).ents("function") for shard_index in range(3)]
+
+    # assert
+    assert shards == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_shard_is_empty_when_there_are_more_shards_than_entities():
+    """Test that a shard is empty when there are more shards than entities."""
+
+    # arrange
+    database = Mock()
+    database.ents.return_value = [1, 2]
+
+    # act
+    entities = DatabaseShard(database, 3, 4).ents("function")
+
+    # assert
+    assert not entities
+
+
+@patch("src.understand.understand_sharding.understand")
+def test_one_job_processes_the_database_in_the_current_process(understand_mock):
+    """Test that the database is processed as a single shard when only one job is requested."""
+
+    # arrange
+    process_database = Mock(return_value="result")
+
+    # act
+    results = process_shards("db", process_database, 1)
+
+    # assert
+    understand_mock.open.assert_called_once_with("db")
+    process_database.assert_called_once_with(understand_mock.open.return_value)
+    assert results == ["result"]
+
+
+@patch("src.understand.understand_sharding.ProcessPoolExecutor")
+@patch("src.understand.understand_sharding.understand")
+def test_partial_profiles_are_merged(understand_mock, executor_mock):
+    """Test that the partial profiles of the shards are merged into one profile."""
+
+    # arrange
+    understand_mock.open.return_value.ents.return_value = [create_function(10), create_function(20)]
+    executor_mock.return_value.__enter__.return_value.submit.side_effect = lambda function, *args: Mock(
+        result=Mock(return_value=function(*args))
+    )
+
+    # act
+    profile = determine_profile_in_parallel("db", create_function_size_profile, determine_function_size_profile, 2)
+
+    # assert
+    assert profile.total_loc() == 30
+    assert profile.regions()[0].loc() == 10
+    assert profile.regions()[1].loc() == 20
+
+
+def create_completed_future(result):
+    """Create a future that is completed with the provided result."""
+
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+@patch("src.understand.understand_sharding.ProcessPoolExecutor")
+def test_iterate_shards_yields_the_result_of_each_shard(executor_mock):
+    """Test that the database is divided in the requested number of shards and the results are yielded in order."""
+
+    # arrange
+    submit_mock = executor_mock.return_value.__enter__.return_value.submit
+    submit_mock.side_effect = lambda function, database, shard_index, shard_count, process: create_completed_future(
+        (shard_index, shard_count)
+    )
+
+    # act
+    results = list(iterate_shards("db", Mock(), 2, 3))
+
+    # assert
+    executor_mock.assert_called_once_with(max_workers=2)
+    assert results == [(0, 3), (1, 3), (2, 3)]